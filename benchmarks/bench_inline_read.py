@@ -0,0 +1,49 @@
+"""
+Micro-benchmark for the per-call overhead of Inline._read_inline() (without ANSYS).
+A stub replaces mapdl and returns a canned response immediately, so only the
+python side (warning + response parsing) is measured.
+
+Usage:
+    python benchmarks/bench_inline_read.py
+
+@author: Nathanael Jöhrmann
+"""
+import re
+import timeit
+import warnings
+from warnings import warn
+
+from pyansystools.inline import Inline
+
+
+class _StubMapdl:
+    """Returns the response of ANSYS for a parameter definition without doing anything."""
+    @staticmethod
+    def run(command):
+        return "PARAMETER __INLINE__ =     3.000000000"
+
+
+def _read_inline_legacy(mapdl, inline_function: str):
+    """_read_inline() as implemented before (warning on each call, regex compiled on each call)."""
+    warn('This is deprecated, as pymapdl now provides similar functionality.', DeprecationWarning)
+    line = mapdl.run(f"__inline__={inline_function}")
+    return float(re.search(r"(?<=__INLINE__ =).*", line).group(0))
+
+
+def main(number: int = 200000):
+    mapdl = _StubMapdl()
+    inline = Inline(mapdl)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        inline.kx(1)  # emits the (only) DeprecationWarning of this instance
+        legacy = min(timeit.repeat(lambda: _read_inline_legacy(mapdl, "kx(1)"), number=number, repeat=5))
+        current = min(timeit.repeat(lambda: inline._read_inline("kx(1)"), number=number, repeat=5))
+
+    print(f"calls per run: {number}")
+    print(f"legacy  _read_inline: {legacy / number * 1e6:.3f} µs per call")
+    print(f"current _read_inline: {current / number * 1e6:.3f} µs per call")
+    print(f"speedup: {legacy / current:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
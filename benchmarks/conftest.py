@@ -0,0 +1,102 @@
+"""
+Fixtures for the benchmark suite:
+    baselines ... compares round-trips and commands of a workload with benchmarks/baselines.json
+    benchmark ... from pytest-benchmark (if installed), otherwise a minimal replacement measuring wall time
+
+Update the baselines after an intended change with:
+    python -m pytest benchmarks --update-baselines
+
+@author: Nathanael Jöhrmann
+"""
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+try:
+    import pytest_benchmark
+except ImportError:
+    pytest_benchmark = None
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+_timings = []  # (test name, min. seconds, mean seconds, rounds) - only without pytest-benchmark
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-baselines", action="store_true", default=False,
+                     help="store measured round-trips and commands as new baselines")
+
+
+class Baselines:
+    """Round-trips and commands of each workload. More round-trips or commands than stored is a regression."""
+
+    def __init__(self, path: Path, update: bool):
+        self.path = path
+        self.update = update
+        self.data = json.loads(path.read_text()) if path.exists() else {}
+        self._changed = False
+
+    def check(self, name: str, measured: dict) -> None:
+        if self.update:
+            self._changed |= self.data.get(name) != measured
+            self.data[name] = measured
+            return
+        if name not in self.data:
+            pytest.fail(f"no baseline for {name} (run 'pytest benchmarks --update-baselines')")
+        baseline = self.data[name]
+        regressions = [f"{key}: {measured[key]} > baseline {baseline[key]}"
+                       for key in baseline if measured[key] > baseline[key]]
+        assert not regressions, f"{name} regressed - " + ", ".join(regressions)
+
+    def save(self) -> None:
+        if self._changed:
+            self.path.write_text(json.dumps(self.data, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope='session')
+def baselines(request):
+    result = Baselines(BASELINES_PATH, request.config.getoption("--update-baselines"))
+    yield result
+    result.save()
+
+
+class _SimpleBenchmark:
+    """Minimal replacement for the benchmark fixture of pytest-benchmark (only wall time)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.extra_info = {}
+
+    def __call__(self, function, *args, **kwargs):
+        return self.pedantic(function, args, kwargs, rounds=5)
+
+    def pedantic(self, target, args=(), kwargs=None, setup=None, rounds=1, iterations=1, warmup_rounds=0):
+        times = []
+        result = None
+        for i in range(warmup_rounds + rounds):
+            if setup is not None:
+                args, kwargs = setup() or (args, kwargs)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = target(*args, **(kwargs or {}))
+            if i >= warmup_rounds:
+                times.append((time.perf_counter() - start) / iterations)
+        _timings.append((self.name, min(times), sum(times) / len(times), rounds))
+        return result
+
+
+if pytest_benchmark is None:
+    @pytest.fixture(scope='function')
+    def benchmark(request):
+        return _SimpleBenchmark(request.node.name)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _timings:
+        return
+    terminalreporter.section("benchmark (wall time)")
+    width = max(len(name) for name, *_ in _timings)
+    for name, minimum, mean, rounds in _timings:
+        terminalreporter.write_line(f"{name:<{width}}  min {minimum * 1e3:10.3f} ms"
+                                    f"  mean {mean * 1e3:10.3f} ms  ({rounds} rounds)")
@@ -0,0 +1,26 @@
+"""
+Benchmark suite: round-trips, commands and wall time of representative workloads against FakeMapdl.
+More round-trips or commands than stored in baselines.json fail the test.
+
+    python -m pytest benchmarks
+    python -m pytest benchmarks --update-baselines  # after an intended change
+
+@author: Nathanael Jöhrmann
+"""
+import pytest
+
+from workloads import WORKLOADS
+
+ROUNDS = 3
+
+
+@pytest.mark.parametrize("name", list(WORKLOADS))
+def test_workload(name, benchmark, baselines):
+    workload = WORKLOADS[name]
+    mapdl = workload.setup()
+    workload.run(mapdl)
+    measured = {"round_trips": mapdl.n_round_trips, "commands": sum(mapdl.command_counts.values())}
+    benchmark.extra_info.update(measured)
+
+    baselines.check(name, measured)
+    benchmark.pedantic(workload.run, setup=lambda: ((workload.setup(),), {}), rounds=ROUNDS)
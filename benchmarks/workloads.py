@@ -0,0 +1,174 @@
+"""
+Representative workloads for the benchmark suite (see test_workloads.py).
+Each workload has a setup function, creating a FakeMapdl with the needed model
+(not measured), and a run function, doing the measured work with that FakeMapdl.
+
+@author: Nathanael Jöhrmann
+"""
+import warnings
+from typing import Callable, Dict, NamedTuple
+
+from pyansystools.geo2d import GeometryBatch, Isogon, KeypointRegistry, Point2D, Rectangle
+from pyansystools.inline import Inline
+from pyansystools.macros import Macros
+from pyansystools.material import MaterialLibrary
+from pyansystools.material_db import _Al, Si
+from pyansystools.testing import FakeMapdl
+
+N_NODES = 10000
+N_EDGES = 500
+N_RECTANGLES = 1000
+RECTANGLES_PER_ROW = 40
+N_MATERIALS = 30
+N_SWEEP_ITERATIONS = 10
+
+
+class Workload(NamedTuple):
+    setup: Callable[[], FakeMapdl]
+    run: Callable[[FakeMapdl], object]
+
+
+def _reset_counters(mapdl: FakeMapdl) -> FakeMapdl:
+    mapdl.n_round_trips = 0
+    mapdl.command_counts.clear()
+    return mapdl
+
+
+# ========================================================================
+# ================================ inline ================================
+# ========================================================================
+def setup_nodes() -> FakeMapdl:
+    mapdl = FakeMapdl()
+    mapdl.input_strings(f"*DO,i,1,{N_NODES}\nN,i,i,i/2\n*ENDDO")
+    return _reset_counters(mapdl)
+
+
+def run_inline_traversal(mapdl: FakeMapdl):
+    """Iterate over all selected nodes and fetch their coordinates and displacements."""
+    inline = Inline(mapdl)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        nodes = list(inline.iter_selected_nodes())
+        coordinates = inline.nxyz_array(nodes)
+        numbers, displacements = inline.displacement_field()
+    assert len(nodes) == len(coordinates) == len(numbers) == N_NODES
+    return coordinates, displacements
+
+
+# ========================================================================
+# ================================= geo2d ================================
+# ========================================================================
+def run_isogon_create_mesh(mapdl: FakeMapdl):
+    isogon = Isogon(mapdl, 100, N_EDGES)
+    isogon.create()
+    isogon.mesh(2)
+    assert len(isogon.lines) == N_EDGES
+    return isogon
+
+
+def _layout_rectangles(mapdl: FakeMapdl):
+    for i in range(N_RECTANGLES):
+        row, column = divmod(i, RECTANGLES_PER_ROW)
+        yield Rectangle(mapdl, 1, 1, destination=Point2D(column, row))
+
+
+def run_rectangles_merged(mapdl: FakeMapdl):
+    """Grid of rectangles, sharing keypoints and lines with their neighbours."""
+    registry = KeypointRegistry()
+    for rectangle in _layout_rectangles(mapdl):
+        rectangle.create_merged_to(registry)
+    assert len(mapdl.areas) == N_RECTANGLES
+    return registry
+
+
+def run_rectangles_merged_batch(mapdl: FakeMapdl):
+    """Like run_rectangles_merged(), but all rectangles are created with one GeometryBatch."""
+    registry = KeypointRegistry()
+    with GeometryBatch(mapdl) as batch:
+        for rectangle in _layout_rectangles(mapdl):
+            batch.add(rectangle, merged_to=registry)
+    assert len(mapdl.areas) == N_RECTANGLES
+    return registry
+
+
+# ========================================================================
+# =============================== material ===============================
+# ========================================================================
+def run_ramberg_osgood_table(mapdl: FakeMapdl):
+    material = _Al()
+    material.set_elastic(mapdl, 1)
+    stresses, strains = material.set_ramberg_osgood(mapdl, 1, 0.05)
+    assert len(mapdl.tables[(1, "KINH")]) == len(stresses) - 1
+    return stresses, strains
+
+
+def _material_stack() -> dict:
+    return {mat_id: Si() if mat_id % 2 else _Al() for mat_id in range(1, N_MATERIALS + 1)}
+
+
+def run_materials_individual(mapdl: FakeMapdl):
+    """Multilayer stack: each material defined with its own set_elastic() / set_ramberg_osgood() calls."""
+    for mat_id, material in _material_stack().items():
+        material.set_elastic(mapdl, mat_id)
+        if material.ro_n is not None:
+            material.set_ramberg_osgood(mapdl, mat_id, 0.05)
+    assert len(mapdl.materials) == N_MATERIALS
+
+
+def run_material_library(mapdl: FakeMapdl):
+    """Multilayer stack defined with MaterialLibrary.apply()."""
+    written = MaterialLibrary.apply(mapdl, _material_stack(), strain_max=0.05)
+    assert len(mapdl.materials) == N_MATERIALS
+    return written
+
+
+def setup_material_library_cached() -> FakeMapdl:
+    mapdl = FakeMapdl()
+    MaterialLibrary.apply(mapdl, _material_stack(), strain_max=0.05, cache=True)
+    return _reset_counters(mapdl)
+
+
+def run_material_library_cached_sweep(mapdl: FakeMapdl):
+    """Parameter sweep re-applying the (unchanged) stack in each iteration."""
+    for _ in range(N_SWEEP_ITERATIONS):
+        written = MaterialLibrary.apply(mapdl, _material_stack(), strain_max=0.05, cache=True)
+        assert not any(written.values())
+
+
+# ========================================================================
+# ================================ macros ================================
+# ========================================================================
+def setup_meshed_rectangles() -> FakeMapdl:
+    mapdl = FakeMapdl()
+    lower = Rectangle(mapdl, 10, 1)
+    lower.create()
+    upper = Rectangle(mapdl, 10, 1, destination=Point2D(0, 1))
+    upper.create()
+    for rectangle in (lower, upper):
+        rectangle.mesh_custom(50, 5)
+    mapdl.parameters["lower_top"] = lower.line_top
+    mapdl.parameters["upper_bottom"] = upper.line_bottom
+    return _reset_counters(mapdl)
+
+
+def run_contact_pair(mapdl: FakeMapdl):
+    lower_top = int(mapdl._parameters["lower_top"])
+    upper_bottom = int(mapdl._parameters["upper_bottom"])
+    return Macros(mapdl).create_contact_pair_for_lines_symmetric(lower_top, upper_bottom)
+
+
+def _setup_empty() -> FakeMapdl:
+    return FakeMapdl()
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "inline_traversal_10k_nodes": Workload(setup_nodes, run_inline_traversal),
+    "isogon_500_edges_create_mesh": Workload(_setup_empty, run_isogon_create_mesh),
+    "rectangles_1000_merged": Workload(_setup_empty, run_rectangles_merged),
+    "rectangles_1000_merged_batch": Workload(_setup_empty, run_rectangles_merged_batch),
+    "ramberg_osgood_table": Workload(_setup_empty, run_ramberg_osgood_table),
+    "materials_30_individual": Workload(_setup_empty, run_materials_individual),
+    "material_library_30": Workload(_setup_empty, run_material_library),
+    "material_library_30_cached_sweep": Workload(setup_material_library_cached, run_material_library_cached_sweep),
+    "contact_pair_symmetric": Workload(setup_meshed_rectangles, run_contact_pair),
+}
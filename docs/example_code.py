@@ -1,7 +1,7 @@
 import time
 
 import pyansys
-from pyansystools.geo2d import Geometry2d, Point2D, Rectangle, Isogon
+from pyansystools.geo2d import Geometry2d, GeometryBatch, Point2D, Rectangle, Isogon
 
 
 def main():
@@ -70,15 +70,17 @@ def example_geo2d_isogon_01():
     radius = 40
     edges = 12
     isogon = Isogon(mapdl, radius, edges)
-    isogon.create()
     rectangles = []
 
-    for i, rotation in enumerate(range(0, 359, round(360/edges))):
-        rectangle = Rectangle(mapdl, width=30, height=10)
-        rectangles.append(rectangle)
-        rectangle.set_destination(isogon.points[i])
-        rectangle.set_rotation_in_degree(180-rotation+(180/edges))
-        rectangle.create()  # create keypoints, lines and area in ANSYS
+    # create all geometries with one round-trip to ANSYS
+    with GeometryBatch(mapdl) as batch:
+        batch.add(isogon)
+        for i, rotation in enumerate(range(0, 359, round(360/edges))):
+            rectangle = Rectangle(mapdl, width=30, height=10)
+            rectangles.append(rectangle)
+            rectangle.set_destination(isogon.points[i])
+            rectangle.set_rotation_in_degree(180-rotation+(180/edges))
+            batch.add(rectangle)  # records commands; keypoints, lines and area are created at end of with block
 
     mapdl.gplot()
     mapdl.exit()
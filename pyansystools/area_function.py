@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Provides a vectorized area function of an indenter tip (nanoindentation), as used by geo2d.Tip.
+
+    A(h) = C0 * h**2 + C1 * h + C2 * h**(1/2) + C3 * h**(1/4) + C4 * h**(1/8) + C5 * h**(1/16)
+
+The area function is only fitted for depths h >= min_fitted_depth. Below, the tip radius is
+approximated by r = m * h**0.5, with m chosen so that both parts meet at min_fitted_depth.
+
+@author: Nathanael Jöhrmann
+"""
+import functools
+from typing import Tuple, Union
+
+import numpy as np
+
+_EXPONENTS = np.array([2, 1, 1 / 2, 1 / 4, 1 / 8, 1 / 16])
+# smallest indentation depth where the area function is valid (from exp. calibration)
+MIN_FITTED_DEPTH = 31
+
+
+class AreaFunction:
+    """
+    Tip radius as function of the indentation depth. Accepts scalars and numpy arrays:
+
+        area_function = AreaFunction.from_coefficients((24.5, 0, 0, 0, 0, 0))
+        radius = area_function(depths)
+    """
+
+    def __init__(self, coefficients, min_fitted_depth: float = MIN_FITTED_DEPTH):
+        """
+        :param coefficients: the six coefficients C0 ... C5 of the area function
+        :param min_fitted_depth: (optional) smallest depth, where the area function is valid
+        """
+        coefficients = tuple(float(c) for c in coefficients)
+        assert len(coefficients) == len(_EXPONENTS), f"AreaFunction needs {len(_EXPONENTS)} coefficients"
+        self.coefficients = coefficients
+        self.min_fitted_depth = min_fitted_depth
+        self._coefficients = np.array(coefficients)
+        # blending constant for small depths: r = m * h**0.5
+        self.m = float(self._fitted_radius(np.array([min_fitted_depth]))[0]) / min_fitted_depth ** 0.5
+        # per instance caches of profile() and adaptive_profile() (arguments -> read-only array)
+        self._profiles = {}
+        self._adaptive_profiles = {}
+
+    @classmethod
+    def from_coefficients(cls, coefficients, min_fitted_depth: float = MIN_FITTED_DEPTH) -> "AreaFunction":
+        """
+        Shared (cached) AreaFunction for the given coefficients.
+
+        :return: AreaFunction
+        """
+        return _cached_area_function(tuple(float(c) for c in coefficients), min_fitted_depth)
+
+    def area(self, depth: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Projected contact area for the given indentation depth(s) (only valid for depth >= min_fitted_depth).
+        """
+        depth = np.asarray(depth, dtype=np.float64)
+        return (depth[..., None] ** _EXPONENTS) @ self._coefficients
+
+    def _fitted_radius(self, depth: np.ndarray) -> np.ndarray:
+        return (self.area(depth) / np.pi) ** 0.5
+
+    def __call__(self, depth: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Tip radius for the given indentation depth(s).
+
+        :param depth: float or array_like (>= 0)
+        :return: float or numpy array
+        """
+        depth = np.asarray(depth, dtype=np.float64)
+        assert (depth >= 0).all(), "Indentation depth must be >=0 for AreaFunction"
+        fitted = self._fitted_radius(np.maximum(depth, self.min_fitted_depth))
+        radius = np.where(depth >= self.min_fitted_depth, fitted, self.m * depth ** 0.5)
+        return float(radius) if radius.ndim == 0 else radius
+
+    def profile(self, n_points: int, max_depth: float) -> np.ndarray:
+        """
+        Tip profile with n_points at depths max_depth * (i / n_points)**2 (i = n_points ... 1),
+        i.e. points get denser towards the apex. The result is cached (read-only array).
+
+        :param n_points: number of points
+        :param max_depth: depth of first point
+        :return: numpy array with shape (n_points, 2) - columns radius and depth
+        """
+        key = (n_points, max_depth)
+        if key not in self._profiles:
+            depths = max_depth * (np.arange(n_points, 0, -1) / n_points) ** 2
+            result = np.column_stack((self(depths), depths))
+            result.flags.writeable = False
+            self._profiles[key] = result
+        return self._profiles[key]
+
+    def adaptive_profile(self, max_depth: float, tolerance: float, max_points: int = 10000) -> np.ndarray:
+        """
+        Tip profile with as few points as needed to describe the tip shape between depth 0 and max_depth
+        within tolerance: intervals are bisected until the distance between the curve and the chord
+        of each interval is <= tolerance. So points get dense, where the curvature is high (e.g. at the apex).
+        As a spline through the points is closer to the curve than the chords, it also meets the tolerance.
+        The result is cached (read-only array).
+
+        :param max_depth: depth of first point
+        :param tolerance: max. distance between profile and area function (same unit as depth)
+        :param max_points: (optional) stop refinement at this number of points
+        :return: numpy array with shape (n, 2) - columns radius and depth (descending depth, without depth 0)
+        """
+        assert tolerance > 0, "tolerance must be > 0"
+        key = (max_depth, tolerance, max_points)
+        if key not in self._adaptive_profiles:
+            self._adaptive_profiles[key] = self._adaptive_profile(max_depth, tolerance, max_points)
+        return self._adaptive_profiles[key]
+
+    def _adaptive_profile(self, max_depth: float, tolerance: float, max_points: int) -> np.ndarray:
+        fractions = np.array([0.25, 0.5, 0.75])
+        # min_fitted_depth is always a point: the curve is not smooth there
+        depths = np.array([0, self.min_fitted_depth, max_depth] if 0 < self.min_fitted_depth < max_depth
+                          else [0, max_depth], dtype=np.float64)
+        while len(depths) < max_points + 1:
+            start, stop = depths[:-1], depths[1:]
+            radius_start, radius_stop = self(start), self(stop)
+            samples = start[:, None] + (stop - start)[:, None] * fractions
+            # distance of curve points to the chord of each interval
+            chord_r, chord_h = (radius_stop - radius_start)[:, None], (stop - start)[:, None]
+            cross = chord_r * (samples - start[:, None]) - chord_h * (self(samples) - radius_start[:, None])
+            distance = np.abs(cross) / np.hypot(chord_r, chord_h)
+            split = distance.max(axis=1) > tolerance
+            if not split.any():
+                break
+            new_depths = ((start + stop) / 2)[split][:max_points + 1 - len(depths)]
+            depths = np.sort(np.concatenate((depths, new_depths)))
+
+        depths = depths[:0:-1]
+        result = np.column_stack((self(depths), depths))
+        result.flags.writeable = False
+        return result
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_area_function(coefficients: Tuple[float, ...], min_fitted_depth: float) -> AreaFunction:
+    return AreaFunction(coefficients, min_fitted_depth)
@@ -0,0 +1,108 @@
+"""
+Provides an asyncio front-end for Inline.
+Queries are executed in a thread pool, so many queries can be in flight at once.
+With a pool of mapdl instances (e.g. read-only queries on replicated databases),
+queries are distributed over all instances.
+@author: Nathanael Jöhrmann
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+from pyansystools.inline import Inline
+
+# methods of Inline, that are not available as coroutine
+_EXCLUDED_METHODS = {"batch", "clear_cache", "mapdl"}
+
+
+class AsyncInline:
+    """
+    Exposes all query methods of Inline as coroutines:
+
+        async_inline = AsyncInline([mapdl_1, mapdl_2])
+        x, y = await asyncio.gather(async_inline.nx(1), async_inline.ny(1))
+
+    Each mapdl instance handles only one query at a time (mapdl objects are not thread safe).
+    Further queries wait until an instance is idle.
+    """
+
+    def __init__(self, mapdl_pool, cache_size: int = 0):
+        """
+        :param mapdl_pool: Pyansys Mapdl object or list of Mapdl objects (with identical databases).
+        :param cache_size: (optional) cache size for each Inline instance (see Inline)
+        """
+        if not isinstance(mapdl_pool, (list, tuple)):
+            mapdl_pool = [mapdl_pool]
+        assert len(mapdl_pool) > 0, "AsyncInline needs at least one mapdl object"
+        self.inlines = [Inline(mapdl, cache_size) for mapdl in mapdl_pool]
+        self._executor = ThreadPoolExecutor(max_workers=len(self.inlines))
+        self._idle = None  # queue of idle Inline instances; created inside the running event loop
+        self._loop = None
+
+    def __len__(self):
+        return len(self.inlines)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shutdown the thread pool (does not close the mapdl instances).
+
+        :return: None
+        """
+        self._executor.shutdown(wait=True)
+
+    def _get_idle_queue(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._idle is None or self._loop is not loop:
+            self._loop = loop
+            self._idle = asyncio.Queue()
+            for inline in self.inlines:
+                self._idle.put_nowait(inline)
+        return self._idle
+
+    async def _run(self, name: str, *args, **kwargs):
+        """
+        Run the Inline method name on the next idle mapdl instance.
+        """
+        idle = self._get_idle_queue()
+        inline = await idle.get()
+        try:
+            method = functools.partial(getattr(inline, name), *args, **kwargs)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, method)
+        finally:
+            idle.put_nowait(inline)
+
+    def __getattr__(self, name):
+        method = getattr(Inline, name, None)
+        if (name.startswith("_") or name.startswith("iter_") or name in _EXCLUDED_METHODS
+                or not callable(method)):
+            raise AttributeError(f"'{type(self).__name__}' has no query '{name}'")
+
+        async def query(*args, **kwargs):
+            return await self._run(name, *args, **kwargs)
+
+        query.__name__ = name
+        query.__doc__ = method.__doc__
+        return query
+
+    async def map(self, name: str, arguments: Iterable) -> List:
+        """
+        Run the query name for each entry in arguments concurrently.
+
+            x_values = await async_inline.map("kx", [1, 2, 3])
+            distances = await async_inline.map("distkp", [(1, 2), (1, 3)])
+
+        :param name: name of the Inline method
+        :param arguments: iterable of single arguments or tuples of arguments
+        :return: list of results (same order as arguments)
+        """
+        query = getattr(self, name)
+        coroutines = [query(*argument) if isinstance(argument, tuple) else query(argument)
+                      for argument in arguments]
+        return list(await asyncio.gather(*coroutines))
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Provides a class to collect APDL commands and send them to ANSYS in a single submission.
+Values of interest are stored inside an APDL array parameter and read back with one transfer.
+
+@author: Nathanael Jöhrmann
+"""
+import functools
+import inspect
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+
+class CommandBlock:
+    """
+    Collects APDL commands, which are send to ANSYS with one call of mapdl.input_strings().
+    Each call of add_result() stores an APDL expression in the next position of
+    the array parameter self.parameter. After submit(), all results are returned
+    as numpy array (in the order add_result() was called).
+    With columns > 1, the result array has one row per result and is filled
+    via reserve_results() (e.g. inside an APDL *DO loop).
+    """
+
+    def __init__(self, parameter: str = "__block__", columns: int = 1):
+        """
+        :param parameter: Name of the APDL array parameter used to store results.
+            Creates/overwrites this parameter in ANSYS!
+        :param columns: Number of columns of the result array (default 1).
+        """
+        self.parameter = parameter
+        self.columns = columns
+        self.commands = []
+        self._n_results = 0
+
+    def __len__(self):
+        return len(self.commands)
+
+    @property
+    def n_results(self) -> int:
+        """Number of values stored in the result array."""
+        return self._n_results
+
+    def reference(self, index: Union[int, str], column: Union[int, str, None] = None) -> str:
+        """
+        APDL reference to a position in the result array.
+
+        :param index: position (row) in result array (starting with 1 like in APDL);
+            can also be an APDL parameter name (e.g. a *DO loop variable)
+        :param column: column in result array (only for columns > 1)
+        :return: str
+        """
+        if column is None or self.columns == 1:
+            return f"{self.parameter}({index})"
+        return f"{self.parameter}({index},{column})"
+
+    def add(self, command: str) -> None:
+        """
+        Add a single APDL command to the block.
+
+        :param command: str
+        :return: None
+        """
+        self.commands.append(command)
+
+    def add_result(self, expression: str) -> str:
+        """
+        Add command storing expression in the next position of the result array.
+
+        :param expression: APDL expression (e.g. an inline function like "kx(3)")
+        :return: APDL reference to the result (e.g. "__block__(4)")
+        """
+        assert self.columns == 1, "add_result() needs a result array with one column"
+        self._n_results += 1
+        reference = self.reference(self._n_results)
+        self.commands.append(f"{reference}={expression}")
+        return reference
+
+    def reserve_results(self, n: int) -> int:
+        """
+        Reserve n positions (rows) in the result array, e.g. to fill them inside an APDL *DO loop.
+
+        :param n: number of positions to reserve
+        :return: index of first reserved position
+        """
+        first_index = self._n_results + 1
+        self._n_results += n
+        return first_index
+
+    def get_input_string(self) -> str:
+        """
+        All commands of the block (including definition of the result array, if needed) as one string.
+
+        :return: str
+        """
+        if not self._n_results:
+            return "\n".join(self.commands)
+        header = [f"*DEL,{self.parameter},,NOPR"]
+        if self.columns > 1:
+            header.append(f"*DIM,{self.parameter},ARRAY,{self._n_results},{self.columns}")
+        else:
+            header.append(f"*DIM,{self.parameter},ARRAY,{self._n_results}")
+        return "\n".join(header + self.commands)
+
+    def submit(self, mapdl) -> np.ndarray:
+        """
+        Send all commands to ANSYS and read back the result array.
+
+        :param mapdl: Pyansys Mapdl object to control ANSYS.
+        :return: numpy array with all results (float64); shape (n,) or (n, columns)
+        """
+        shape = (self._n_results,) if self.columns == 1 else (self._n_results, self.columns)
+        mapdl.input_strings(self.get_input_string())
+        if not self._n_results:
+            return np.empty(shape)
+        result = np.asarray(mapdl.parameters[self.parameter], dtype=np.float64)
+        return result.reshape(shape)
+
+
+class ResultReference(str):
+    """
+    APDL reference to a value in the result array of a CommandBlock (e.g. "__block__(3)").
+    As subclass of str, it can be used directly as argument of APDL commands.
+    After submitting the block, use resolve_references() to replace it by the actual value.
+    """
+
+    def __new__(cls, reference: str, index: int):
+        result = super().__new__(cls, reference)
+        result.index = index
+        return result
+
+
+def resolve_references(value, results: np.ndarray):
+    """
+    Replace ResultReferences (also inside lists and tuples) by the integer values from results.
+
+    :param value: ResultReference, list, tuple or any other object (returned unchanged)
+    :param results: numpy array returned by CommandBlock.submit()
+    :return: value with replaced references
+    """
+    if isinstance(value, ResultReference):
+        return int(results[value.index - 1])
+    if isinstance(value, list):
+        return [resolve_references(item, results) for item in value]
+    if isinstance(value, tuple):
+        return tuple(resolve_references(item, results) for item in value)
+    return value
+
+
+# pymapdl methods for slash commands
+SLASH_COMMANDS = {"prep7": "/PREP7", "slashsolu": "/SOLU", "post1": "/POST1", "clear": "/CLEAR"}
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(name: str) -> Optional[Tuple[str, ...]]:
+    """
+    Names of the command fields of the pymapdl method name (e.g. ("npt", "x", "y", "z") for k);
+    None, if pymapdl has no such method.
+    """
+    try:
+        from ansys.mapdl.core.mapdl import MapdlBase
+    except ImportError:  # pymapdl < 0.68
+        from ansys.mapdl.core.mapdl import _MapdlCore as MapdlBase
+    method = getattr(MapdlBase, name, None)
+    if method is None:
+        return None
+    parameters = list(inspect.signature(method).parameters.values())[1:]  # without self
+    return tuple(parameter.name for parameter in parameters
+                 if parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD)
+
+
+def _command_fields(name: str, args, kwargs) -> tuple:
+    """
+    Fields of a pymapdl method call in APDL order (keyword arguments placed by the parameter names of pymapdl).
+    """
+    if not kwargs:
+        return tuple(args)
+    field_names = _field_names(name) or ()
+    unknown = [key for key in kwargs if key not in field_names[len(args):]]
+    if unknown:
+        raise TypeError(f"{name}(): keyword arguments {unknown} can't be written as APDL command fields "
+                        f"(only the command fields of pymapdl's {name}() are possible)")
+    fields = list(args) + [""] * (len(field_names) - len(args))
+    for key, value in kwargs.items():
+        fields[field_names.index(key)] = value
+    return tuple(fields)
+
+
+def format_command(name: str, args, kwargs: Optional[dict] = None) -> str:
+    """
+    APDL command for a call of the pymapdl method name (e.g. format_command("k", ("", 1, 2)) -> "K,,1,2",
+    format_command("lsel", ("S", "LINE"), {"vmin": 3}) -> "LSEL,S,LINE,,3").
+
+    :param name: name of the pymapdl method
+    :param args: arguments of the method call (None is written as empty field)
+    :param kwargs: (optional) keyword arguments of the method call (command fields of the pymapdl method)
+    :return: str
+    """
+    command = SLASH_COMMANDS.get(name, name.upper())
+    arguments = ["" if arg is None else str(arg) for arg in _command_fields(name, args, kwargs)]
+    return ",".join([command] + arguments).rstrip(",")
+
+
+class CommandRecorder:
+    """
+    Stands in for a mapdl object and records calls of pymapdl methods as APDL commands in a CommandBlock
+    (e.g. recorder.k("", 1, 2) -> "K,,1,2"). Commands creating an entity (like k, l, al or bsplin)
+    return a ResultReference to the number of the new entity (APDL parameter _RETURN).
+    Queries (like get or queries) are not possible, because nothing is send to ANSYS before submit().
+    """
+
+    # pymapdl methods, whose APDL command sets _RETURN to the number of the created entity
+    _CREATING_COMMANDS = {"k", "kbetw", "kcenter", "kl", "l", "larc", "lang", "l2ang", "l2tan", "lccat",
+                          "lcomb", "lfillt", "bsplin", "spline", "a", "al", "ads1", "v", "va"}
+    # methods needing a response of ANSYS
+    _QUERIES = {"get", "get_value", "get_array", "queries", "parameters", "mesh", "geometry", "run_multiline"}
+
+    def __init__(self, block: CommandBlock = None):
+        self.block = block if block is not None else CommandBlock()
+
+    def run(self, command: str) -> str:
+        self.block.add(command)
+        return ""
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name in self._QUERIES:
+            raise AttributeError(f"'{name}' is not available while recording commands "
+                                 f"(nothing is send to ANSYS before submit())")
+
+        def record(*args, **kwargs):
+            self.block.add(format_command(name, args, kwargs))
+            if name in self._CREATING_COMMANDS:
+                reference = self.block.add_result("_RETURN")
+                return ResultReference(reference, self.block.n_results)
+            return None
+
+        return record
+
+    def submit(self, mapdl) -> np.ndarray:
+        """
+        Send all recorded commands to ANSYS (see CommandBlock.submit()).
+
+        :param mapdl: Pyansys Mapdl object to control ANSYS.
+        :return: numpy array with all results
+        """
+        return self.block.submit(mapdl)
@@ -6,24 +6,34 @@ Classes:
 
     Point
     Point2D
+    FrozenPoint
+    FrozenPoint2D
+    PointArray
     Geometry2d
+    GeometryBatch
+    KeypointRegistry
     Square
     Film_with_roi
 
 @author: Nathanael Jöhrmann
 """
-import copy
 import math
 from abc import ABC, abstractmethod
-from typing import Union, Type, List, Tuple
+from typing import Union, Type, List, Tuple, Iterable, Optional
 
+import numpy as np
 from ansys.mapdl.core import launch_mapdl
 
+from pyansystools.area_function import AreaFunction
+from pyansystools.command_block import CommandBlock, CommandRecorder, resolve_references
+from pyansystools.macros import select_entities
+
 
 class Point:
     """
     3D point
     """
+    __slots__ = ("x", "y", "z")
 
     def __init__(self, x: float = 0, y: float = 0, z: float = 0):
         self.x = x
@@ -33,39 +43,66 @@ class Point:
     def __eq__(self, other):
         """Overrides the default implementation"""
         if isinstance(other, Point):
-            return self.get_list() == other.get_list()
+            return self.as_tuple() == other.as_tuple()
         return NotImplemented
 
+    def __repr__(self):
+        return f"{type(self).__name__}{self.as_tuple()}"
+
+    def __copy__(self):
+        return type(self)(*self.as_tuple())
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()  # coordinates are immutable numbers -> shallow copy is enough
+
+    def copy(self) -> "Point":
+        return self.__copy__()
+
+    def frozen(self) -> "FrozenPoint":
+        """
+        Immutable (and hashable) copy of the point.
+        """
+        return FrozenPoint(*self.as_tuple())
+
     def shift_by(self, point: Union["Point", Tuple[float, float, float]]) -> None:
         x, y, z = point
         self.x += x
         self.y += y
         self.z += z
 
+    def as_tuple(self) -> tuple:
+        return self.x, self.y, self.z
+
     def get_list(self):
-        return [self.x, self.y, self.z]
+        return list(self.as_tuple())
 
     def __iter__(self):
-        for i in (self.x, self.y, self.z):
-            yield i
+        return iter(self.as_tuple())
 
 
 class Point2D(Point):
     """
     Class representing a 2D point.
     """
+    __slots__ = ()
 
     def __init__(self, x=0, y=0):
         super().__init__(x, y, z=0)
 
+    def frozen(self) -> "FrozenPoint2D":
+        """
+        Immutable (and hashable) copy of the point.
+        """
+        return FrozenPoint2D(self.x, self.y)
+
     def shift_by(self, point: "Point2D") -> None:
         self.x += point.x
         self.y += point.y
 
     #        super().shift_by(Point(self.x, self.y, z=0))
 
-    def get_list(self):
-        return [self.x, self.y]
+    def as_tuple(self) -> tuple:
+        return self.x, self.y
 
     def rotate_radians(self, angle: float):
         x = self.x * math.cos(angle) - self.y * math.sin(angle)
@@ -73,9 +110,280 @@ class Point2D(Point):
         self.x = x
         self.y = y
 
+
+class FrozenPoint(Point):
+    """
+    Immutable 3D point. Can be used as dictionary key or in sets.
+    """
+    __slots__ = ()
+
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "z", z)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def frozen(self) -> "FrozenPoint":
+        return self
+
+
+class FrozenPoint2D(Point2D):
+    """
+    Immutable 2D point. Can be used as dictionary key or in sets.
+    """
+    __slots__ = ()
+
+    def __init__(self, x: float = 0, y: float = 0):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+        object.__setattr__(self, "z", 0)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def frozen(self) -> "FrozenPoint2D":
+        return self
+
+
+class PointArray:
+    """
+    Collection of 2D points stored in a numpy array with shape (n, 2).
+    Can be used like a list of Point2D (append, clear, len, iteration, indexing),
+    but rotate, shift and copy work on all points at once.
+    Note: indexing returns a new Point2D - changing it does not change the PointArray.
+    """
+
+    def __init__(self, points: Iterable = ()):
+        """
+        :param points: iterable of points, that can be unpacked in 2 coordinates
+            (e.g. Point2D, (x, y) or [x, y])
+        """
+        coordinates = [tuple(point) for point in points]
+        self._n = len(coordinates)
+        self._data = np.array(coordinates, dtype=np.float64).reshape(self._n, 2)
+
+    @classmethod
+    def from_array(cls, array) -> "PointArray":
+        """
+        Create PointArray from array_like with shape (n, 2) (data is copied).
+
+        :param array: array_like with shape (n, 2)
+        :return: PointArray
+        """
+        result = cls()
+        result._data = np.array(array, dtype=np.float64).reshape(-1, 2)
+        result._n = len(result._data)
+        return result
+
+    def as_array(self) -> np.ndarray:
+        """
+        Coordinates as numpy array with shape (n, 2) (a view - changes are applied to the PointArray).
+
+        :return: numpy array
+        """
+        return self._data[:self._n]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.as_array()[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.as_array()[:, 1]
+
+    def __len__(self):
+        return self._n
+
     def __iter__(self):
-        for i in (self.x, self.y):
-            yield i
+        for x, y in self.as_array().tolist():
+            yield Point2D(x, y)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointArray.from_array(self.as_array()[index])
+        x, y = self.as_array()[index].tolist()
+        return Point2D(x, y)
+
+    def __repr__(self):
+        return f"PointArray({self.as_array().tolist()})"
+
+    def append(self, point: Union[Point2D, Tuple[float, float]]) -> None:
+        if self._n == len(self._data):  # grow capacity (amortized constant time)
+            data = np.empty((max(4, 2 * self._n), 2))
+            data[:self._n] = self.as_array()
+            self._data = data
+        self._data[self._n] = tuple(point)
+        self._n += 1
+
+    def extend(self, points: Iterable) -> None:
+        other = points if isinstance(points, PointArray) else PointArray(points)
+        self._data = np.concatenate((self.as_array(), other.as_array()))
+        self._n = len(self._data)
+
+    def clear(self) -> None:
+        self._data = np.empty((0, 2))
+        self._n = 0
+
+    def copy(self) -> "PointArray":
+        return PointArray.from_array(self.as_array())
+
+    def rotate(self, radians: float) -> None:
+        """
+        Rotate all points around (0, 0) (same as Point2D.rotate_radians for each point).
+
+        :param radians: rotation angle
+        """
+        if radians == 0:
+            return
+        cos, sin = math.cos(radians), math.sin(radians)
+        points = self.as_array()
+        points[:] = points @ np.array([[cos, sin], [-sin, cos]])
+
+    def shift(self, point: Union[Point, Tuple[float, float]]) -> None:
+        """
+        Shift all points by point (same as Point2D.shift_by for each point).
+
+        :param point: Point2D or (x, y)
+        """
+        x, y = tuple(point)[:2]
+        self.as_array()[:] += (x, y)
+
+    def transform(self, radians: float, destination: Union[Point, Tuple[float, float]]) -> None:
+        """
+        Rotate all points around (0, 0) and shift them to destination afterwards.
+
+        :param radians: rotation angle
+        :param destination: Point2D or (x, y)
+        """
+        self.rotate(radians)
+        self.shift(destination)
+
+
+class _PointHash:
+    """
+    Tolerance-aware hash grid mapping 2D positions to values (e.g. keypoint numbers).
+    Positions match, if x and y differ by at most tol (like math.isclose(..., abs_tol=tol)).
+    A lookup only checks the neighbouring grid cells, so it needs O(1) time.
+    """
+
+    def __init__(self, tol: float = 1e-6):
+        if not tol > 0:
+            raise ValueError(f"tol has to be > 0 (got {tol})")
+        self.tol = tol
+        self._cells = {}
+        self._n_entries = 0
+
+    def __len__(self):
+        return self._n_entries
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.tol), math.floor(y / self.tol)
+
+    def add(self, x: float, y: float, value) -> None:
+        """
+        Add value at position (x, y).
+        """
+        self._cells.setdefault(self._cell(x, y), []).append((self._n_entries, x, y, value))
+        self._n_entries += 1
+
+    def find(self, x: float, y: float, default=None):
+        """
+        Value at position (x, y) within tolerance (the first added, if several match).
+        """
+        cell_x, cell_y = self._cell(x, y)
+        result = None
+        for i in (cell_x - 1, cell_x, cell_x + 1):
+            for j in (cell_y - 1, cell_y, cell_y + 1):
+                for entry in self._cells.get((i, j), ()):
+                    if abs(entry[1] - x) <= self.tol and abs(entry[2] - y) <= self.tol:
+                        if result is None or entry[0] < result[0]:
+                            result = entry
+        return default if result is None else result[3]
+
+    def map_values(self, function) -> None:
+        """
+        Replace each value by function(value).
+        """
+        for entries in self._cells.values():
+            entries[:] = [(index, x, y, function(value)) for index, x, y, value in entries]
+
+
+class KeypointRegistry:
+    """
+    Model-wide index of keypoints (by position) and straight lines (by their keypoints).
+    Geometries merged to the registry (create_merged_to(registry)) share keypoints and lines
+    with all geometries registered before (O(1) per point), e.g. to build large conforming layouts:
+
+        registry = KeypointRegistry()
+        for i in range(100):
+            Rectangle(mapdl, 1, 1, destination=Point2D(i, 0)).create_merged_to(registry)
+
+    Merged geometries are registered automatically. Use register() for geometries created otherwise.
+    """
+
+    def __init__(self, tol: float = 1e-6):
+        """
+        :param tol: (optional) Absolute tolerance when comparing x and y of keypoints (> 0). Defaults to 1e-6
+        :raises ValueError: if tol <= 0
+        """
+        self._keypoints = _PointHash(tol)
+        self._lines = {}  # frozenset of keypoint numbers -> line number
+
+    @property
+    def n_keypoints(self) -> int:
+        return len(self._keypoints)
+
+    @property
+    def n_lines(self) -> int:
+        return len(self._lines)
+
+    def register(self, geometry: "Geometry2d") -> None:
+        """
+        Add keypoints and straight lines of an already created geometry.
+
+        :param geometry: Geometry2d instance
+        :return: None
+        """
+        for (x, y), keypoint_number in zip(geometry.points.as_array().tolist(), geometry.keypoints):
+            if self.find_keypoint(x, y) is None:
+                self.add_keypoint(x, y, keypoint_number)
+        for keypoint_1, keypoint_2, line in geometry._line_keypoints:
+            if self.find_line(keypoint_1, keypoint_2) is None:
+                self.add_line(keypoint_1, keypoint_2, line)
+
+    def find_keypoint(self, x: float, y: float):
+        """
+        :return: number of keypoint at position (x, y) or None
+        """
+        return self._keypoints.find(x, y)
+
+    def add_keypoint(self, x: float, y: float, keypoint_number) -> None:
+        self._keypoints.add(x, y, keypoint_number)
+
+    def find_line(self, keypoint_1, keypoint_2):
+        """
+        :return: number of straight line between both keypoints (in any direction) or None
+        """
+        return self._lines.get(frozenset((keypoint_1, keypoint_2)))
+
+    def add_line(self, keypoint_1, keypoint_2, line) -> None:
+        self._lines[frozenset((keypoint_1, keypoint_2))] = line
+
+    def _resolve_references(self, results: np.ndarray) -> None:
+        """
+        Replaces references to recorded entities (see GeometryBatch) by the actual entity numbers.
+        """
+        self._keypoints.map_values(lambda value: resolve_references(value, results))
+        self._lines = {frozenset(resolve_references(list(keypoints), results)): resolve_references(line, results)
+                       for keypoints, line in self._lines.items()}
 
 
 class Geometry2d(ABC):
@@ -98,14 +406,16 @@ class Geometry2d(ABC):
         """
         self._mapdl = mapdl
         self._rotation_angle = rotation_angle
-        self._destination = copy.deepcopy(destination)
+        self._destination = Point2D(destination.x, destination.y)
 
-        self._raw_points = []  # basic positions of geometry
-        self.points = []  # actual positions including degrees and shift
+        self._raw_points = PointArray()  # basic positions of geometry
+        self.points = PointArray()  # actual positions including degrees and shift
         self.keypoints = []  # ansys keypoint numbers
         self.lines = []  # ansys line numbers clockwise starting on left side
         self.areas = []  # ansys area numbers
         self.component_name = ''
+        self._registry = None  # KeypointRegistry the geometry is merged to
+        self._line_keypoints = []  # (keypoint, keypoint, line) for each straight line
 
     def set_element_type(self, et: int) -> None:
         """
@@ -127,26 +437,20 @@ class Geometry2d(ABC):
         """
         assert self.areas is not [], "Can't set material number without area"
         self._mapdl.prep7()
-        self._mapdl.asel("NONE")
-        for area in self.areas:
-            self._mapdl.asel("A", "AREA", area)
+        self.select_areas()
         self._mapdl.aatt(mat)
 
     def select_lines(self):
         """
-        Selects all lines belonging to the geometry.
+        Selects all lines belonging to the geometry (one command per range of contiguous line numbers).
         """
-        self._mapdl.lsel("none")
-        for line_number in self.lines:
-            self._mapdl.lsel("A", "LINE", "", line_number)
+        select_entities(self._mapdl, "LINE", self.lines)
 
     def select_areas(self):
         """
-        Selects all areas belonging to the geometry.
+        Selects all areas belonging to the geometry (one command per range of contiguous area numbers).
         """
-        self._mapdl.asel("none")
-        for area_number in self.areas:
-            self._mapdl.asel("A", "AREA", "", area_number)
+        select_entities(self._mapdl, "AREA", self.areas)
 
     def set_destination(self, point: Point) -> None:
         """
@@ -187,6 +491,62 @@ class Geometry2d(ABC):
     def create(self):
         pass
 
+    def create_compiled(self) -> None:
+        """
+        Same as create(), but all APDL commands are send to ANSYS as one block (one round-trip)
+        and the numbers of the created keypoints, lines and areas are read back with one transfer.
+        Only possible, if creating the geometry needs no response of ANSYS (e.g. no get or queries).
+
+        :return: None
+        """
+        self._run_compiled(self.create)
+
+    def _run_compiled(self, function, *args) -> None:
+        """
+        Calls function while all commands are recorded instead of being send to ANSYS.
+        Afterwards the recorded commands are submitted and the references to created entities
+        (see CommandRecorder) are replaced by the actual entity numbers.
+        """
+        recorder = CommandRecorder(CommandBlock("__geometry__"))
+        self._record(recorder, function, *args)
+        self._resolve_references(recorder.submit(self._mapdl))
+
+    def _record(self, recorder: CommandRecorder, function, *args):
+        """
+        Calls function with recorder instead of mapdl (nothing is send to ANSYS).
+
+        :return: result of function
+        """
+        mapdl = self._mapdl
+        self._mapdl = recorder
+        try:
+            return function(*args)
+        finally:
+            self._mapdl = mapdl
+
+    def _run_batched(self, function, *args):
+        """
+        Calls function and sends all its commands to ANSYS as one block (unless they are recorded anyway).
+        References to created entities in the result of function are replaced by the entity numbers.
+
+        :return: result of function
+        """
+        if isinstance(self._mapdl, CommandRecorder):
+            return function(*args)
+        recorder = CommandRecorder(CommandBlock("__geometry__"))
+        result = self._record(recorder, function, *args)
+        return resolve_references(result, recorder.submit(self._mapdl))
+
+    def _resolve_references(self, results: np.ndarray) -> None:
+        """
+        Replaces references to recorded entities in all attributes by the actual entity numbers.
+        """
+        for name, value in vars(self).items():
+            if isinstance(value, list):
+                value[:] = resolve_references(value, results)  # keep list identity
+            else:
+                setattr(self, name, resolve_references(value, results))
+
     def _create_keypoints(self) -> None:
         """
         Creates Keypoints for the geometry in ansys. The number and position
@@ -195,8 +555,8 @@ class Geometry2d(ABC):
 
         :return: None
         """
-        for point in self.points:
-            self.keypoints.append(self._mapdl.k("", *point.get_list()))
+        for x, y in self.points.as_array().tolist():
+            self.keypoints.append(self._mapdl.k("", x, y))
 
     def _create_keypoints_merged(self, geometry2d: Union["Geometry2d", Type["Geometry2d"]]) -> None:
         """
@@ -207,21 +567,41 @@ class Geometry2d(ABC):
         that keypoint is used instead, thus merging both geometries.
         Make sure you are in PREP7 befor calling this function.
 
+        Positions are compared locally using the points of geometry2d (no queries to ANSYS).
+
         :param geometry2d:
-            Geometry to which new area should be glued (sharing KPs/lines).
+            Geometry (or KeypointRegistry) to which new area should be glued (sharing KPs/lines).
         :return: None
         """
-        for point in self.points:
-            found_keypoint = False
-            for keypoint_number in geometry2d.keypoints:
-                if self._check_keypoint_is_at_point(keypoint_number, point):
-                    self.keypoints.append(keypoint_number)
-                    found_keypoint = True
-            if not found_keypoint:
-                self.keypoints.append(self._mapdl.k("", *point.get_list()))
+        if isinstance(geometry2d, KeypointRegistry):
+            self._registry = registry = geometry2d
+        else:
+            registry = KeypointRegistry()
+            registry.register(geometry2d)
+        for x, y in self.points.as_array().tolist():
+            keypoint_number = registry.find_keypoint(x, y)
+            if keypoint_number is None:
+                keypoint_number = self._mapdl.k("", x, y)
+                registry.add_keypoint(x, y, keypoint_number)
+            self.keypoints.append(keypoint_number)
+
+    def _create_line(self, keypoint_1, keypoint_2):
+        """
+        Creates a straight line between two keypoints (APDL L). If the geometry is merged to
+        a KeypointRegistry, an already existing line between both keypoints is used instead.
+
+        :return: line number
+        """
+        line = None if self._registry is None else self._registry.find_line(keypoint_1, keypoint_2)
+        if line is None:
+            line = self._mapdl.l(keypoint_1, keypoint_2)
+            if self._registry is not None:
+                self._registry.add_line(keypoint_1, keypoint_2, line)
+        self._line_keypoints.append((keypoint_1, keypoint_2, line))
+        return line
 
     def _calc_points(self):
-        self.points = copy.deepcopy(self._raw_points)
+        self.points = self._raw_points.copy()
         self._rotate_and_shift_points()
 
     def _rotate_and_shift_points(self):
@@ -236,15 +616,13 @@ class Geometry2d(ABC):
         """
         Rotates geometry by _rotation_angle (in radians).
         """
-        for point in self.points:
-            point.rotate_radians(self._rotation_angle)
+        self.points.rotate(self._rotation_angle)
 
     def _shift_points_to_destination(self):
         """
         Moves the default positions to their destination via _destination.
         """
-        for point in self.points:
-            point.shift_by(self._destination)
+        self.points.shift(self._destination)
 
     def _mesh(self):
         """
@@ -254,24 +632,69 @@ class Geometry2d(ABC):
         # AMESH Generates nodes and area elements within areas
         self._mapdl.amesh("ALL")
 
-    def _check_keypoint_is_at_point(self, keypoint_number: int, point: "Point2D", tol: float = 1e-6) -> bool:
+
+class GeometryBatch:
+    """
+    Collects many Geometry2d instances and creates all of them in ANSYS with one submission
+    (see Geometry2d.create_compiled()). Afterwards keypoints, lines and areas of each geometry are set.
+
+        with GeometryBatch(mapdl) as batch:
+            for i in range(100):
+                batch.add(Rectangle(mapdl, 1, 1, destination=Point2D(2 * i, 0)))
+    """
+
+    def __init__(self, mapdl):
+        """
+        :param mapdl: Pyansys Mapdl object to control ANSYS.
+        """
+        self._mapdl = mapdl
+        self.geometries = []
+        self._recorder = CommandRecorder(CommandBlock("__geometry_batch__"))
+
+    def __len__(self):
+        return len(self.geometries)
+
+    def __iter__(self):
+        return iter(self.geometries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.create()
+
+    def add(self, geometry: Geometry2d, merged_to: Optional[Geometry2d] = None) -> Geometry2d:
+        """
+        Add geometry to the batch. The commands to create it are recorded immediately,
+        so later changes of geometry (e.g. set_destination()) have no effect.
+
+        :param geometry: Geometry2d instance (not yet created)
+        :param merged_to: (optional) geometry or KeypointRegistry to merge with (see create_merged_to());
+            a geometry can be part of the same batch
+        :return: geometry
+        """
+        if merged_to is None:
+            geometry._record(self._recorder, geometry.create)
+        else:
+            geometry._record(self._recorder, geometry.create_merged_to, merged_to)
+        self.geometries.append(geometry)
+        return geometry
+
+    def create(self) -> None:
         """
-        Checks if keypoint is at the position point.
+        Create all added geometries in ANSYS (one round-trip) and set their keypoints, lines and areas.
 
-        :param keypoint_number: Ansys keypoint number of the keypoint to check.
-        :param point: Position where keypoint is expected.
-        :param tol: (optional)
-            Absolute tolerance when comparing float values for x and y.
-            Defaults to 1e-6
+        :return: None
         """
-        # todo:
-        q = self._mapdl.queries
-        x = self._mapdl.get("KP", keypoint_number, "LOC", "X")
-        x = q.kx(keypoint_number)
-        y = self._mapdl.get("KP", keypoint_number, "LOC", "Y")
-        y = q.ky(keypoint_number)
-        return (math.isclose(x, point.x, abs_tol=tol)
-                and math.isclose(y, point.y, abs_tol=tol))
+        results = self._recorder.submit(self._mapdl)
+        for geometry in self.geometries:
+            geometry._resolve_references(results)
+        registries = {id(geometry._registry): geometry._registry for geometry in self.geometries
+                      if geometry._registry is not None}
+        for registry in registries.values():
+            registry._resolve_references(results)
+        self._recorder = CommandRecorder(CommandBlock("__geometry_batch__"))
 
 
 class Polygon(Geometry2d):
@@ -286,7 +709,7 @@ class Polygon(Geometry2d):
     def __init__(self, mapdl, raw_points: list,
                  rotation_angle: float = 0, destination: "Point2D" = Point2D(0, 0)) -> None:
         super().__init__(mapdl, rotation_angle, destination)
-        self._raw_points = []
+        self._raw_points = PointArray()
         self._set_raw_points_from_input_points(raw_points)
         # calc_raw_points not needed here. But in future maybe use it,
         # to check, if points result in valid geometry (e.g. one area ...)
@@ -298,7 +721,7 @@ class Polygon(Geometry2d):
         for i in range(0, kp_count):
             kp1 = self.keypoints[i]
             kp2 = self.keypoints[(i + 1) % kp_count]
-            self.lines.append(self._mapdl.l(kp1, kp2))
+            self.lines.append(self._create_line(kp1, kp2))
 
     def _create_area(self) -> None:
         super().select_lines()
@@ -309,6 +732,13 @@ class Polygon(Geometry2d):
         self._create_keypoints()
         self._create_lines()
         self._create_area()
+        self._name_lines()
+
+    def _name_lines(self) -> None:
+        """
+        Called after creating the lines. Subclasses can override it to store line numbers in named attributes.
+        """
+        pass
 
     def mesh(self, nir: int) -> None:
         """
@@ -328,18 +758,18 @@ class Polygon(Geometry2d):
         That would also change KP-numbers, line numbers and area numbers
         inside ANSYS.
 
-        :param geometry2d: Geometry to which the new area should be glued (sharing KPs/Lines).
+        :param geometry2d: Geometry (or KeypointRegistry) to which the new area should be glued (sharing KPs/Lines).
         """
         super()._create_keypoints_merged(geometry2d)
         self._create_lines()
         self._create_area()
+        self._name_lines()
 
     def _set_raw_points_from_input_points(self, points: list) -> None:
         """
-        Converts points to a list of Point2D and
+        Converts points to a PointArray and stores them as raw points.
         """
-        for point in points:
-            self._raw_points.append(Point2D(*point))
+        self._raw_points.extend(points)
 
 
 class Rectangle(Polygon):
@@ -360,15 +790,14 @@ class Rectangle(Polygon):
         super().__init__(mapdl, self._raw_points, rotation_angle, destination)
 
     def _calc_raw_points(self) -> None:
-        self._raw_points = [
+        self._raw_points = PointArray([
             Point2D(0, 0),
             Point2D(0, self._h),
             Point2D(self._b, self._h),
             Point2D(self._b, 0)
-        ]
+        ])
 
-    def create(self) -> None:
-        super().create()
+    def _name_lines(self) -> None:
         self.line_left = self.lines[0]
         self.line_top = self.lines[1]
         self.line_right = self.lines[2]
@@ -403,17 +832,16 @@ class Substrate(Polygon):
         super().__init__(mapdl, self._raw_points, rotation_angle, destination)
 
     def _calc_raw_points(self) -> None:
-        self._raw_points = [
+        self._raw_points = PointArray([
             Point2D(0, 0),
             Point2D(0, self._h),
             Point2D(self._b_roi, self._h),
             Point2D(self._b, self._h),
             Point2D(self._b, 0),
             Point2D(self._b_roi, 0)
-        ]
+        ])
 
-    def create(self) -> None:
-        super().create()
+    def _name_lines(self) -> None:
         self.line_left = self.lines[0]
         self.line_top1 = self.lines[1]
         self.line_top2 = self.lines[2]
@@ -444,14 +872,10 @@ class Isogon(Polygon):
         super().__init__(mapdl, self._raw_points, rotation_angle, destination)
 
     def _calc_raw_points(self) -> None:
-        self._raw_points = []
-        # x = -self._r
-        # y = 0
-        for i in range(self._parts):
-            # start left -> x = -r*cos(a)
-            x = -self._r * math.cos(i * (2 * math.pi / self._parts))
-            y = self._r * math.sin(i * (2 * math.pi / self._parts))
-            self._raw_points.append(Point2D(x, y))
+        angles = np.arange(self._parts) * (2 * math.pi / self._parts)
+        # start left -> x = -r*cos(a)
+        self._raw_points = PointArray.from_array(np.column_stack((-self._r * np.cos(angles),
+                                                                  self._r * np.sin(angles))))
 
 
 # class FilmWithROI_Old(Geometry2d):
@@ -608,17 +1032,17 @@ class _FilmWithROI(Geometry2d):
     def _create_film_lines(self):
         k = self.keypoints
 
-        self.film_line_left = self._mapdl.l(k[0], k[1])
+        self.film_line_left = self._create_line(k[0], k[1])
         self.film_lines.append(self.film_line_left)
         # self.film_line_roi_horizontal = self._mapdl.l(k[1], k[2])
         # self.film_lines.append(self.film_line_roi_horizontal)
         # self.film_line_roi_vertical = self._mapdl.l(k[2], k[3])
         # self.film_lines.append(self.film_line_roi_vertical)
-        self.film_line_top = self._mapdl.l(k[1], k[2])
+        self.film_line_top = self._create_line(k[1], k[2])
         self.film_lines.append(self.film_line_top)
-        self.film_line_right = self._mapdl.l(k[2], k[3])
+        self.film_line_right = self._create_line(k[2], k[3])
         self.film_lines.append(self.film_line_right)
-        self.film_line_bottom = self._mapdl.l(k[3], k[0])
+        self.film_line_bottom = self._create_line(k[3], k[0])
         self.film_lines.append(self.film_line_bottom)
 
         self.roi_line_top = self.film_line_top
@@ -652,7 +1076,7 @@ class _FilmWithROI(Geometry2d):
         That would also change keypoint numbers, line numbers and area numbers
         inside ANSYS.
 
-        :param geometry2d: Geometry to which the new area will merge (sharing keypoints).
+        :param geometry2d: Geometry (or KeypointRegistry) to which the new area will merge (sharing keypoints).
         """
         self._mapdl.prep7()
         self._create_keypoints_merged(geometry2d)
@@ -747,10 +1171,10 @@ class FilmWithROI(Geometry2d):
         # self.film_lines.append(self.film_line_left)
         # self.film_line_roi_horizontal = self._mapdl.l(k[1], k[2])
         # self.film_lines.append(self.film_line_roi_horizontal)
-        self.film_line_roi_vertical = self._mapdl.l(k[1], k[2])
-        self.film_line_top = self._mapdl.l(k[2], k[3])
-        self.film_line_right = self._mapdl.l(k[3], k[4])
-        self.film_line_bottom = self._mapdl.l(k[4], k[1])
+        self.film_line_roi_vertical = self._create_line(k[1], k[2])
+        self.film_line_top = self._create_line(k[2], k[3])
+        self.film_line_right = self._create_line(k[3], k[4])
+        self.film_line_bottom = self._create_line(k[4], k[1])
 
         self.film_lines.append(self.film_line_roi_vertical)
         self.film_lines.append(self.film_line_top)
@@ -760,10 +1184,10 @@ class FilmWithROI(Geometry2d):
     def _create_roi_lines(self) -> None:
         k = self.keypoints
 
-        self.roi_line_left = self._mapdl.l(k[0], k[5])
+        self.roi_line_left = self._create_line(k[0], k[5])
         self.roi_line_right = self.film_line_roi_vertical
-        self.roi_line_top = self._mapdl.l(k[5], k[2])
-        self.roi_line_bottom = self._mapdl.l(k[1], k[0])# self.film_line_roi_horizontal
+        self.roi_line_top = self._create_line(k[5], k[2])
+        self.roi_line_bottom = self._create_line(k[1], k[0])# self.film_line_roi_horizontal
         # self.roi_line_bottom = self._mapdl.l(k[0], k[1])  # self.film_line_roi_horizontal
 
         self.roi_lines.append(self.roi_line_left)
@@ -786,7 +1210,7 @@ class FilmWithROI(Geometry2d):
         That would also change keypoint numbers, line numbers and area numbers
         inside ANSYS.
 
-        :param geometry2d: Geometry to which the new area will merge (sharing keypoints).
+        :param geometry2d: Geometry (or KeypointRegistry) to which the new area will merge (sharing keypoints).
         """
         self._mapdl.prep7()
         self._create_keypoints_merged(geometry2d)
@@ -960,7 +1384,7 @@ class _Tip(Geometry2d):
     """
 
     def __init__(self, mapdl, shape_coefficients: List[float],
-                 rotation_angle: float = 0, destination: Point2D = Point2D(0, 0), radius=30):
+                 rotation_angle: float = 0, destination: Point2D = Point2D(0, 0), radius=30, n_splines: int = 20):
         """
         Initilize Tip-Instance and calculate points.
             Parameters
@@ -976,14 +1400,22 @@ class _Tip(Geometry2d):
                 Default value = 0
             destination : Point2D
                 Position inside ANSYS, where geometry should be created.
+            n_splines : int (optional)
+                Number of points describing the tip shape (rounded to form 5*k+1).
+                Must be at least 5 and smaller than radius. Default value = 20
         """
         super().__init__(mapdl, rotation_angle, destination)
         # todo: add parameter for area fit function
         self._shape_coefficients = shape_coefficients
-        self._n_splines = 20
+        self._n_splines = n_splines
         self._radius = radius
+        if n_splines < 5:
+            raise ValueError(f"n_splines ({n_splines}) must be at least 5")
         # make sure, _n_splines is of form 5*k+1 !
         self._n_splines = (self._n_splines // 5) * 5 + 1
+        # spline points are placed at the depths 1 ... n_splines, which must stay below the top at radius
+        if self._n_splines >= radius:
+            raise ValueError(f"n_splines ({self._n_splines} after rounding) must be smaller than radius ({radius})")
         self.line_left = None
         self.line_top = None
         self.line_right = None
@@ -992,15 +1424,10 @@ class _Tip(Geometry2d):
         super()._calc_points()
 
     def _calc_raw_points(self) -> None:
-        self._raw_points.clear()
-
-        self._raw_points.append(Point2D(0, 0))
-        self._raw_points.append(Point2D(0, self._radius))
-        self._raw_points.append(Point2D(self._calc_tip_radius(self._radius), self._radius))
-
-        for i in reversed(range(1, self._n_splines + 1)):
-            y = i  # radius * pow(i / self._n_splines, 2)
-            self._raw_points.append(Point2D(self._calc_tip_radius(y), y))
+        self._raw_points = PointArray([(0, 0), (0, self._radius),
+                                       (self._calc_tip_radius(self._radius), self._radius)])
+        y = np.arange(self._n_splines, 0, -1, dtype=np.float64)  # radius * pow(i / self._n_splines, 2)
+        self._raw_points.extend(PointArray.from_array(np.column_stack((self._calc_tip_radius(y), y))))
 
     def _create_lines(self) -> None:
         k = self.keypoints
@@ -1013,20 +1440,30 @@ class _Tip(Geometry2d):
         self.lines.append(self.line_top)
         self.lines.append(self.line_right)
 
+        # all splines are send to ANSYS as one block
+        self.lines.extend(self._run_batched(self._create_spline_lines))
+        self.lines_contact = (self.lines[3:len(self.lines)])
+
+    def _create_spline_lines(self) -> List[int]:
+        """
+        Creates the splines of the tip shape (up to 6 keypoints per BSPLIN).
+
+        :return: list of line numbers
+        """
+        k = self.keypoints
+        lines = []
         for i in range(3, len(k) - 1, 5):
-            keypoints = [k[i], k[i + 1], k[i + 2], k[i + 3], k[i + 4], k[i + 5]]
-            self.lines.append(self._mapdl.bsplin(*keypoints))
+            keypoints = (k[i:i + 6] + ["", "", "", "", ""])[:6]
+            lines.append(self._mapdl.bsplin(*keypoints))
         keypoints = [k[-1], k[0], "", "", "", ""]
-        self.lines.append(self._mapdl.bsplin(*keypoints, "", "", "", -1))
-        self.lines_contact = (self.lines[3:len(self.lines)])
+        lines.append(self._mapdl.bsplin(*keypoints, "", "", "", -1))
+        return lines
 
     def select_spline_lines(self):
         """
         Selects all lines belonging to the spline shape.
         """
-        self._mapdl.lsel("none")
-        for line_number in self.lines_contact:
-            self._mapdl.lsel("A", "LINE", "", line_number)
+        select_entities(self._mapdl, "LINE", self.lines_contact)
 
     # =============================================================================
     #         self._mapdl.lsel("S", "LINE", "", self.lines[3],
@@ -1064,10 +1501,10 @@ class _Tip(Geometry2d):
             i: indentation depth
         """
 
-        assert i >= 0, "Indentation depth must be >=0 for calc_tip_radius"
+        assert np.all(np.asarray(i) >= 0), "Indentation depth must be >=0 for calc_tip_radius"
         r = self._radius
         # use simple fit with y=mx**2
-        x = (r * r - (r - i) ** 2) ** 0.5
+        x = np.sqrt(r * r - (r - np.asarray(i, dtype=np.float64)) ** 2)
 
         return x
 
@@ -1079,7 +1516,8 @@ class Tip(Geometry2d):
     """
 
     def __init__(self, mapdl, shape_coefficients: List[float],
-                 rotation_angle: float = 0, destination: Point2D = Point2D(0, 0)):
+                 rotation_angle: float = 0, destination: Point2D = Point2D(0, 0), n_splines: int = 20,
+                 tolerance: Optional[float] = None):
         """
         Initilize Tip-Instance and calculate points.
             Parameters
@@ -1095,13 +1533,22 @@ class Tip(Geometry2d):
                 Default value = 0
             destination : Point2D
                 Position inside ANSYS, where geometry should be created.
+            n_splines : int (optional)
+                Number of points describing the tip shape (rounded to form 5*k+1).
+                Must be at least 5. Default value = 20
+            tolerance : float (optional)
+                If given, n_splines is ignored and the points are placed adaptively: as few as needed,
+                to describe the tip shape within tolerance (denser, where the curvature is high).
         """
         super().__init__(mapdl, rotation_angle, destination)
-        # todo: add parameter for area fit function
         self._shape_coefficients = shape_coefficients
-        self._n_splines = 20
+        self._area_function = AreaFunction.from_coefficients(shape_coefficients)
+        self._n_splines = n_splines
+        if tolerance is None and n_splines < 5:
+            raise ValueError(f"n_splines ({n_splines}) must be at least 5")
         # make sure, _n_splines is of form 5*k+1 !
         self._n_splines = (self._n_splines // 5) * 5 + 1
+        self._tolerance = tolerance
         self.line_left = None
         self.line_top = None
         self.line_right = None
@@ -1110,15 +1557,14 @@ class Tip(Geometry2d):
         super()._calc_points()
 
     def _calc_raw_points(self) -> None:
-        self._raw_points.clear()
-
-        self._raw_points.append(Point2D(0, 0))
-        self._raw_points.append(Point2D(0, 1500))
-        self._raw_points.append(Point2D(self._calc_tip_radius(1000), 1500))
-
-        for i in reversed(range(1, self._n_splines + 1)):
-            y = 1000 * pow(i / self._n_splines, 2)
-            self._raw_points.append(Point2D(self._calc_tip_radius(y), y))
+        self._raw_points = PointArray([(0, 0), (0, 1500), (self._calc_tip_radius(1000), 1500)])
+        if self._tolerance is None:
+            # y = 1000 * (i / n_splines)**2 for i = n_splines ... 1
+            profile = self._area_function.profile(self._n_splines, 1000)
+        else:
+            profile = self._area_function.adaptive_profile(1000, self._tolerance)
+            self._n_splines = len(profile)
+        self._raw_points.extend(PointArray.from_array(profile))
 
     def _create_lines(self) -> None:
         k = self.keypoints
@@ -1131,20 +1577,30 @@ class Tip(Geometry2d):
         self.lines.append(self.line_top)
         self.lines.append(self.line_right)
 
+        # all splines are send to ANSYS as one block
+        self.lines.extend(self._run_batched(self._create_spline_lines))
+        self.lines_contact = (self.lines[3:len(self.lines)])
+
+    def _create_spline_lines(self) -> List[int]:
+        """
+        Creates the splines of the tip shape (up to 6 keypoints per BSPLIN).
+
+        :return: list of line numbers
+        """
+        k = self.keypoints
+        lines = []
         for i in range(3, len(k) - 1, 5):
-            keypoints = [k[i], k[i + 1], k[i + 2], k[i + 3], k[i + 4], k[i + 5]]
-            self.lines.append(self._mapdl.bsplin(*keypoints))
+            keypoints = (k[i:i + 6] + ["", "", "", "", ""])[:6]
+            lines.append(self._mapdl.bsplin(*keypoints))
         keypoints = [k[-1], k[0], "", "", "", ""]
-        self.lines.append(self._mapdl.bsplin(*keypoints, "", "", "", -1))
-        self.lines_contact = (self.lines[3:len(self.lines)])
+        lines.append(self._mapdl.bsplin(*keypoints, "", "", "", -1))
+        return lines
 
     def select_spline_lines(self):
         """
         Selects all lines belonging to the spline shape.
         """
-        self._mapdl.lsel("none")
-        for line_number in self.lines_contact:
-            self._mapdl.lsel("A", "LINE", "", line_number)
+        select_entities(self._mapdl, "LINE", self.lines_contact)
 
     # =============================================================================
     #         self._mapdl.lsel("S", "LINE", "", self.lines[3],
@@ -1182,21 +1638,5 @@ class Tip(Geometry2d):
             i: indentation depth
         """
 
-        def use_area_function(i):
-            ac = self._shape_coefficients
-            return ((ac[0] * i ** 2 + ac[1] * i + ac[2] * i ** 0.5 + ac[3] * i ** 0.25
-                     + ac[4] * i ** 0.125 + ac[5] * i ** 0.0625) / math.pi) ** 0.5
-
         assert i >= 0, "Indentation depth must be >=0 for calc_tip_radius"
-
-        # todo: min_r should become more visible -> variable of myansys?
-        # Part of input file? Calc useful value somehow?
-        # 31 ... from exp. calibration
-        # -> smallest indentation depth where areafunction is valid
-        min_fitted_i = 31
-
-        if i >= min_fitted_i:  # use experimental area fit function
-            return use_area_function(i)
-        # use simple fit with y=mx**2
-        m = use_area_function(min_fitted_i) / (min_fitted_i ** 0.5)  # m = y/x**0.5
-        return m * i ** 0.5
+        return self._area_function(i)
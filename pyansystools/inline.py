@@ -6,9 +6,14 @@ Creates/overwrites ANSYS-Paramter `__inline__'!
 """
 
 import re
+from collections import OrderedDict
 from enum import IntEnum
+from typing import Iterator, List, Optional, Tuple
 from warnings import warn
 
+import numpy as np
+
+from pyansystools.command_block import CommandBlock
 from pyansystools.geo2d import Point as Point
 
 
@@ -21,10 +26,152 @@ class Status(IntEnum):
     SELECTED = 1
 
 
+_INLINE_RESPONSE = re.compile(r"__INLINE__ =\s*(\S+)")
+
+# APDL entity label -> inline-function returning the next selected entity
+_NEXT_FUNCTIONS = {"NODE": "ndnext",
+                   "ELEM": "elnext",
+                   "KP": "kpnext",
+                   "LINE": "lsnext",
+                   "AREA": "arnext",
+                   "VOLU": "vlnext"}
+
+# commands (pymapdl method names / APDL commands without "/" or "*") known not to change the results of cached
+# queries; every other command clears the cache (it might create, move, renumber or reverse entities)
+_READ_ONLY_COMMANDS = {
+    # queries and parameters
+    "get", "get_value", "get_array", "vget", "starvget", "status", "starstatus", "set_log_level",
+    # selection and components (additionally all commands ending with "sel")
+    "ksll", "ksln", "lsla", "lslk", "asla", "asll", "aslv", "vsla", "nsla", "nsle", "nslk", "nsll", "nslv",
+    "esla", "esll", "esln", "eslv", "cm", "cmdele", "cmlist",
+    # listing and plotting (additionally all commands ending with "list" or "plot")
+    "prnsol", "presol", "prrsol", "prnld", "prvect", "prpath", "prerr", "plnsol", "plesol", "pldisp", "plvect",
+    "plpath", "replot", "view", "pnum", "eshape", "title", "show",
+    # processors and output
+    "prep7", "slashsolu", "solu", "post1", "post26", "finish", "output", "nopr", "gopr", "com", "",
+}
+_READ_ONLY_SUFFIXES = ("sel", "list", "plot")
+
+
+def _is_mutating_command(command: str) -> bool:
+    """
+    Check if an APDL command or pymapdl method name might change the model
+    (True for all commands, that are not known to be read-only).
+
+    :param command: e.g. "K,,1,2", "/CLEAR", "LREVERSE,1" or "amesh"
+    :return: bool
+    """
+    name = command.split(",", 1)[0].strip()
+    if "=" in name and not name.startswith("*"):  # parameter assignment
+        return False
+    name = name.lstrip("/*").lower()
+    return not (name in _READ_ONLY_COMMANDS or name.endswith(_READ_ONLY_SUFFIXES))
+
+
+class _LRUCache(OrderedDict):
+    """
+    Dictionary with limited size. The least recently used entry is removed, if maxsize is exceeded.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, function):
+        """
+        Return cached value for key or calculate it via function(key).
+        """
+        if key in self:
+            self.hits += 1
+            self.move_to_end(key)
+            return self[key]
+        self.misses += 1
+        value = function(key)
+        self[key] = value
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+        return value
+
+
+class _CacheInvalidatingMapdl:
+    """
+    Wraps a mapdl object and clears the cache of an Inline instance,
+    whenever a command passes through, that might change the model.
+    All other attributes are taken from the wrapped mapdl object.
+    """
+
+    def __init__(self, mapdl, cache: _LRUCache):
+        self._mapdl = mapdl
+        self._cache = cache
+
+    def __getattr__(self, name):
+        attribute = getattr(self._mapdl, name)
+        if not callable(attribute):
+            return attribute
+        if name == "run":
+            def run(command, *args, **kwargs):
+                try:
+                    return attribute(command, *args, **kwargs)
+                finally:
+                    if _is_mutating_command(command):
+                        self._cache.clear()
+            return run
+        if _is_mutating_command(name):
+            def mutating_command(*args, **kwargs):
+                try:
+                    return attribute(*args, **kwargs)
+                finally:
+                    self._cache.clear()
+            return mutating_command
+        return attribute
+
+
 class Inline:
-    def __init__(self, mapdl):
+    def __init__(self, mapdl, cache_size: int = 0):
+        """
+        :param mapdl: Pyansys Mapdl object to control ANSYS.
+        :param cache_size: (optional)
+            Max. number of cached geometry queries (kx, ky, kz, lx, ly, lz, distkp, anglek, ...).
+            Default is 0 (no caching). If caching is used, send all commands that change the model
+            via Inline.mapdl (instead of the original mapdl object) or call clear_cache() afterwards.
+        """
         # assert isinstance(mapdl, pyansys.Mapdl)
         self._mapdl = mapdl
+        self._cache = _LRUCache(cache_size) if cache_size > 0 else None
+        self._deprecation_warned = False
+
+    @property
+    def mapdl(self):
+        """
+        The mapdl object used by Inline. If caching is used, it is wrapped to clear the cache,
+        whenever a command might change the model (all commands except known read-only ones like
+        ksel, get, klist, kplot or prep7).
+        """
+        if self._cache is None:
+            return self._mapdl
+        return _CacheInvalidatingMapdl(self._mapdl, self._cache)
+
+    def clear_cache(self) -> None:
+        """
+        Remove all cached query results.
+
+        :return: None
+        """
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _read_inline_cached(self, inline_function: str):
+        """
+        Like _read_inline(), but use the cache (if caching is active).
+
+        :param inline_function: String containing the complete inline-function
+        :return: float
+        """
+        if self._cache is None:
+            return self._read_inline(inline_function)
+        return self._cache.lookup(inline_function, self._read_inline)
 
     def _read_inline(self, inline_function: str):
         """
@@ -33,9 +180,106 @@ class Inline:
         :param inline_function: String containing the complete inline-function
         :return: float
         """
-        warn('This is deprecated, as pymapdl now provides similar functionality.', DeprecationWarning)#, stacklevel=2)
+        self._warn_deprecated()
         line = self._mapdl.run(f"__inline__={inline_function}")
-        return float(re.search(r"(?<=__INLINE__ =).*", line).group(0))
+        return self._parse_inline_response(line)
+
+    def _warn_deprecated(self) -> None:
+        """
+        Emit DeprecationWarning (only once per instance, to keep it off the hot path).
+        """
+        if not self._deprecation_warned:
+            self._deprecation_warned = True
+            warn('This is deprecated, as pymapdl now provides similar functionality.', DeprecationWarning)
+
+    def _parse_inline_response(self, line: str) -> float:
+        """
+        Get value of '__INLINE__' from the response of ANSYS (e.g. "PARAMETER __INLINE__ =     3.000000000").
+        If the response can't be parsed (e.g. because output is suppressed),
+        the value is retrieved via the parameter API of pymapdl.
+
+        :param line: response of mapdl.run()
+        :return: float
+        """
+        # fast path: value is everything behind the last "="
+        _, separator, value = line.rpartition("=")
+        if separator:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+        # response contains additional output (e.g. warnings)
+        match = _INLINE_RESPONSE.search(line)
+        if match:
+            return float(match.group(1))
+        scalar_param = getattr(self._mapdl, "scalar_param", None)  # only available for gRPC
+        if scalar_param is not None:
+            return float(scalar_param("__INLINE__"))
+        return float(self._mapdl.parameters["__INLINE__"])
+
+    # ========================================================================
+    # ============================ batch queries =============================
+    # ========================================================================
+    def evaluate_many(self, inline_functions: List[str]) -> np.ndarray:
+        """
+        Evaluate many inline-functions with one submission to ANSYS.
+        All values are written into the APDL array parameter '__inline_batch__'
+        and read back with a single transfer.
+
+        :param inline_functions: list of strings, each containing a complete inline-function
+        :return: numpy array (float64) with one value per inline-function
+        """
+        self._warn_deprecated()
+        if not inline_functions:
+            return np.empty(0)
+        block = CommandBlock("__inline_batch__")
+        for inline_function in inline_functions:
+            block.add_result(inline_function)
+        return block.submit(self._mapdl)
+
+    def batch(self) -> "InlineBatch":
+        """
+        Collect queries and evaluate them with one submission to ANSYS.
+        All query methods of Inline are available inside the batch,
+        but return an InlineResult, whose value is set when leaving the with-block:
+
+            with inline.batch() as batch:
+                x = batch.nx(1)
+                p = batch.kxyz(3)
+            print(x.value, p.value)
+
+        :return: InlineBatch
+        """
+        return InlineBatch(self)
+
+    def _evaluate_for_arrays(self, inline_functions: List[str], *arrays) -> np.ndarray:
+        """
+        Evaluate inline-functions for each entry of the given arrays with a constant number of commands.
+        The arrays are uploaded to ANSYS (APDL array parameter '__inline_args__')
+        and the inline-functions are evaluated inside an APDL *DO loop.
+        Use {0}, {1}, ... inside inline_functions as placeholder for the values of the
+        first, second, ... array (e.g. "distnd({0},{1})").
+
+        :param inline_functions: list of inline-functions with placeholders
+        :param arrays: array_like (1D or scalar); all arrays are broadcast to the same length
+        :return: numpy array (float64) with shape (n, len(inline_functions))
+        """
+        self._warn_deprecated()
+        arrays = [np.asarray(array, dtype=np.float64).reshape(-1) for array in arrays]
+        arguments = np.column_stack(np.broadcast_arrays(*arrays))
+        n = len(arguments)
+        if n == 0:
+            return np.empty((0, len(inline_functions)))
+
+        self._mapdl.parameters["__inline_args__"] = arguments
+        placeholders = [f"__inline_args__(__inline_i__,{i})" for i in range(1, len(arrays) + 1)]
+        block = CommandBlock("__inline_array__", columns=len(inline_functions))
+        block.reserve_results(n)
+        block.add(f"*DO,__inline_i__,1,{n}")
+        for column, inline_function in enumerate(inline_functions, 1):
+            block.add(f"{block.reference('__inline_i__', column)}={inline_function.format(*placeholders)}")
+        block.add("*ENDDO")
+        return block.submit(self._mapdl).reshape(n, len(inline_functions))
 
     # ========================================================================
     # ============================ entity status =============================
@@ -164,6 +408,137 @@ class Inline:
         result = self._read_inline(f"vlnext({v})")
         return int(result)
 
+    # ========================== not part of ANSYS! ==========================
+    def _fetch_next_selected(self, entity: str, start: int, count: int,
+                             inline_functions: List[str] = ()) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Numbers of up to count selected entities with a number greater than start.
+        The *next inline-function is called inside an APDL *DO loop and all numbers
+        are read back with one transfer (APDL array parameter '__inline_selected__').
+        Optionally, inline_functions are evaluated for each entity inside the same loop
+        (use {0} as placeholder for the entity number, e.g. "ux({0})").
+
+        :param entity: APDL entity label ("NODE", "ELEM", "KP", "LINE", "AREA" or "VOLU")
+        :param start: int
+        :param count: int
+        :param inline_functions: (optional) list of inline-functions with placeholder
+        :return: tuple (numpy array of int with shape (n,), numpy array with shape (n, len(inline_functions)));
+            n < count, if less entities are selected
+        """
+        self._warn_deprecated()
+        next_function = _NEXT_FUNCTIONS[entity.upper()]
+        block = CommandBlock("__inline_selected__", columns=1 + len(inline_functions))
+        block.reserve_results(count)
+        block.add(f"__inline_next__={start}")
+        block.add(f"*DO,__inline_i__,1,{count}")
+        block.add(f"__inline_next__={next_function}(__inline_next__)")
+        block.add("*IF,__inline_next__,EQ,0,EXIT")
+        block.add(f"{block.reference('__inline_i__', 1)}=__inline_next__")
+        for column, inline_function in enumerate(inline_functions, 2):
+            block.add(f"{block.reference('__inline_i__', column)}={inline_function.format('__inline_next__')}")
+        block.add("*ENDDO")
+        result = block.submit(self._mapdl).reshape(count, 1 + len(inline_functions))
+        n = np.count_nonzero(result[:, 0])
+        return result[:n, 0].astype(np.int64), result[:n, 1:]
+
+    def selected_count(self, entity: str) -> int:
+        """
+        Number of selected entities.
+
+        :param entity: APDL entity label ("NODE", "ELEM", "KP", "LINE", "AREA" or "VOLU")
+        :return: int
+        """
+        return int(self._mapdl.get_value(entity.upper(), 0, "COUNT"))
+
+    def selected_numbers(self, entity: str) -> np.ndarray:
+        """
+        Numbers of all selected entities (ascending) fetched with one transfer.
+
+        :param entity: APDL entity label ("NODE", "ELEM", "KP", "LINE", "AREA" or "VOLU")
+        :return: numpy array of int
+        """
+        count = self.selected_count(entity)
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        return self._fetch_next_selected(entity, 0, count)[0]
+
+    def iter_selected(self, entity: str, chunk_size: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over the numbers of all selected entities (ascending).
+        Replaces loops calling ndnext(), elnext(), ... once per entity.
+
+        :param entity: APDL entity label ("NODE", "ELEM", "KP", "LINE", "AREA" or "VOLU")
+        :param chunk_size: (optional)
+            Number of entities fetched with one transfer. Default is None (whole selection at once).
+            Use it for very large models, to limit the size of each transfer.
+        :return: Iterator over int
+        """
+        remaining = self.selected_count(entity)
+        start = 0
+        while remaining > 0:
+            count = remaining if chunk_size is None else min(chunk_size, remaining)
+            numbers, _ = self._fetch_next_selected(entity, start, count)
+            if len(numbers) == 0:  # selection changed while iterating
+                return
+            yield from numbers.tolist()
+            start = int(numbers[-1])
+            remaining -= len(numbers)
+
+    def iter_selected_nodes(self, chunk_size: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over all selected node numbers (see iter_selected()).
+
+        :param chunk_size: (optional) number of nodes fetched with one transfer
+        :return: Iterator over int
+        """
+        return self.iter_selected("NODE", chunk_size)
+
+    def iter_selected_elements(self, chunk_size: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over all selected element numbers (see iter_selected()).
+
+        :param chunk_size: (optional) number of elements fetched with one transfer
+        :return: Iterator over int
+        """
+        return self.iter_selected("ELEM", chunk_size)
+
+    def iter_selected_keypoints(self, chunk_size: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over all selected keypoint numbers (see iter_selected()).
+
+        :param chunk_size: (optional) number of keypoints fetched with one transfer
+        :return: Iterator over int
+        """
+        return self.iter_selected("KP", chunk_size)
+
+    def iter_selected_lines(self, chunk_size: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over all selected line numbers (see iter_selected()).
+
+        :param chunk_size: (optional) number of lines fetched with one transfer
+        :return: Iterator over int
+        """
+        return self.iter_selected("LINE", chunk_size)
+
+    def iter_selected_areas(self, chunk_size: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over all selected area numbers (see iter_selected()).
+
+        :param chunk_size: (optional) number of areas fetched with one transfer
+        :return: Iterator over int
+        """
+        return self.iter_selected("AREA", chunk_size)
+
+    def iter_selected_volumes(self, chunk_size: Optional[int] = None) -> Iterator[int]:
+        """
+        Iterate over all selected volume numbers (see iter_selected()).
+
+        :param chunk_size: (optional) number of volumes fetched with one transfer
+        :return: Iterator over int
+        """
+        return self.iter_selected("VOLU", chunk_size)
+    # ========================= not part of ANSYS! END ========================
+
     # ========================================================================
     # ============================== locations ===============================
     # ========================================================================
@@ -262,7 +637,7 @@ class Inline:
         :param k: int
         :return: float
         """
-        result = self._read_inline(f"kx({k})")
+        result = self._read_inline_cached(f"kx({k})")
         return result
 
     def ky(self, k: int) -> float:
@@ -272,7 +647,7 @@ class Inline:
         :param k: int
         :return: float
         """
-        result = self._read_inline(f"ky({k})")
+        result = self._read_inline_cached(f"ky({k})")
         return result
 
     def kz(self, k: int) -> float:
@@ -282,7 +657,7 @@ class Inline:
         :param k: int
         :return: float
         """
-        result = self._read_inline(f"kz({k})")
+        result = self._read_inline_cached(f"kz({k})")
         return result
 
     # ========================== not part of ANSYS! ==========================
@@ -293,9 +668,9 @@ class Inline:
         :param k: int
         :return: Point
         """
-        x = self._read_inline(f"kx({k})")
-        y = self._read_inline(f"ky({k})")
-        z = self._read_inline(f"kz({k})")
+        x = self._read_inline_cached(f"kx({k})")
+        y = self._read_inline_cached(f"ky({k})")
+        z = self._read_inline_cached(f"kz({k})")
         return Point(x, y, z)
     # ========================= not part of ANSYS! END ========================
 
@@ -331,7 +706,7 @@ class Inline:
         """
         self._check_lfrac(lfrac)
         self._raise_if_not_line(l)
-        result = self._read_inline(f"lx({l},{lfrac})")
+        result = self._read_inline_cached(f"lx({l},{lfrac})")
         return result
 
     def ly(self, l: int, lfrac: float) -> float:
@@ -344,7 +719,7 @@ class Inline:
         """
         self._check_lfrac(lfrac)
         self._raise_if_not_line(l)
-        result = self._read_inline(f"ly({l},{lfrac})")
+        result = self._read_inline_cached(f"ly({l},{lfrac})")
         return result
 
     def lz(self, l: int, lfrac: float) -> float:
@@ -357,7 +732,7 @@ class Inline:
         """
         self._check_lfrac(lfrac)
         self._raise_if_not_line(l)
-        result = self._read_inline(f"lz({l},{lfrac})")
+        result = self._read_inline_cached(f"lz({l},{lfrac})")
         return result
 
     # ========================== not part of ANSYS! ==========================
@@ -371,9 +746,9 @@ class Inline:
         """
         self._check_lfrac(lfrac)
         self._raise_if_not_line(l)
-        x = self._read_inline(f"lx({l},{lfrac})")
-        y = self._read_inline(f"ly({l},{lfrac})")
-        z = self._read_inline(f"lz({l},{lfrac})")
+        x = self._read_inline_cached(f"lx({l},{lfrac})")
+        y = self._read_inline_cached(f"ly({l},{lfrac})")
+        z = self._read_inline_cached(f"lz({l},{lfrac})")
         return Point(x, y, z)
     # ========================= not part of ANSYS! END ========================
 
@@ -430,7 +805,7 @@ class Inline:
         :param k2: int
         :return: float
         """
-        result = self._read_inline(f"distkp({k1},{k2})")
+        result = self._read_inline_cached(f"distkp({k1},{k2})")
         return result
 
     def disten(self, e: int, n: int) -> float:
@@ -473,7 +848,7 @@ class Inline:
         :param k3: int
         :return: float
         """
-        result = self._read_inline(f"anglek({k1},{k2},{k3})")
+        result = self._read_inline_cached(f"anglek({k1},{k2},{k3})")
         return result
 
     # ========================================================================
@@ -578,3 +953,358 @@ class Inline:
     # ========================= not part of ANSYS! END ========================
 
     # todo
+
+    # ========================================================================
+    # =============== vectorized queries (not part of ANSYS!) ================
+    # ========================================================================
+    # Each method takes arrays of entity numbers and needs a constant number of
+    # commands, regardless of the number of entities.
+    def centrx_array(self, e) -> np.ndarray:
+        """
+        Centroid x-coordinates of elements e in global Cartesian coordinate system.
+
+        :param e: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["centrx({0})"], e)[:, 0]
+
+    def centry_array(self, e) -> np.ndarray:
+        """
+        Centroid y-coordinates of elements e in global Cartesian coordinate system.
+
+        :param e: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["centry({0})"], e)[:, 0]
+
+    def centrz_array(self, e) -> np.ndarray:
+        """
+        Centroid z-coordinates of elements e in global Cartesian coordinate system.
+
+        :param e: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["centrz({0})"], e)[:, 0]
+
+    def centrxyz_array(self, e) -> np.ndarray:
+        """
+        Centroid coordinates of elements e in global Cartesian coordinate system.
+
+        :param e: array_like of int
+        :return: numpy array with shape (n, 3)
+        """
+        return self._evaluate_for_arrays(["centrx({0})", "centry({0})", "centrz({0})"], e)
+
+    def nx_array(self, n) -> np.ndarray:
+        """
+        X-coordinates of nodes n in the active coordinate system.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["nx({0})"], n)[:, 0]
+
+    def ny_array(self, n) -> np.ndarray:
+        """
+        Y-coordinates of nodes n in the active coordinate system.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["ny({0})"], n)[:, 0]
+
+    def nz_array(self, n) -> np.ndarray:
+        """
+        Z-coordinates of nodes n in the active coordinate system.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["nz({0})"], n)[:, 0]
+
+    def nxyz_array(self, n) -> np.ndarray:
+        """
+        Coordinates of nodes n in the active coordinate system.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n, 3)
+        """
+        return self._evaluate_for_arrays(["nx({0})", "ny({0})", "nz({0})"], n)
+
+    def kx_array(self, k) -> np.ndarray:
+        """
+        X-coordinates of keypoints k in the active coordinate system.
+
+        :param k: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["kx({0})"], k)[:, 0]
+
+    def ky_array(self, k) -> np.ndarray:
+        """
+        Y-coordinates of keypoints k in the active coordinate system.
+
+        :param k: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["ky({0})"], k)[:, 0]
+
+    def kz_array(self, k) -> np.ndarray:
+        """
+        Z-coordinates of keypoints k in the active coordinate system.
+
+        :param k: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["kz({0})"], k)[:, 0]
+
+    def kxyz_array(self, k) -> np.ndarray:
+        """
+        Coordinates of keypoints k in the active coordinate system.
+
+        :param k: array_like of int
+        :return: numpy array with shape (n, 3)
+        """
+        return self._evaluate_for_arrays(["kx({0})", "ky({0})", "kz({0})"], k)
+
+    def lxyz_array(self, l, lfrac) -> np.ndarray:
+        """
+        Coordinates of lines l at length fractions lfrac (0.0 to 1.0).
+
+        :param l: array_like of int
+        :param lfrac: float or array_like of float (0.0 <= lfrac <= 1.0)
+        :return: numpy array with shape (n, 3)
+        """
+        for value in np.asarray(lfrac).reshape(-1):
+            self._check_lfrac(value)
+        return self._evaluate_for_arrays(["lx({0},{1})", "ly({0},{1})", "lz({0},{1})"], l, lfrac)
+
+    def distnd_array(self, n1, n2) -> np.ndarray:
+        """
+        Distances between nodes n1 and n2.
+
+        :param n1: int or array_like of int
+        :param n2: int or array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["distnd({0},{1})"], n1, n2)[:, 0]
+
+    def distkp_array(self, k1, k2) -> np.ndarray:
+        """
+        Distances between keypoints k1 and k2.
+
+        :param k1: int or array_like of int
+        :param k2: int or array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["distkp({0},{1})"], k1, k2)[:, 0]
+
+    def disten_array(self, e, n) -> np.ndarray:
+        """
+        Distances between the centroids of elements e and nodes n.
+
+        :param e: int or array_like of int
+        :param n: int or array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["disten({0},{1})"], e, n)[:, 0]
+
+    def anglen_array(self, n1, n2, n3) -> np.ndarray:
+        """
+        Subtended angles between two lines, defined by three nodes
+        where n1 is the vertex node (see anglen()).
+
+        :param n1: int or array_like of int
+        :param n2: int or array_like of int
+        :param n3: int or array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["anglen({0},{1},{2})"], n1, n2, n3)[:, 0]
+
+    def anglek_array(self, k1, k2, k3) -> np.ndarray:
+        """
+        Subtended angles between two lines, defined by three keypoints
+        where k1 is the vertex keypoint (see anglek()).
+
+        :param k1: int or array_like of int
+        :param k2: int or array_like of int
+        :param k3: int or array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["anglek({0},{1},{2})"], k1, k2, k3)[:, 0]
+
+    def ux_array(self, n) -> np.ndarray:
+        """
+        UX structural displacements at nodes n.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["ux({0})"], n)[:, 0]
+
+    def uy_array(self, n) -> np.ndarray:
+        """
+        UY structural displacements at nodes n.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["uy({0})"], n)[:, 0]
+
+    def uz_array(self, n) -> np.ndarray:
+        """
+        UZ structural displacements at nodes n.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n,)
+        """
+        return self._evaluate_for_arrays(["uz({0})"], n)[:, 0]
+
+    def uxyz_array(self, n) -> np.ndarray:
+        """
+        Structural displacements at nodes n.
+
+        :param n: array_like of int
+        :return: numpy array with shape (n, 3)
+        """
+        return self._evaluate_for_arrays(["ux({0})", "uy({0})", "uz({0})"], n)
+
+    def iter_displacement_field(self, chunk_size: Optional[int] = None,
+                                nodes=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Iterate over the structural displacements in chunks (for models too big for memory).
+        Without nodes, node numbers and displacements of the selected nodes are fetched inside
+        the same APDL *DO loop (no upload of node numbers needed).
+
+        :param chunk_size: (optional) number of nodes per chunk (default: all nodes in one chunk)
+        :param nodes: (optional) array_like of int; default are all selected nodes
+        :return: Iterator over tuples (node numbers with shape (n,), displacements with shape (n, 3))
+        """
+        if nodes is not None:
+            nodes = np.asarray(nodes, dtype=np.int64).reshape(-1)
+            step = chunk_size or max(len(nodes), 1)
+            for start in range(0, len(nodes), step):
+                chunk = nodes[start:start + step]
+                yield chunk, np.ascontiguousarray(self.uxyz_array(chunk), dtype=np.float64)
+            return
+
+        remaining = self.selected_count("NODE")
+        start = 0
+        while remaining > 0:
+            count = remaining if chunk_size is None else min(chunk_size, remaining)
+            numbers, displacements = self._fetch_next_selected("NODE", start, count,
+                                                               ["ux({0})", "uy({0})", "uz({0})"])
+            if len(numbers) == 0:  # selection changed while iterating
+                return
+            yield numbers, np.ascontiguousarray(displacements, dtype=np.float64)
+            start = int(numbers[-1])
+            remaining -= len(numbers)
+
+    def displacement_field(self, nodes=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Structural displacements of all selected nodes (or the given nodes) with a constant number of commands.
+
+        :param nodes: (optional) array_like of int; default are all selected nodes
+        :return: tuple (node numbers with shape (n,), contiguous float64 array of displacements with shape (n, 3))
+        """
+        numbers = [np.empty(0, dtype=np.int64)]
+        displacements = [np.empty((0, 3))]
+        for chunk_numbers, chunk_displacements in self.iter_displacement_field(nodes=nodes):
+            numbers.append(chunk_numbers)
+            displacements.append(chunk_displacements)
+        return np.concatenate(numbers), np.ascontiguousarray(np.concatenate(displacements), dtype=np.float64)
+
+
+class InlineResult:
+    """
+    Result of a query made inside an InlineBatch.
+    The value is available after the batch was evaluated.
+    """
+
+    def __init__(self):
+        self._value = None
+        self.done = False
+
+    @property
+    def value(self):
+        if not self.done:
+            raise RuntimeError("InlineResult has no value before the batch is evaluated.")
+        return self._value
+
+    def _set_value(self, value) -> None:
+        self._value = value
+        self.done = True
+
+    def __repr__(self):
+        if not self.done:
+            return "InlineResult(<pending>)"
+        return f"InlineResult({self._value!r})"
+
+
+class _DeferredInline(Inline):
+    """
+    Inline that does not talk to ANSYS. _read_inline() is redirected to read_function,
+    which is used to record the inline-functions of a query and to replay it with the
+    values of a batch.
+    """
+
+    def __init__(self, read_function):
+        super().__init__(None)
+        self._read_function = read_function
+
+    def _read_inline(self, inline_function: str):
+        return self._read_function(inline_function)
+
+
+class InlineBatch:
+    """
+    Collects queries of an Inline instance and evaluates them with one submission.
+    Use Inline.batch() to create an instance.
+    """
+
+    def __init__(self, inline: Inline):
+        self._inline = inline
+        self._queries = []  # (method name, args, kwargs, InlineResult)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.evaluate()
+
+    def __len__(self):
+        return len(self._queries)
+
+    def __getattr__(self, name):
+        method = getattr(Inline, name, None)
+        if (name.startswith(("_", "selected_", "iter_")) or name.endswith("_array")
+                or name in ("evaluate_many", "batch", "displacement_field", "clear_cache") or not callable(method)):
+            raise AttributeError(f"'{type(self).__name__}' has no query '{name}'")
+
+        def query(*args, **kwargs) -> InlineResult:
+            result = InlineResult()
+            self._queries.append((name, args, kwargs, result))
+            return result
+
+        query.__doc__ = method.__doc__
+        return query
+
+    def evaluate(self) -> None:
+        """
+        Send all collected queries to ANSYS and set the values of their InlineResults.
+
+        :return: None
+        """
+        queries, self._queries = self._queries, []
+        inline_functions = []
+        # first run: only record the inline-functions needed by each query
+        recorder = _DeferredInline(lambda inline_function: inline_functions.append(inline_function) or 0.0)
+        for name, args, kwargs, _ in queries:
+            getattr(recorder, name)(*args, **kwargs)
+
+        # second run: replay queries with values from ANSYS (same order as recorded)
+        values = iter(self._inline.evaluate_many(inline_functions).tolist())
+        player = _DeferredInline(lambda inline_function: next(values))
+        for name, args, kwargs, result in queries:
+            result._set_value(getattr(player, name)(*args, **kwargs))
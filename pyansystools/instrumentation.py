@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Provides InstrumentedMapdl - an opt-in proxy for the mapdl object, that records each call to ANSYS:
+number of commands, wall time, bytes transferred and the pyansystools method it originates from.
+The records can be exported as JSON summary or as collapsed stacks for flame graphs
+(e.g. flamegraph.pl or https://www.speedscope.app).
+
+@author: Nathanael Jöhrmann
+"""
+import json
+import sys
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from pyansystools.command_block import format_command
+
+_PACKAGE = "pyansystools."
+# frames of these modules are not part of the call stack origin
+_SKIPPED_MODULES = {__name__}
+
+
+class CallRecord(NamedTuple):
+    """One call to ANSYS."""
+    method: str  # called mapdl method (e.g. "k", "run", "parameters.__getitem__")
+    origin: str  # innermost pyansystools function (e.g. "geo2d.Polygon._create_lines")
+    stack: Tuple[str, ...]  # call stack (outermost first)
+    n_commands: int
+    seconds: float
+    bytes_sent: int
+    bytes_received: int
+    error: bool = False  # the call raised an exception (e.g. MAPDL error or timeout)
+
+
+def _size(value) -> int:
+    """Approximate number of bytes needed to transfer value."""
+    if value is None:
+        return 0
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return len(str(value).encode())
+
+
+def _qualname_from_locals(code, local_variables: dict) -> str:
+    """
+    Qualified name of a function (like code.co_qualname of python >= 3.11) for older python versions:
+    for methods, the defining class is searched in the MRO of self or cls.
+    """
+    owner = local_variables.get("self", local_variables.get("cls"))
+    if owner is not None:
+        for cls in (owner if isinstance(owner, type) else type(owner)).__mro__:
+            attribute = cls.__dict__.get(code.co_name)
+            # unwrap classmethod, staticmethod and property
+            function = getattr(attribute, "__func__", getattr(attribute, "fget", attribute))
+            if getattr(function, "__code__", None) is code:
+                return f"{cls.__qualname__}.{code.co_name}"
+    return code.co_name
+
+
+def _function_name(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", None)  # python >= 3.11
+    if name is None:
+        name = _qualname_from_locals(code, frame.f_locals)
+    module = frame.f_globals.get("__name__", "")
+    if module.startswith(_PACKAGE):
+        module = module[len(_PACKAGE):]
+    return f"{module}.{name}" if module else name
+
+
+class _InstrumentedAttribute:
+    """Wraps parameters or queries of the mapdl object, so that their use is recorded, too."""
+
+    def __init__(self, instrumented_mapdl: "InstrumentedMapdl", name: str, attribute):
+        self._instrumented_mapdl = instrumented_mapdl
+        self._name = name
+        self._attribute = attribute
+
+    def __getitem__(self, key):
+        return self._instrumented_mapdl._call(f"{self._name}.__getitem__", self._attribute.__getitem__,
+                                              (key,), 1, _size(key))
+
+    def __setitem__(self, key, value):
+        self._instrumented_mapdl._call(f"{self._name}.__setitem__", self._attribute.__setitem__,
+                                       (key, value), 1, _size(key) + _size(value))
+
+    def __contains__(self, key):
+        return key in self._attribute
+
+    def __getattr__(self, name):
+        attribute = getattr(self._attribute, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            command = format_command(name, args)
+            return self._instrumented_mapdl._call(f"{self._name}.{name}", attribute, args, 1, _size(command),
+                                                  kwargs)
+
+        return call
+
+
+class InstrumentedMapdl:
+    """
+    Proxy for a mapdl object, recording all calls to ANSYS (opt-in):
+
+        mapdl = InstrumentedMapdl(mapdl)
+        rectangle = Rectangle(mapdl, 2, 1)
+        rectangle.create()
+        print(mapdl.to_json())  # summary for each pyansystools method
+        mapdl.write_collapsed_stacks("profile.folded")  # input for flame graph tools
+
+    Each call of a mapdl method, parameters or queries counts as one round-trip.
+    input_strings() counts one command per line.
+    """
+
+    def __init__(self, mapdl, max_stack_depth: int = 32):
+        """
+        :param mapdl: Pyansys Mapdl object (or FakeMapdl) to control ANSYS.
+        :param max_stack_depth: (optional) max. number of frames recorded for each call
+        """
+        self._mapdl = mapdl
+        self.max_stack_depth = max_stack_depth
+        self.records: List[CallRecord] = []
+
+    @property
+    def mapdl(self):
+        """The wrapped mapdl object."""
+        return self._mapdl
+
+    def __getattr__(self, name):
+        attribute = getattr(self._mapdl, name)
+        if name in ("parameters", "queries"):
+            return _InstrumentedAttribute(self, name, attribute)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            if name in ("run", "input_strings") and args:
+                command = str(args[0])
+                n_commands = len([line for line in command.splitlines() if line.strip()])
+            else:
+                command = format_command(name, args)
+                n_commands = 1
+            return self._call(name, attribute, args, n_commands, _size(command), kwargs)
+
+        return call
+
+    def _call(self, method: str, function, args: tuple, n_commands: int, bytes_sent: int, kwargs=None):
+        stack, origin = self._get_stack()
+        start = time.perf_counter()
+        result = None
+        error = True
+        try:
+            result = function(*args, **(kwargs or {}))
+            error = False
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            self.records.append(CallRecord(method, origin, stack, n_commands, seconds, bytes_sent, _size(result),
+                                           error))
+
+    def _get_stack(self) -> Tuple[Tuple[str, ...], str]:
+        """
+        Names of the calling functions (outermost first) and the innermost pyansystools function
+        (or the direct caller, if not called from pyansystools).
+        """
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_globals.get("__name__") in _SKIPPED_MODULES:
+            frame = frame.f_back
+        names = []
+        origin = None
+        while frame is not None and len(names) < self.max_stack_depth:
+            names.append(_function_name(frame))
+            if origin is None and frame.f_globals.get("__name__", "").startswith(_PACKAGE):
+                origin = names[-1]
+            frame = frame.f_back
+        if origin is None:
+            origin = names[0] if names else "<unknown>"
+        return tuple(reversed(names)), origin
+
+    def reset(self) -> None:
+        """
+        Delete all records.
+
+        :return: None
+        """
+        self.records.clear()
+
+    # ========================================================================
+    # ================================ export ================================
+    # ========================================================================
+    @property
+    def n_round_trips(self) -> int:
+        return len(self.records)
+
+    @property
+    def n_commands(self) -> int:
+        return sum(record.n_commands for record in self.records)
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Round-trips, commands, wall time, bytes and failed calls for each origin
+        (innermost pyansystools function), sorted by wall time (descending).
+
+        :return: dict
+        """
+        result = {}
+        for record in self.records:
+            entry = result.setdefault(record.origin, {"round_trips": 0, "commands": 0, "seconds": 0.0,
+                                                      "bytes_sent": 0, "bytes_received": 0, "errors": 0,
+                                                      "methods": Counter()})
+            entry["round_trips"] += 1
+            entry["commands"] += record.n_commands
+            entry["seconds"] += record.seconds
+            entry["bytes_sent"] += record.bytes_sent
+            entry["bytes_received"] += record.bytes_received
+            entry["errors"] += record.error
+            entry["methods"][record.method] += 1
+        for entry in result.values():
+            entry["methods"] = dict(entry["methods"])
+        return OrderedDict(sorted(result.items(), key=lambda item: item[1]["seconds"], reverse=True))
+
+    def to_json(self, path: str = None) -> str:
+        """
+        JSON summary (see summary()), optionally written to path.
+
+        :param path: (optional) file name
+        :return: str
+        """
+        text = json.dumps({"round_trips": self.n_round_trips, "commands": self.n_commands,
+                           "seconds": sum(record.seconds for record in self.records),
+                           "origins": self.summary()}, indent=2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+    def collapsed_stacks(self, weight: str = "time") -> List[str]:
+        """
+        Records in collapsed stack format ("outer;inner;mapdl.method value"), as used by flame graph tools.
+
+        :param weight: "time" (microseconds), "commands" or "round_trips"
+        :return: list of str
+        """
+        assert weight in ("time", "commands", "round_trips"), f"unknown weight {weight}"
+        values = Counter()
+        for record in self.records:
+            stack = ";".join(record.stack + (f"mapdl.{record.method}",))
+            if weight == "time":
+                values[stack] += record.seconds * 1e6
+            elif weight == "commands":
+                values[stack] += record.n_commands
+            else:
+                values[stack] += 1
+        return [f"{stack} {max(1, round(value))}" for stack, value in values.items()]
+
+    def write_collapsed_stacks(self, path: str, weight: str = "time") -> None:
+        """
+        Write collapsed stacks (see collapsed_stacks()) to path.
+
+        :param path: file name
+        :param weight: "time" (microseconds), "commands" or "round_trips"
+        :return: None
+        """
+        with open(path, "w") as file:
+            file.write("\n".join(self.collapsed_stacks(weight)) + "\n")
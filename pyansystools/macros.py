@@ -6,11 +6,65 @@ Collection of Macro-like functions for APDL ANSYS via pyansys.
 """
 
 import numbers
-from typing import Union
+from typing import Iterable, List, Tuple, Union
 
 # from pyansys import Mapdl
 from ansys.mapdl.core import launch_mapdl
 
+# pymapdl select commands for each entity type
+_SELECT_COMMANDS = {"KP": "ksel", "LINE": "lsel", "AREA": "asel", "VOLU": "vsel", "NODE": "nsel", "ELEM": "esel"}
+
+
+def compress_ranges(entity_numbers: Iterable[int]) -> List[Tuple[int, int, int]]:
+    """
+    Compresses entity numbers into ranges (min, max, inc) as used by APDL select commands,
+    e.g. [1, 2, 3, 4, 10, 12, 14] -> [(1, 4, 1), (10, 14, 2)].
+
+    :param entity_numbers: iterable of int
+    :return: list of tuples (min, max, inc)
+    """
+    values = sorted(set(int(number) for number in entity_numbers))
+    ranges = []
+    i = 0
+    while i < len(values):
+        if i + 1 == len(values):
+            ranges.append((values[i], values[i], 1))
+            break
+        inc = values[i + 1] - values[i]
+        j = i + 1
+        while j + 1 < len(values) and values[j + 1] - values[j] == inc:
+            j += 1
+        ranges.append((values[i], values[j], inc))
+        i = j + 1
+    return ranges
+
+
+def select_entities(mapdl, entity: str, entity_numbers: Iterable) -> None:
+    """
+    Selects the given entities (deselecting all other entities of that type).
+    Contiguous numbers are selected with one command per range (e.g. LSEL,S,LINE,,1,100,1),
+    so the number of commands does not depend on the number of entities.
+
+    :param mapdl: Pyansys Mapdl object to control ANSYS.
+    :param entity: "KP", "LINE", "AREA", "VOLU", "NODE" or "ELEM"
+    :param entity_numbers: iterable of entity numbers
+    :return: None
+    """
+    select = getattr(mapdl, _SELECT_COMMANDS[entity.upper()])
+    entity_numbers = list(entity_numbers)
+    if not all(isinstance(number, numbers.Integral) for number in entity_numbers):
+        # e.g. references to recorded entities (see command_block.CommandRecorder)
+        select("NONE")
+        for number in entity_numbers:
+            select("A", entity, "", number)
+        return
+
+    ranges = compress_ranges(entity_numbers)
+    if not ranges:
+        select("NONE")
+    for i, (vmin, vmax, vinc) in enumerate(ranges):
+        select("S" if i == 0 else "A", entity, "", vmin, vmax, vinc)
+
 
 class RealConstants172:  # element 172
     def __init__(self):
@@ -57,9 +111,7 @@ class Macros:
         """
         if isinstance(lines, numbers.Number):
             lines = [lines]
-        self._mapdl.lsel("none")
-        for line_number in lines:
-            self._mapdl.lsel("A", "LINE", "", line_number)
+        select_entities(self._mapdl, "LINE", lines)
 
     def create_contact_pair_for_lines_asymmetric(self, target_lines: Union[int, list],
                                                  contact_lines: Union[int, list],
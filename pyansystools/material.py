@@ -2,8 +2,24 @@
 unit system:
 mm, t, MPa
 """
+import hashlib
+import weakref
+
+import numpy as np
 from ansys.mapdl.core.mapdl_grpc import MapdlGrpc
 
+from pyansystools.command_block import CommandRecorder
+from pyansystools.ramberg_osgood import MAX_KINH_POINTS, kinh_table
+
+# MP labels of linear elastic properties and the attribute of Material holding them
+ELASTIC_PROPERTIES = {"EX": "ex", "EY": "ey", "EZ": "ez",
+                      "GXY": "gxy", "GYZ": "gyz", "GXZ": "gzx",
+                      "PRXY": "prxy", "PRYZ": "pryz", "PRXZ": "przx"}
+# MP labels of other properties (density and coefficient of thermal expansion)
+PHYSICAL_PROPERTIES = {"DENS": "dens", "CTEX": "ctex"}
+# max. number of values per MPTEMP / MPDATA command
+MP_FIELDS = 6
+
 
 class Material:
     def __init__(self):
@@ -24,81 +40,299 @@ class Material:
         self.ro_n = None
         self.ro_K = None
 
-    def set_elastic(self, mapdl: MapdlGrpc, mat_id: int):
+    def set_elastic(self, mapdl: MapdlGrpc, mat_id: int, temperatures=(0,)):
+        """
+        Define the linear elastic properties, that are not None.
+        Properties can be floats or sequences with one value per temperature.
+        :param mapdl: MapdlGrpc object
+        :param mat_id: Material reference identification number
+        :param temperatures: (optional) temperatures of temperature dependent properties
+        :return: None
+        """
         mapdl.run("/PREP7")
         mapdl.mptemp("", "", "", "", "", "", "")
         mapdl.mptemp(1, "T")
-        # E-Modulus:
-        mapdl.mpdata("EX", mat_id, "", self.ex)
-        if self.ey is not None:
-            mapdl.mpdata("EY", mat_id, "", self.ey)
-        if self.ez is not None:
-            mapdl.mpdata("EZ", mat_id, "", self.ez)
-
-        # shear modulus
-        if self.gxy is not None:
-            mapdl.mpdata("GXY", mat_id, "", self.gxy)
-        if self.gyz is not None:
-            mapdl.mpdata("GYZ", mat_id, "", self.gyz)
-        if self.gzx is not None:
-            mapdl.mpdata("GXZ", mat_id, "", self.gzx)
-
-        # Poisson Ratio:
-        mapdl.mpdata("PRXY", mat_id, "", self.prxy)
-        if self.pryz is not None:
-            mapdl.mpdata("PRYZ", mat_id, "", self.pryz)
-        if self.przx is not None:
-            mapdl.mpdata("PRXZ", mat_id, "", self.przx)
+        self._write_mpdata(mapdl, mat_id, ELASTIC_PROPERTIES, temperatures)
+
+    def _write_mpdata(self, mapdl, mat_id: int, properties: dict, temperatures=(0,)) -> list[str]:
+        """
+        Write the given properties (MP label -> attribute name), if they are not None.
+        Properties given as sequence (one value per temperature) are written as MPTEMP/MPDATA table
+        after all scalar properties.
+        :param mapdl: MapdlGrpc object (or CommandRecorder)
+        :param mat_id: Material reference identification number
+        :param properties: e.g. ELASTIC_PROPERTIES
+        :param temperatures: (optional) temperatures of temperature dependent properties
+        :return: list of written MP labels
+        """
+        values = self._property_values(properties)
+        tables = {label: _temperature_table(label, value, temperatures)
+                  for label, value in values.items() if np.ndim(value) > 0}
+        for label, value in values.items():
+            if label not in tables:
+                mapdl.mpdata(label, mat_id, "", value)
+        if tables:
+            _write_mptemp(mapdl, tables[next(iter(tables))][1])
+        for label, (table_values, _) in tables.items():
+            for start in range(0, len(table_values), MP_FIELDS):
+                mapdl.mpdata(label, mat_id, start + 1, *table_values[start:start + MP_FIELDS])
+        return list(values)
+
+    def _property_values(self, properties: dict) -> dict:
+        """
+        :param properties: MP label -> attribute name (e.g. ELASTIC_PROPERTIES)
+        :return: dict MP label -> value (only properties, that are not None)
+        """
+        values = {}
+        for label, attribute in properties.items():
+            value = getattr(self, attribute)
+            if value is not None:
+                values[label] = value
+        return values
 
     def set_ramberg_osgood(self, mapdl: MapdlGrpc, mat_id: int, strain_max: float, eps_tol: float = 0.01)\
             -> tuple[list, list]:
         """
         Define stress-strain-curve with 20 data points in mkin-table by using Ramberg-Osgood-Law
         calculate and define stress-strain-curve (total)
-        (mkin max 40 temperatures & 20 pairs per temp)
+        (mkin max 40 temperatures & 20 pairs per temp - see set_ramberg_osgood_table())
         :param mapdl: MapdlGrpc object
         :param mat_id: Material reference identification number
         :param strain_max: largest strain value in the mkin-table
         :param eps_tol: tolerance for the actual max. strain value compared to eps_max
+            (the max. stress is solved to machine precision, so the last strain always matches strain_max)
         :return: tuple (list of stresses, list of strains)
         """
-        assert self.ro_n != None, "Can't set RO material data, if Ramberg-Osgood n not set."
-        assert self.ro_K != None, "Can't set RO material data, if Ramberg-Osgood k not set."
+        stresses, strains = self.set_ramberg_osgood_table(mapdl, mat_id, strain_max)
+        return [0] + stresses[0].tolist(), [0] + strains[0].tolist()
+
+    def set_ramberg_osgood_table(self, mapdl: MapdlGrpc, mat_id: int, strain_max, temperatures=(0,),
+                                 steps: int = MAX_KINH_POINTS) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Define a temperature dependent stress-strain-curve (total) in mkin-table by using Ramberg-Osgood-Law.
+        ex, ro_n and ro_K can be floats or sequences with one value per temperature.
+        The whole table is calculated in one vectorized pass and send to ANSYS with one submission.
+        :param mapdl: MapdlGrpc object
+        :param mat_id: Material reference identification number
+        :param strain_max: largest strain value in the mkin-table (float or one value per temperature)
+        :param temperatures: (optional) up to 40 temperatures (default: one table for temperature 0)
+        :param steps: (optional) number of data points per temperature (max. 20)
+        :return: tuple (stresses, strains) - numpy arrays with shape (number of temperatures, steps)
+        """
+        assert self.ro_n is not None, "Can't set RO material data, if Ramberg-Osgood n not set."
+        assert self.ro_K is not None, "Can't set RO material data, if Ramberg-Osgood k not set."
 
-        stress_max = 100  # only a start value - will be changed later to match strain_max
+        recorder = CommandRecorder()
+        recorder.run("/PREP7")
+        recorder.mptemp("", "", "", "", "", "", "")
+        recorder.mptemp(1, "T")
+        stresses, strains = self._write_kinh_table(recorder, mat_id, strain_max, temperatures, steps)
+        recorder.submit(mapdl)
+        return stresses, strains
 
-        mapdl.run("/PREP7")
-        mapdl.mptemp("", "", "", "", "", "", "")
-        mapdl.mptemp(1, "T")
+    def _write_kinh_table(self, mapdl, mat_id: int, strain_max, temperatures, steps: int) \
+            -> tuple[np.ndarray, np.ndarray]:
+        """
+        Write the Ramberg-Osgood KINH table (see set_ramberg_osgood_table()).
+        :param mapdl: MapdlGrpc object (or CommandRecorder)
+        :return: tuple (stresses, strains) - numpy arrays with shape (number of temperatures, steps)
+        """
+        temperatures = list(temperatures)
+        stresses, strains = kinh_table(strain_max, self.ex, self.ro_K, self.ro_n, len(temperatures), steps)
+        mapdl.tb("KINH", mat_id, len(temperatures), steps)  # Activate a data table
+        for temperature, stress_row, strain_row in zip(temperatures, stresses.tolist(), strains.tolist()):
+            mapdl.tbtemp(temperature)
+            for stress, strain in zip(stress_row, strain_row):
+                mapdl.tbpt("", strain, stress)
+        return stresses, strains
+
+
+def _temperature_table(label: str, value, temperatures) -> tuple[tuple, tuple]:
+    """
+    Check a temperature dependent property (one value per temperature).
+
+    :return: tuple (values, temperatures)
+    """
+    values = tuple(float(item) for item in np.ravel(value))
+    if np.ndim(value) != 1 or len(values) != len(temperatures):
+        raise ValueError(f"{label} needs one value per temperature ({len(temperatures)} temperatures), "
+                         f"got shape {np.shape(value)}")
+    return values, tuple(float(temperature) for temperature in temperatures)
+
+
+def _write_mptemp(mapdl, temperatures) -> None:
+    """
+    Replace the MPTEMP table by the given temperatures (used by the following MPDATA commands).
+
+    :param mapdl: MapdlGrpc object (or CommandRecorder)
+    :return: None
+    """
+    mapdl.mptemp("", "", "", "", "", "", "")
+    for start in range(0, len(temperatures), MP_FIELDS):
+        mapdl.mptemp(start + 1, *temperatures[start:start + MP_FIELDS])
+
+
+def _fingerprint(value) -> str:
+    """
+    Content hash of a property value (float, sequence or array - also nested in tuples).
+    """
+    def canonical(item):
+        if isinstance(item, (tuple, list, np.ndarray)):
+            return [canonical(i) for i in item]
+        return item if isinstance(item, str) else float(item)
+    return hashlib.blake2b(repr(canonical(value)).encode(), digest_size=16).hexdigest()
 
-        steps = 20
-        mapdl.tb("KINH", mat_id, 1, steps)  # Activate a data table
-        mapdl.tbtemp(0)  # Temperature
-
-        # * Algorithm to find the maximum Strain for given strain_max *
-        # *************************************************************
-        abort_flag = False
-        while not abort_flag:
-            eps = stress_max / self.ex + self.ro_K * (
-                    stress_max / self.ex) ** self.ro_n
-            if (eps >= strain_max - eps_tol) and (
-                    eps <= strain_max + eps_tol):
-                abort_flag = True
-            elif eps > strain_max:
-                stress_max /= 1.5
+
+class MaterialCache:
+    """
+    Fingerprints of the material properties already defined in one MAPDL session (see MaterialLibrary.apply()).
+    Properties are keyed by (material id, property label), so only changed properties are send again.
+    Together with the properties, the APDL parameter SENTINEL is defined. If it is missing
+    (e.g. after /CLEAR), the cache is invalidated before its next use.
+    """
+    SENTINEL = "__MATCACHE__"
+    _sessions = weakref.WeakKeyDictionary()  # mapdl -> MaterialCache
+
+    def __init__(self):
+        self._fingerprints = {}  # (material id, property label) -> fingerprint
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    @classmethod
+    def of(cls, mapdl) -> "MaterialCache":
+        """
+        The cache of the MAPDL session mapdl (created on first use).
+
+        :param mapdl: MapdlGrpc object
+        :return: MaterialCache
+        """
+        cache = cls._sessions.get(mapdl)
+        if cache is None:
+            cache = cls._sessions[mapdl] = cls()
+        return cache
+
+    def invalidate(self) -> None:
+        """
+        Forget all defined properties (e.g. after deleting materials with MPDELE or TBDELE).
+
+        :return: None
+        """
+        self._fingerprints.clear()
+
+    def verify(self, mapdl) -> None:
+        """
+        Invalidate the cache, if SENTINEL is not defined in ANSYS anymore (e.g. after /CLEAR).
+        Needs one round-trip (only if the cache is not empty).
+
+        :param mapdl: MapdlGrpc object
+        :return: None
+        """
+        if self._fingerprints and mapdl.get_value("PARM", self.SENTINEL, "TYPE") < 0:
+            self.invalidate()
+
+    def changed(self, mat_id: int, properties: dict) -> dict:
+        """
+        :param mat_id: Material reference identification number
+        :param properties: dict property label -> value
+        :return: dict property label -> fingerprint for all properties, that are not defined with this value
+        """
+        result = {}
+        for label, value in properties.items():
+            fingerprint = _fingerprint(value)
+            if self._fingerprints.get((mat_id, label)) == fingerprint:
+                self.hits += 1
             else:
-                stress_max *= 2.0
+                self.misses += 1
+                result[label] = fingerprint
+        return result
 
-        stress_list = [0]
-        strain_list = [0]
+    def update(self, mat_id: int, fingerprints: dict) -> None:
+        """
+        Store fingerprints (see changed()) of properties, that have been send to ANSYS.
 
-        for i in range(1, steps+1):
-            stress = i * stress_max / steps
-            strain = (stress / self.ex) + self.ro_K * (stress / self.ex) ** (self.ro_n)
-            mapdl.tbpt("", strain, stress)
-            stress_list.append(stress)
-            strain_list.append(strain)
+        :return: None
+        """
+        for label, fingerprint in fingerprints.items():
+            self._fingerprints[(mat_id, label)] = fingerprint
 
-        return stress_list, strain_list
 
+class MaterialLibrary:
+    """
+    Defines many materials in ANSYS with one submission:
+
+        written = MaterialLibrary.apply(mapdl, {1: Si(), 2: _Al()}, strain_max=0.05)
+        # written == {1: ["EX", "EY", "EZ", "GXY", "GYZ", "GXZ", "PRXY", "PRYZ", "PRXZ", "DENS", "CTEX"],
+        #             2: ["EX", "PRXY", "DENS", "CTEX", "KINH"]}
+
+    With cache=True, properties already defined with the same value in this MAPDL session are skipped
+    (see MaterialCache).
+    """
+
+    @staticmethod
+    def apply(mapdl: MapdlGrpc, materials: dict[int, Material], strain_max=None, temperatures=(0,),
+              steps: int = MAX_KINH_POINTS, cache: bool = False) -> dict[int, list[str]]:
+        """
+        Define elastic properties, density, CTE and (if strain_max is given) Ramberg-Osgood plasticity
+        of all materials. All commands are compiled into one command block, that is send to ANSYS
+        with one submission. Properties, that are not set (None), are skipped.
+        :param mapdl: MapdlGrpc object
+        :param materials: dict material id -> Material
+        :param strain_max: (optional) largest strain value in the mkin-table (see set_ramberg_osgood_table());
+            without it, no plasticity is defined
+        :param temperatures: (optional) temperatures of the mkin-table and of temperature dependent properties
+            (properties given as sequence with one value per temperature)
+        :param steps: (optional) number of data points per temperature in the mkin-table
+        :param cache: (optional) skip properties, that are already defined with the same value (see MaterialCache)
+        :return: dict material id -> list of written properties (MP labels and "KINH")
+        """
+        session = MaterialCache.of(mapdl) if cache else None
+        if session is not None:
+            session.verify(mapdl)
+
+        recorder = CommandRecorder()
+        recorder.run("/PREP7")
+        recorder.mptemp("", "", "", "", "", "", "")
+        recorder.mptemp(1, "T")
+        table_temperatures = None  # temperatures of the current MPTEMP table (None: no temperature dependence)
+        written = {}
+        fingerprints = {}
+        for mat_id, material in materials.items():
+            properties = material._property_values({**ELASTIC_PROPERTIES, **PHYSICAL_PROPERTIES})
+            for label, value in properties.items():
+                if np.ndim(value) > 0:
+                    properties[label] = _temperature_table(label, value, temperatures)
+            if strain_max is not None and material.ro_n is not None and material.ro_K is not None:
+                properties["KINH"] = (material.ex, material.ro_K, material.ro_n, strain_max, temperatures, steps)
+            if session is not None:
+                fingerprints[mat_id] = session.changed(mat_id, properties)
+                properties = {label: properties[label] for label in fingerprints[mat_id]}
+            for label, value in properties.items():
+                if label == "KINH":
+                    material._write_kinh_table(recorder, mat_id, strain_max, temperatures, steps)
+                elif isinstance(value, tuple):
+                    values, value_temperatures = value
+                    if table_temperatures != value_temperatures:
+                        _write_mptemp(recorder, value_temperatures)
+                        table_temperatures = value_temperatures
+                    for start in range(0, len(values), MP_FIELDS):
+                        recorder.mpdata(label, mat_id, start + 1, *values[start:start + MP_FIELDS])
+                else:
+                    if table_temperatures is not None:
+                        recorder.mptemp("", "", "", "", "", "", "")
+                        recorder.mptemp(1, "T")
+                        table_temperatures = None
+                    recorder.mpdata(label, mat_id, "", value)
+            written[mat_id] = list(properties)
 
+        if not any(written.values()):
+            return written
+        if session is not None:
+            recorder.run(f"{MaterialCache.SENTINEL}=1")
+        recorder.submit(mapdl)
+        if session is not None:
+            for mat_id, material_fingerprints in fingerprints.items():
+                session.update(mat_id, material_fingerprints)
+        return written
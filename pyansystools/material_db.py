@@ -2,6 +2,7 @@
 @author: Nathanael Jöhrmann
 """
 from pyansystools.material import Material
+from pyansystools.material_store import MaterialStore
 
 
 class _Al(Material):
@@ -51,6 +52,21 @@ class Si(Material):
         self.ctex = 3.0e-6  # CTE
 
 
+def default_store(path: str = ":memory:") -> MaterialStore:
+    """
+    MaterialStore with the materials of this module (if path is an existing database, they are added,
+    unless a record with the same name exists). Use it as starting point for larger material databases.
+
+    :param path: (optional) file name of the database; default is an in-memory database
+    :return: MaterialStore
+    """
+    store = MaterialStore(path)
+    records = [(_Al(), "_Al", ["metal", "film", "ramberg-osgood"], _Al.__doc__.strip()),
+               (Si(), "Si", ["semiconductor", "substrate", "anisotropic"], Si.__doc__.strip())]
+    store.add_many(record for record in records if record[1] not in store)
+    return store
+
+
 # class Si111(Material):
 #     """todo: class is incomplete (don't use)"""
 #     def __init__(self):
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Provides MaterialStore - a material database in an SQLite file (or in memory).
+Records are loaded lazily (one indexed query per lookup) and materialize into Material objects,
+so opening a store with hundreds of materials needs neither time nor memory.
+
+    store = MaterialStore("materials.sqlite")
+    store.add(Si(), "Si", tags=["substrate"])
+    si = store["Si"]  # Material
+    stiff = store.find(ex=(150000, None))  # ids of all materials with ex >= 150000
+
+@author: Nathanael Jöhrmann
+"""
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from pyansystools.material import Material
+
+# attributes of Material stored in the database (one column each, only temperature independent values)
+PROPERTIES = ("dens", "ex", "ey", "ez", "prxy", "pryz", "przx", "gxy", "gyz", "gzx", "ctex", "ro_n", "ro_K")
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS materials (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, "
+    "description TEXT NOT NULL DEFAULT '', " + ", ".join(f"{name} REAL" for name in PROPERTIES) + ")",
+    "CREATE TABLE IF NOT EXISTS tags (material_id INTEGER NOT NULL REFERENCES materials(id) ON DELETE CASCADE, "
+    "tag TEXT NOT NULL, PRIMARY KEY (material_id, tag))",
+    "CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag)",
+] + [f"CREATE INDEX IF NOT EXISTS materials_{name} ON materials ({name})" for name in PROPERTIES]
+
+
+# defaults of the optional fields of a record: tags, description, material_id
+_RECORD_DEFAULTS = ((), "", None)
+
+
+class MaterialStore:
+    """
+    Material database (SQLite). Each record has a unique id and name, an optional description and tags,
+    and the properties of a Material (see PROPERTIES). Temperature dependent properties (sequences) can't be stored.
+    Lookup by id or name (store[1], store["Si"]), by tag and property ranges (find())
+    and vectorized queries over all records (columns()).
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        :param path: (optional) file name of the database (created if needed); default is an in-memory database
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the database file.
+
+        :return: None
+        """
+        self._connection.close()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM materials").fetchone()[0]
+
+    def __contains__(self, key: Union[int, str]):
+        return self._find_id(key) is not None
+
+    def __getitem__(self, key: Union[int, str]) -> Material:
+        return self.get(key)
+
+    # ========================================================================
+    # ================================ write =================================
+    # ========================================================================
+    def add(self, material: Material, name: str, tags: Iterable[str] = (), description: str = "",
+            material_id: Optional[int] = None) -> int:
+        """
+        Add material as new record (ValueError for temperature dependent properties).
+
+        :param material: Material
+        :param name: unique name
+        :param tags: (optional) e.g. ["metal", "film"]
+        :param description: (optional) e.g. source of the data
+        :param material_id: (optional) unique id; default is the next free id
+        :return: id of the new record
+        """
+        return self.add_many([(material, name, tags, description, material_id)])[0]
+
+    def add_many(self, records: Iterable[Tuple]) -> List[int]:
+        """
+        Add many records within one transaction (much faster than calling add() for each record).
+        ValueError for temperature dependent properties (sequences) - nothing of the transaction is stored then.
+
+        :param records: iterable of tuples (material, name[, tags[, description[, material_id]]])
+        :return: list of ids of the new records
+        """
+        columns = ", ".join(("id", "name", "description") + PROPERTIES)
+        placeholders = ", ".join("?" * (3 + len(PROPERTIES)))
+        ids = []
+        with self._connection:
+            for record in records:
+                material, name, tags, description, material_id = tuple(record) + _RECORD_DEFAULTS[len(record) - 2:]
+                values = [getattr(material, attribute) for attribute in PROPERTIES]
+                for attribute, value in zip(PROPERTIES, values):
+                    if np.ndim(value) > 0:
+                        raise ValueError(f"MaterialStore can't store the temperature dependent property "
+                                         f"{attribute} of {name!r} (only single values)")
+                cursor = self._connection.execute(f"INSERT INTO materials ({columns}) VALUES ({placeholders})",
+                                                  [material_id, name, description] + values)
+                ids.append(cursor.lastrowid)
+                self._connection.executemany("INSERT OR IGNORE INTO tags (material_id, tag) VALUES (?, ?)",
+                                             [(cursor.lastrowid, tag) for tag in tags])
+        return ids
+
+    def remove(self, key: Union[int, str]) -> None:
+        """
+        Remove the record with the given id or name.
+
+        :return: None
+        """
+        with self._connection:
+            self._connection.execute("DELETE FROM materials WHERE id = ?", (self._id(key),))
+
+    # ========================================================================
+    # ================================ lookup ================================
+    # ========================================================================
+    def _find_id(self, key: Union[int, str]) -> Optional[int]:
+        if isinstance(key, str):
+            row = self._connection.execute("SELECT id FROM materials WHERE name = ?", (key,)).fetchone()
+        else:
+            row = self._connection.execute("SELECT id FROM materials WHERE id = ?", (int(key),)).fetchone()
+        return None if row is None else row[0]
+
+    def _id(self, key: Union[int, str]) -> int:
+        material_id = self._find_id(key)
+        if material_id is None:
+            raise KeyError(key)
+        return material_id
+
+    def get(self, key: Union[int, str]) -> Material:
+        """
+        Load one record and materialize it as Material (a new object on each call).
+
+        :param key: id (int) or name (str)
+        :return: Material
+        """
+        column = "name" if isinstance(key, str) else "id"
+        row = self._connection.execute(f"SELECT {', '.join(PROPERTIES)} FROM materials WHERE {column} = ?",
+                                       (key if isinstance(key, str) else int(key),)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        material = Material()
+        for attribute, value in zip(PROPERTIES, row):
+            setattr(material, attribute, value)
+        return material
+
+    def materials(self, keys: Iterable[Union[int, str]]) -> Dict[int, Material]:
+        """
+        Load many records, e.g. for MaterialLibrary.apply(mapdl, store.materials(store.find(tag="film"))).
+
+        :param keys: ids or names
+        :return: dict id -> Material
+        """
+        return {self._id(key): self.get(key) for key in keys}
+
+    def name(self, material_id: int) -> str:
+        """Name of the record with the given id."""
+        return self._connection.execute("SELECT name FROM materials WHERE id = ?",
+                                        (self._id(material_id),)).fetchone()[0]
+
+    def description(self, key: Union[int, str]) -> str:
+        """Description of the record with the given id or name."""
+        return self._connection.execute("SELECT description FROM materials WHERE id = ?",
+                                        (self._id(key),)).fetchone()[0]
+
+    def tags(self, key: Union[int, str]) -> List[str]:
+        """Tags of the record with the given id or name (sorted)."""
+        rows = self._connection.execute("SELECT tag FROM tags WHERE material_id = ? ORDER BY tag", (self._id(key),))
+        return [row[0] for row in rows]
+
+    def ids(self) -> List[int]:
+        """Ids of all records (ascending)."""
+        return [row[0] for row in self._connection.execute("SELECT id FROM materials ORDER BY id")]
+
+    def names(self) -> List[str]:
+        """Names of all records (ordered by id)."""
+        return [row[0] for row in self._connection.execute("SELECT name FROM materials ORDER BY id")]
+
+    # ========================================================================
+    # ================================ queries ===============================
+    # ========================================================================
+    def find(self, tag: Optional[str] = None, **ranges: Tuple[Optional[float], Optional[float]]) -> List[int]:
+        """
+        Ids of all records with the given tag and properties inside the given ranges (min and max included,
+        None for no limit). Uses the indexes of the database:
+
+            store.find(tag="metal", ex=(70000, None), dens=(None, 3e-9))
+
+        :param tag: (optional)
+        :param ranges: property name -> (min, max)
+        :return: list of ids (ascending)
+        """
+        conditions = []
+        parameters = []
+        if tag is not None:
+            conditions.append("id IN (SELECT material_id FROM tags WHERE tag = ?)")
+            parameters.append(tag)
+        for attribute, (minimum, maximum) in ranges.items():
+            if attribute not in PROPERTIES:
+                raise ValueError(f"unknown property {attribute!r} (possible properties: {', '.join(PROPERTIES)})")
+            if minimum is not None:
+                conditions.append(f"{attribute} >= ?")
+                parameters.append(minimum)
+            if maximum is not None:
+                conditions.append(f"{attribute} <= ?")
+                parameters.append(maximum)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connection.execute(f"SELECT id FROM materials{where} ORDER BY id", parameters)
+        return [row[0] for row in rows]
+
+    def columns(self, *attributes: str) -> Dict[str, np.ndarray]:
+        """
+        Properties of all records as numpy arrays (NaN if not set) for vectorized queries:
+
+            data = store.columns("ex", "dens")
+            ids = data["id"][(data["ex"] > 150000) & (data["dens"] < 3e-9)]
+
+        :param attributes: property names (default: all PROPERTIES)
+        :return: dict "id" and property name -> numpy array (ordered by id)
+        """
+        attributes = attributes or PROPERTIES
+        for attribute in attributes:
+            if attribute not in PROPERTIES:
+                raise ValueError(f"unknown property {attribute!r} (possible properties: {', '.join(PROPERTIES)})")
+        rows = self._connection.execute(f"SELECT id, {', '.join(attributes)} FROM materials ORDER BY id").fetchall()
+        values = np.array(rows, dtype=np.float64).reshape(len(rows), len(attributes) + 1)
+        result = {"id": values[:, 0].astype(np.int64)}
+        for i, attribute in enumerate(attributes):
+            result[attribute] = values[:, i + 1]
+        return result
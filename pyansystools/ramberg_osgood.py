@@ -11,6 +11,120 @@
 # PR	    = ARG9			! Poisson Ratio
 # !************************
 
+import sys
+
+import numpy as np
+
+# relative tolerance of the strain for the found stress
+STRAIN_RTOL = 1e-12
+# limits of the KINH table of ANSYS
+MAX_KINH_TEMPERATURES = 40
+MAX_KINH_POINTS = 20
+
+
+def ramberg_osgood_strain(stress, E, K, n):
+    """
+    Total strain for the given stress(es) (Ramberg-Osgood, n-K formula): eps = S/E + K * (S/E)**n
+
+    :param stress: float or array_like
+    :param E: Young's modulus
+    :param K: Ramberg-Osgood constant K
+    :param n: Ramberg-Osgood exponent n
+    :return: float or numpy array
+    """
+    x = np.asarray(stress, dtype=np.float64) / E
+    result = x + K * x ** n
+    return float(result) if result.ndim == 0 else result
+
+
+def ramberg_osgood_stress(strain, E, K, n, rtol: float = STRAIN_RTOL, max_iter: int = 100):
+    """
+    Stress for the given total strain(s), i.e. the root of S/E + K * (S/E)**n - strain.
+    Newton iteration with analytic derivative, safeguarded by bisection inside a bracket
+    [0, E * min(strain, (strain/K)**(1/n))], so it always converges (usually within a few iterations,
+    even for stiff exponents). All parameters can be arrays (broadcast against each other).
+
+    :param strain: float or array_like (> 0)
+    :param E: Young's modulus (> 0)
+    :param K: Ramberg-Osgood constant K (>= 0)
+    :param n: Ramberg-Osgood exponent n (> 0)
+    :param rtol: (optional) relative tolerance of the strain
+    :param max_iter: (optional) max. number of iterations
+    :return: float or numpy array
+    """
+    if all(isinstance(value, (int, float)) for value in (strain, E, K, n)):
+        return _ramberg_osgood_stress_scalar(float(strain), float(E), float(K), float(n), rtol, max_iter)
+
+    strain, E, K, n = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in (strain, E, K, n)))
+    assert (strain > 0).all(), "strain must be > 0"
+    assert (E > 0).all() and (K >= 0).all() and (n > 0).all(), "E and n must be > 0 and K >= 0"
+
+    # both terms of the strain are positive, so each of them alone is <= strain
+    with np.errstate(divide="ignore"):
+        high = E * np.minimum(strain, (strain / K) ** (1 / n))
+    low = np.zeros_like(high)
+    stress = high.copy()
+    for _ in range(max_iter):
+        x = stress / E
+        residual = x + K * x ** n - strain
+        converged = (np.abs(residual) <= rtol * strain) | (high - low <= 4 * np.finfo(float).eps * high)
+        if converged.all():
+            return float(stress) if stress.ndim == 0 else stress
+        low = np.where(residual < 0, stress, low)
+        high = np.where(residual > 0, stress, high)
+        newton = stress - residual * E / (1 + K * n * x ** (n - 1))
+        inside = (newton > low) & (newton < high)
+        stress = np.where(converged, stress, np.where(inside, newton, (low + high) / 2))
+    raise RuntimeError(f"Ramberg-Osgood stress not found within {max_iter} iterations")
+
+
+def _ramberg_osgood_stress_scalar(strain: float, E: float, K: float, n: float, rtol: float, max_iter: int) -> float:
+    """Same as ramberg_osgood_stress() for floats (without the overhead of numpy)."""
+    assert strain > 0, "strain must be > 0"
+    assert E > 0 and K >= 0 and n > 0, "E and n must be > 0 and K >= 0"
+
+    high = E * (min(strain, (strain / K) ** (1 / n)) if K > 0 else strain)
+    low = 0.0
+    stress = high
+    for _ in range(max_iter):
+        x = stress / E
+        residual = x + K * x ** n - strain
+        if abs(residual) <= rtol * strain or high - low <= 4 * sys.float_info.epsilon * high:
+            return stress
+        if residual < 0:
+            low = stress
+        else:
+            high = stress
+        stress -= residual * E / (1 + K * n * x ** (n - 1))
+        if not low < stress < high:
+            stress = (low + high) / 2
+    raise RuntimeError(f"Ramberg-Osgood stress not found within {max_iter} iterations")
+
+
+def kinh_table(strain_max, E, K, n, n_temperatures: int = 1, steps: int = MAX_KINH_POINTS):
+    """
+    Stress-strain points of a KINH table (Ramberg-Osgood) for each temperature in one vectorized pass.
+    The stresses are equidistant from stress_max / steps up to stress_max, the stress at strain_max.
+    strain_max, E, K and n can be floats or have one value per temperature.
+
+    :param strain_max: largest strain of each temperature
+    :param E: Young's modulus
+    :param K: Ramberg-Osgood constant K
+    :param n: Ramberg-Osgood exponent n
+    :param n_temperatures: (optional) number of temperatures (max. 40)
+    :param steps: (optional) number of points per temperature (max. 20)
+    :return: tuple (stresses, strains) - numpy arrays with shape (n_temperatures, steps)
+    """
+    assert 1 <= n_temperatures <= MAX_KINH_TEMPERATURES, f"KINH supports 1 ... {MAX_KINH_TEMPERATURES} temperatures"
+    assert 1 <= steps <= MAX_KINH_POINTS, f"KINH supports 1 ... {MAX_KINH_POINTS} points per temperature"
+    strain_max, E, K, n = (np.broadcast_to(np.asarray(value, dtype=np.float64), (n_temperatures,))
+                           for value in (strain_max, E, K, n))
+    stress_max = ramberg_osgood_stress(strain_max, E, K, n)
+    stresses = stress_max[:, None] * (np.arange(1, steps + 1) / steps)
+    strains = ramberg_osgood_strain(stresses, E[:, None], K[:, None], n[:, None])
+    return stresses, strains
+
+
 def set_ramberg_osgood(mapdl, mat_id, S_max, eps_max, eps_tol, E, K, n, PR):
     # Define stress-strain-curve in mkin-table by using Ramberg-Osgood-Law
     # calculate and define stress-strain-curve (total)
@@ -46,19 +160,10 @@ def set_ramberg_osgood(mapdl, mat_id, S_max, eps_max, eps_tol, E, K, n, PR):
     mapdl.tb("KINH", mat_id, 1, steps)  # Activate a data table
     mapdl.tbtemp(0)  # Temperature
 
-    # * Algorithm to find the maximum Strain      *
+    # * Find the stress for the maximum Strain    *
+    # * (S_max and eps_tol are not needed anymore) *
     # *********************************************
-    abort_flag = False
-    while not abort_flag:
-        eps = S_max / E + K * (
-                S_max / E) ** n
-        if (eps >= eps_max - eps_tol) and (
-                eps >= eps_max + eps_tol):
-            abort_flag = True
-        elif eps > eps_max:
-            S_max /= 1.5
-        else:
-            S_max *= 2.0
+    S_max = ramberg_osgood_stress(eps_max, E, K, n)
 
     # * calculate S-S-Curve
     # * be shure to get the correct initial slope *
@@ -0,0 +1,198 @@
+"""
+Provides a class to answer nearest-entity queries (like the inline functions node, kp, nnear, knear and enearn)
+locally in python. The coordinates of the selected entities are fetched from ANSYS once; afterwards
+each query needs no round-trip to ANSYS.
+Coordinates are compared as cartesian coordinates - use it with the global cartesian coordinate system (CSYS,0).
+@author: Nathanael Jöhrmann
+"""
+from typing import Optional
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; without it, a brute force search is used
+    cKDTree = None
+
+from pyansystools.inline import Inline
+
+# number of neighbours requested from KD-tree to find coincident entities
+_N_NEIGHBOURS = 8
+# max. size of the distance matrix used for brute force search
+_MAX_MATRIX_SIZE = 2 ** 22
+
+
+class SpatialIndex:
+    """
+    Index of entity numbers and their coordinates for nearest-entity queries.
+    As in ANSYS, the lowest number is returned for coincident entities and 0 if no entity is found.
+
+        index = SpatialIndex.from_selected_nodes(inline)
+        nodes = index.nearest(sample_points)  # like inline.node(x, y, z) for each point
+    """
+
+    def __init__(self, numbers, coordinates, inline: Optional[Inline] = None, entity: str = "NODE"):
+        """
+        :param numbers: array_like of int; ANSYS numbers of the entities
+        :param coordinates: array_like with shape (n, 3); coordinates of the entities
+        :param inline: (optional) Inline instance to fetch coordinates of entities not in the index
+        :param entity: "NODE", "KP" or "ELEM" (only needed to fetch coordinates)
+        """
+        numbers = np.asarray(numbers, dtype=np.int64).reshape(-1)
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(len(numbers), 3)
+        order = np.argsort(numbers, kind="stable")  # lowest number first -> tie-break by index
+        self.numbers = numbers[order]
+        self.coordinates = coordinates[order]
+        self.entity = entity.upper()
+        self._inline = inline
+        self._tree = cKDTree(self.coordinates) if (cKDTree is not None and len(self.numbers)) else None
+
+    def __len__(self):
+        return len(self.numbers)
+
+    # ========================================================================
+    # ============================= construction =============================
+    # ========================================================================
+    @classmethod
+    def from_selected_nodes(cls, inline: Inline) -> "SpatialIndex":
+        """
+        Index of all selected nodes (one bulk transfer for numbers and coordinates each).
+
+        :param inline: Inline
+        :return: SpatialIndex
+        """
+        numbers = inline.selected_numbers("NODE")
+        return cls(numbers, inline.nxyz_array(numbers), inline, "NODE")
+
+    @classmethod
+    def from_selected_keypoints(cls, inline: Inline) -> "SpatialIndex":
+        """
+        Index of all selected keypoints (one bulk transfer for numbers and coordinates each).
+
+        :param inline: Inline
+        :return: SpatialIndex
+        """
+        numbers = inline.selected_numbers("KP")
+        return cls(numbers, inline.kxyz_array(numbers), inline, "KP")
+
+    @classmethod
+    def from_selected_elements(cls, inline: Inline) -> "SpatialIndex":
+        """
+        Index of the centroids of all selected elements (one bulk transfer for numbers and coordinates each).
+        As for enearn, the centroids are calculated from the selected nodes.
+
+        :param inline: Inline
+        :return: SpatialIndex
+        """
+        numbers = inline.selected_numbers("ELEM")
+        return cls(numbers, inline.centrxyz_array(numbers), inline, "ELEM")
+
+    # ========================================================================
+    # =============================== queries ================================
+    # ========================================================================
+    def nearest(self, points) -> np.ndarray:
+        """
+        Number of the entity nearest to each point (like node(x,y,z) or kp(x,y,z)).
+
+        :param points: array_like with shape (m, 3) or (3,)
+        :return: numpy array of int with shape (m,)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        return self._query(points)
+
+    def nearest_to(self, numbers) -> np.ndarray:
+        """
+        Nearest other entity for entities of the same type (like nnear(n) or knear(k)).
+        The entities themselves need not be part of the index. Coordinates of entities,
+        that are not part of the index, are fetched with one bulk transfer.
+
+        :param numbers: int or array_like of int
+        :return: numpy array of int with shape (m,)
+        """
+        numbers = np.asarray(numbers, dtype=np.int64).reshape(-1)
+        return self._query(self._get_coordinates(numbers), exclude=numbers)
+
+    def nearest_to_nodes(self, nodes) -> np.ndarray:
+        """
+        Nearest entity for each node (e.g. like enearn(n) for an index of elements).
+        Node coordinates are fetched with one bulk transfer, if this is not a node index.
+
+        :param nodes: int or array_like of int
+        :return: numpy array of int with shape (m,)
+        """
+        nodes = np.asarray(nodes, dtype=np.int64).reshape(-1)
+        if self.entity == "NODE":
+            points = self._get_coordinates(nodes)
+        else:
+            points = self._fetch_coordinates(nodes, "NODE")
+        return self._query(points)
+
+    # ========================================================================
+    # ================================ helper ================================
+    # ========================================================================
+    def _fetch_coordinates(self, numbers: np.ndarray, entity: str) -> np.ndarray:
+        assert self._inline is not None, "SpatialIndex needs an Inline instance to fetch coordinates"
+        if entity == "NODE":
+            return self._inline.nxyz_array(numbers)
+        if entity == "KP":
+            return self._inline.kxyz_array(numbers)
+        return self._inline.centrxyz_array(numbers)
+
+    def _get_coordinates(self, numbers: np.ndarray) -> np.ndarray:
+        """
+        Coordinates of entities - taken from index if possible, else fetched from ANSYS.
+        """
+        positions = np.searchsorted(self.numbers, numbers)
+        positions = np.minimum(positions, max(len(self.numbers) - 1, 0))
+        known = (self.numbers[positions] == numbers) if len(self.numbers) else np.zeros(len(numbers), bool)
+        coordinates = np.empty((len(numbers), 3))
+        coordinates[known] = self.coordinates[positions[known]]
+        if not known.all():
+            coordinates[~known] = self._fetch_coordinates(numbers[~known], self.entity)
+        return coordinates
+
+    def _query(self, points: np.ndarray, exclude: Optional[np.ndarray] = None) -> np.ndarray:
+        if len(self.numbers) == 0:
+            return np.zeros(len(points), dtype=np.int64)
+        if self._tree is None:
+            return self._query_brute_force(points, exclude)
+
+        k = min(_N_NEIGHBOURS, len(self.numbers))
+        distances, indices = self._tree.query(points, k=k)
+        distances = distances.reshape(len(points), k)
+        indices = indices.reshape(len(points), k)
+        if exclude is not None:
+            distances = np.where(self.numbers[indices] == exclude[:, None], np.inf, distances)
+        min_distances = distances.min(axis=1)
+        is_candidate = distances == min_distances[:, None]
+        # coincident entities are not sorted by number -> take lowest index among candidates
+        candidates = np.where(is_candidate, indices, len(self.numbers))
+        result_indices = candidates.min(axis=1)
+
+        # all k neighbours are candidates (or excluded): there might be more candidates
+        unsure = is_candidate[:, -1] | np.isinf(min_distances)
+        if k < len(self.numbers) and unsure.any():
+            unsure_exclude = None if exclude is None else exclude[unsure]
+            result = self.numbers[np.minimum(result_indices, len(self.numbers) - 1)]
+            result[unsure] = self._query_brute_force(points[unsure], unsure_exclude)
+            return result
+        return self._numbers_or_zero(result_indices, min_distances)
+
+    def _query_brute_force(self, points: np.ndarray, exclude: Optional[np.ndarray] = None) -> np.ndarray:
+        result = np.empty(len(points), dtype=np.int64)
+        chunk_size = max(1, _MAX_MATRIX_SIZE // len(self.numbers))
+        for start in range(0, len(points), chunk_size):
+            stop = start + chunk_size
+            difference = points[start:stop, None, :] - self.coordinates[None, :, :]
+            distances = np.einsum("ijk,ijk->ij", difference, difference)
+            if exclude is not None:
+                distances[self.numbers[None, :] == exclude[start:stop, None]] = np.inf
+            # argmin returns the first (lowest number) of coincident entities
+            indices = distances.argmin(axis=1)
+            min_distances = distances[np.arange(len(indices)), indices]
+            result[start:stop] = self._numbers_or_zero(indices, min_distances)
+        return result
+
+    def _numbers_or_zero(self, indices: np.ndarray, min_distances: np.ndarray) -> np.ndarray:
+        indices = np.minimum(indices, len(self.numbers) - 1)
+        return np.where(np.isinf(min_distances), 0, self.numbers[indices])
@@ -0,0 +1,561 @@
+# -*- coding: utf-8 -*-
+"""
+Provides FakeMapdl - a stand-in for a pymapdl Mapdl object, that needs no ANSYS.
+It keeps a simple in-memory model (keypoints, lines, areas, nodes, elements, materials, parameters),
+counts all commands and round-trips (also concurrent ones) and can simulate the latency of each round-trip.
+Use it to test or benchmark pyansystools without a licence - not to check results of ANSYS.
+
+Supported (subset used by pyansystools):
+    pymapdl methods: k, l, bsplin, lccat, al, ksel, lsel, asel, nsel, esel, lesize, amesh, n, et, r,
+        mp, mpdata, mptemp, tb, tbtemp, tbpt, prep7, clear, ... (other commands are only counted)
+    run(), input_strings() including *DIM, *DEL, *DO/*ENDDO, *IF,...,EXIT and parameter assignments
+    get(), get_value(), parameters, queries (inline functions like kx, ndnext, distkp, ...)
+
+@author: Nathanael Jöhrmann
+"""
+import bisect
+import math
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from pyansystools.command_block import format_command
+
+# select commands and their entity label
+_SELECT_COMMANDS = {"KSEL": "KP", "LSEL": "LINE", "ASEL": "AREA", "NSEL": "NODE", "ESEL": "ELEM", "VSEL": "VOLU"}
+# pymapdl methods available as APDL commands
+_COMMANDS = {"k", "l", "bsplin", "lccat", "al", "ksel", "lsel", "asel", "nsel", "esel", "vsel", "lesize",
+             "amesh", "aatt", "mshkey", "mshape", "n", "et", "keyopt", "type", "mat", "real", "r", "rmore",
+             "mp", "mpdata", "mptemp", "tb", "tbtemp", "tbpt", "tbdata", "nsll", "esln", "esurf",
+             "prep7", "slashsolu", "post1", "finish"}
+
+
+class _Array:
+    """APDL array parameter; calling it like in APDL (a(i) or a(i,j)) returns an entry."""
+
+    def __init__(self, rows: int, columns: int = 1):
+        self.data = np.zeros((rows, columns))
+
+    def __call__(self, i, j=1):
+        return float(self.data[int(i) - 1, int(j) - 1])
+
+
+class _Parameters:
+    """Dictionary-like access to APDL parameters (like mapdl.parameters of pymapdl)."""
+
+    def __init__(self, fake_mapdl: "FakeMapdl"):
+        self._fake_mapdl = fake_mapdl
+
+    def __getitem__(self, name: str):
+        self._fake_mapdl._round_trip()
+        value = self._fake_mapdl._parameters[name.lower()]
+        if isinstance(value, _Array):
+            return value.data[:, 0].copy() if value.data.shape[1] == 1 else value.data.copy()
+        return value
+
+    def __setitem__(self, name: str, value) -> None:
+        self._fake_mapdl._round_trip()
+        if np.ndim(value) == 0:
+            self._fake_mapdl._parameters[name.lower()] = float(value)
+            return
+        value = np.asarray(value, dtype=np.float64)
+        array = _Array(len(value), 1 if value.ndim == 1 else value.shape[1])
+        array.data[:] = value.reshape(array.data.shape)
+        self._fake_mapdl._parameters[name.lower()] = array
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._fake_mapdl._parameters
+
+
+class _Queries:
+    """Inline functions as methods (like mapdl.queries of pymapdl); each call is one round-trip."""
+
+    def __init__(self, fake_mapdl: "FakeMapdl"):
+        self._fake_mapdl = fake_mapdl
+
+    def __getattr__(self, name):
+        function = self._fake_mapdl._functions.get(name)
+        if function is None:
+            raise AttributeError(f"FakeMapdl does not support the inline function '{name}'")
+
+        def query(*args):
+            self._fake_mapdl._round_trip()
+            return function(*args)
+
+        return query
+
+
+class _Namespace(dict):
+    """Names inside APDL expressions: parameters and inline functions (case insensitive)."""
+
+    def __init__(self, fake_mapdl: "FakeMapdl"):
+        super().__init__()
+        self._fake_mapdl = fake_mapdl
+
+    def __getitem__(self, name):
+        parameters = self._fake_mapdl._parameters
+        if name in parameters:
+            return parameters[name]
+        return self._fake_mapdl._functions[name]
+
+
+class FakeMapdl:
+    """
+    Stand-in for a pymapdl Mapdl object without ANSYS:
+
+        mapdl = FakeMapdl(latency=0.001)  # each round-trip takes at least 1 ms
+        rectangle = Rectangle(mapdl, 2, 1)
+        rectangle.create()
+        print(mapdl.n_round_trips, mapdl.command_counts["K"])
+
+    New entities are numbered consecutively and are selected (as in ANSYS).
+    The model is simplified: e.g. AMESH only creates nodes along the boundary lines
+    (divisions set with LESIZE) and one element per area; there is no solution (displacements are 0).
+    """
+
+    def __init__(self, latency: float = 0.0):
+        """
+        :param latency: (optional) simulated time in seconds for each round-trip to ANSYS
+        """
+        self.latency = latency
+        self.n_round_trips = 0
+        self.max_concurrent_round_trips = 0  # e.g. to check, that threads don't share one instance
+        self._active_round_trips = 0
+        self._lock = threading.Lock()
+        self.command_counts = Counter()  # number of executed commands by name (e.g. "K", "*DO")
+        self.parameters = _Parameters(self)
+        self.queries = _Queries(self)
+        self._functions = self._create_functions()
+        self._compiled = {}
+        self._reset_model()
+
+    def _reset_model(self) -> None:
+        self.keypoints = {}  # number -> (x, y, z)
+        self.lines = {}  # number -> tuple of keypoints
+        self.areas = {}  # number -> tuple of lines
+        self.nodes = {}  # number -> (x, y, z)
+        self.elements = {}  # number -> tuple of nodes
+        self.element_types = {}  # number -> name
+        self.real_constants = {}  # number -> tuple of values
+        self.line_divisions = {}  # line number -> number of divisions (LESIZE)
+        self.materials = {}  # material number -> {label: value or list of values (one per MPTEMP temperature)}
+        self.material_temperatures = {}  # (material number, label) -> list of temperatures (MPTEMP)
+        self.tables = {}  # (material number, label) -> list of points
+        self.table_temperatures = {}  # (material number, label) -> list of temperatures (TBTEMP)
+        self.displacements = {}  # node number -> (ux, uy, uz)
+        self._parameters = {}
+        self._entities = {"KP": self.keypoints, "LINE": self.lines, "AREA": self.areas,
+                          "NODE": self.nodes, "ELEM": self.elements, "VOLU": {}}
+        self._selected = {entity: set() for entity in self._entities}
+        self._sorted_selection = {}
+        self._table = None
+        self._mp_temperatures = []  # current MPTEMP table
+
+    # ========================================================================
+    # =========================== pymapdl interface ==========================
+    # ========================================================================
+    def __getattr__(self, name):
+        if name not in _COMMANDS:
+            raise AttributeError(f"'{type(self).__name__}' has no attribute '{name}'")
+
+        def command(*args, **kwargs):
+            self._round_trip()
+            return self._execute(format_command(name, args, kwargs))
+
+        return command
+
+    def run(self, command: str) -> str:
+        """
+        Execute one APDL command.
+
+        :return: response (e.g. "PARAMETER __INLINE__ = 3.0" for a parameter assignment)
+        """
+        self._round_trip()
+        result = self._execute(command)
+        if "=" in command and not command.startswith("*"):
+            return f"PARAMETER {command.split('=')[0].strip().upper()} = {result}"
+        return ""
+
+    def input_strings(self, commands: str) -> str:
+        """
+        Execute many APDL commands (one round-trip).
+        """
+        self._round_trip()
+        self._execute_block([line.strip() for line in commands.splitlines() if line.strip()])
+        return ""
+
+    def clear(self) -> None:
+        """
+        Delete the model (like /CLEAR).
+        """
+        self._round_trip()
+        self._execute("/CLEAR")
+
+    def get(self, par: str = "__tmpvar__", entity: str = "", entnum="", item1: str = "", it1num="", *args) -> float:
+        """
+        Like *GET: stores the value in the parameter par and returns it.
+        """
+        self._round_trip()
+        value = self._get(entity, entnum, item1, it1num)
+        self._parameters[par.lower()] = value
+        return value
+
+    def get_value(self, entity: str = "", entnum="", item1: str = "", it1num="", *args) -> float:
+        """
+        Like *GET, but without storing the value in a parameter.
+        Supported: COUNT, NUM MAX/MIN for all entities, LOC for KP and NODE, PARM TYPE.
+        """
+        self._round_trip()
+        return self._get(entity, entnum, item1, it1num)
+
+    def _round_trip(self) -> None:
+        with self._lock:
+            self.n_round_trips += 1
+            self._active_round_trips += 1
+            self.max_concurrent_round_trips = max(self.max_concurrent_round_trips, self._active_round_trips)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self._active_round_trips -= 1
+
+    # ========================================================================
+    # ============================== interpreter =============================
+    # ========================================================================
+    def _execute_block(self, commands: List[str]) -> None:
+        """
+        Execute commands including *DO loops (with *IF,...,EXIT).
+        """
+        loops = []  # (index of *DO, variable, stop, inc)
+        i = 0
+        while i < len(commands):
+            command = commands[i]
+            name = command.split(",")[0].upper()
+            if name == "*DO":
+                self.command_counts[name] += 1
+                _, variable, start, stop, *inc = command.split(",")
+                inc = self._number(inc[0]) if inc and inc[0] else 1
+                self._parameters[variable.lower()] = self._number(start)
+                if (self._number(stop) - self._number(start)) * inc < 0:
+                    i = self._find_enddo(commands, i) + 1
+                    continue
+                loops.append((i, variable.lower(), self._number(stop), inc))
+            elif name == "*ENDDO":
+                start_index, variable, stop, inc = loops[-1]
+                value = self._parameters[variable] + inc
+                if (stop - value) * inc >= 0:
+                    self._parameters[variable] = value
+                    i = start_index + 1
+                    continue
+                loops.pop()
+            elif name == "*IF" and command.upper().endswith(",EXIT"):
+                self.command_counts[name] += 1
+                if self._condition(*command.split(",")[1:4]):
+                    i = self._find_enddo(commands, loops.pop()[0]) + 1
+                    continue
+            else:
+                self._execute(command)
+            i += 1
+
+    @staticmethod
+    def _find_enddo(commands: List[str], do_index: int) -> int:
+        depth = 0
+        for i in range(do_index, len(commands)):
+            name = commands[i].split(",")[0].upper()
+            if name == "*DO":
+                depth += 1
+            elif name == "*ENDDO":
+                depth -= 1
+                if depth == 0:
+                    return i
+        raise ValueError("*DO without *ENDDO")
+
+    def _condition(self, value_1: str, operator: str, value_2: str) -> bool:
+        value_1, value_2 = self._number(value_1), self._number(value_2)
+        return {"EQ": value_1 == value_2, "NE": value_1 != value_2, "LT": value_1 < value_2,
+                "GT": value_1 > value_2, "LE": value_1 <= value_2, "GE": value_1 >= value_2}[operator.upper()]
+
+    def _execute(self, command: str):
+        """
+        Execute one APDL command (without *DO loops).
+
+        :return: result of the command (e.g. number of a created entity or value of an assignment)
+        """
+        if "=" in command and not command.startswith("*"):
+            self.command_counts["="] += 1
+            return self._assign(*command.split("=", 1))
+        fields = command.split(",")
+        name = fields[0].strip().upper()
+        self.command_counts[name] += 1
+        handler = getattr(self, "_command_" + name.strip("/*").lower(), None)
+        result = None if handler is None else handler(*[field.strip() for field in fields[1:]])
+        if result is not None:
+            self._parameters["_return"] = float(result)
+        return result
+
+    def _assign(self, target: str, expression: str) -> float:
+        value = self._evaluate(expression)
+        target = target.strip().lower()
+        if "(" in target:
+            name, indices = target[:-1].split("(", 1)
+            indices = [int(self._number(index)) - 1 for index in indices.split(",")]
+            self._parameters[name].data[indices[0], indices[1] if len(indices) > 1 else 0] = value
+        else:
+            self._parameters[target] = value
+        return value
+
+    def _evaluate(self, expression: str) -> float:
+        code = self._compiled.get(expression)
+        if code is None:
+            code = self._compiled[expression] = compile(expression.strip().lower(), "<apdl>", "eval")
+        return float(eval(code, {"__builtins__": {}}, _Namespace(self)))
+
+    def _number(self, field: str) -> Optional[float]:
+        """
+        Value of a numeric field (number, parameter or expression); None for empty fields.
+        """
+        if field == "":
+            return None
+        try:
+            return float(field)
+        except ValueError:
+            return self._evaluate(field)
+
+    def _field(self, field: str):
+        """
+        Value of a numeric field like _number(); the field itself, if it refers to an undefined parameter.
+        """
+        try:
+            return self._number(field)
+        except NameError:
+            return field
+
+    def _get(self, entity: str, entnum, item1: str, it1num) -> float:
+        entity, item1, it1num = entity.upper(), item1.upper(), str(it1num).upper()
+        if entity == "PARM" and item1 == "TYPE":
+            value = self._parameters.get(str(entnum).lower())
+            return -1.0 if value is None else float(isinstance(value, _Array))
+        if entity == "RCON":
+            numbers = sorted(self.real_constants)
+        else:
+            numbers = self._sorted_selected(entity)
+        if item1 == "COUNT":
+            return float(len(numbers))
+        if item1 == "NUM" and it1num in ("MAX", "MIN"):
+            return float((numbers[-1] if it1num == "MAX" else numbers[0]) if numbers else 0)
+        if item1 == "LOC" and entity in ("KP", "NODE"):
+            return float(self._entities[entity][int(entnum)]["XYZ".index(it1num)])
+        raise NotImplementedError(f"FakeMapdl does not support *GET for {entity}, {item1}, {it1num}")
+
+    # ========================================================================
+    # ============================= model helper =============================
+    # ========================================================================
+    def _add_entity(self, entity: str, number: Optional[float], value) -> int:
+        entities = self._entities[entity]
+        number = int(number) if number else max(entities, default=0) + 1
+        entities[number] = value
+        self._selected[entity].add(number)
+        self._sorted_selection.pop(entity, None)
+        return number
+
+    def _sorted_selected(self, entity: str) -> List[int]:
+        if entity not in self._sorted_selection:
+            self._sorted_selection[entity] = sorted(self._selected[entity])
+        return self._sorted_selection[entity]
+
+    def _numbers_or_selected(self, entity: str, fields) -> List[int]:
+        """Entity numbers given in fields or all selected entities for "ALL" (or no fields)."""
+        fields = [field for field in fields if field != ""]
+        if not fields or fields[0].upper() == "ALL":
+            return self._sorted_selected(entity)
+        return [int(self._number(field)) for field in fields]
+
+    def _next_selected(self, entity: str, number) -> int:
+        selected = self._sorted_selected(entity)
+        index = bisect.bisect_right(selected, int(number))
+        return selected[index] if index < len(selected) else 0
+
+    def _status(self, entity: str, number) -> int:
+        number = int(number)
+        if number not in self._entities[entity]:
+            return 0
+        return 1 if number in self._selected[entity] else -1
+
+    def _nearest(self, entity: str, x, y, z) -> int:
+        selected = self._sorted_selected(entity)
+        if not selected:
+            return 0
+        coordinates = np.array([self._entities[entity][number] for number in selected])
+        distances = np.sum((coordinates - [x, y, z]) ** 2, axis=1)
+        return selected[int(np.argmin(distances))]
+
+    def _line_point(self, line, fraction) -> np.ndarray:
+        keypoints = self.lines[int(line)]
+        start, stop = np.array(self.keypoints[keypoints[0]]), np.array(self.keypoints[keypoints[-1]])
+        return start + float(fraction) * (stop - start)
+
+    def _centroid(self, element) -> np.ndarray:
+        return np.mean([self.nodes[node] for node in self.elements[int(element)]], axis=0)
+
+    def _create_functions(self) -> Dict:
+        """Inline functions (and some math functions) available in APDL expressions."""
+        keypoint = lambda k: self.keypoints[int(k)]
+        node = lambda n: self.nodes[int(n)]
+        displacement = lambda n: self.displacements.get(int(n), (0.0, 0.0, 0.0))
+        functions = {
+            "kx": lambda k: keypoint(k)[0], "ky": lambda k: keypoint(k)[1], "kz": lambda k: keypoint(k)[2],
+            "nx": lambda n: node(n)[0], "ny": lambda n: node(n)[1], "nz": lambda n: node(n)[2],
+            "lx": lambda l, f: self._line_point(l, f)[0], "ly": lambda l, f: self._line_point(l, f)[1],
+            "lz": lambda l, f: self._line_point(l, f)[2],
+            "centrx": lambda e: self._centroid(e)[0], "centry": lambda e: self._centroid(e)[1],
+            "centrz": lambda e: self._centroid(e)[2],
+            "ux": lambda n: displacement(n)[0], "uy": lambda n: displacement(n)[1],
+            "uz": lambda n: displacement(n)[2],
+            "distkp": lambda k1, k2: math.dist(keypoint(k1), keypoint(k2)),
+            "distnd": lambda n1, n2: math.dist(node(n1), node(n2)),
+            "kp": lambda x, y, z: self._nearest("KP", x, y, z),
+            "node": lambda x, y, z: self._nearest("NODE", x, y, z),
+            "abs": abs, "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
+            "exp": math.exp, "log": math.log, "nint": round,
+        }
+        for entity, next_name, select_name in [("NODE", "ndnext", "nsel"), ("ELEM", "elnext", "esel"),
+                                               ("KP", "kpnext", "ksel"), ("LINE", "lsnext", "lsel"),
+                                               ("AREA", "arnext", "asel"), ("VOLU", "vlnext", "vsel")]:
+            functions[next_name] = lambda number, entity=entity: self._next_selected(entity, number)
+            functions[select_name] = lambda number, entity=entity: self._status(entity, number)
+        return functions
+
+    # ========================================================================
+    # =============================== commands ===============================
+    # ========================================================================
+    def _command_clear(self, *fields) -> None:
+        self._reset_model()
+
+    def _command_dim(self, name, _type="ARRAY", rows="1", columns="1", *fields) -> None:
+        self._parameters[name.lower()] = _Array(int(self._number(rows)), int(self._number(columns or "1")))
+
+    def _command_del(self, name, *fields) -> None:
+        self._parameters.pop(name.lower(), None)
+
+    def _command_k(self, npt="", x="", y="", z="", *fields) -> int:
+        coordinates = tuple(self._number(value) or 0.0 for value in (x, y, z))
+        return self._add_entity("KP", self._number(npt), coordinates)
+
+    def _command_l(self, p1, p2, *fields) -> int:
+        return self._add_entity("LINE", None, (int(self._number(p1)), int(self._number(p2))))
+
+    def _command_bsplin(self, *fields) -> int:
+        keypoints = tuple(int(self._number(field)) for field in fields[:6] if field != "")
+        return self._add_entity("LINE", None, keypoints)
+
+    def _command_lccat(self, *fields) -> int:
+        lines = self._numbers_or_selected("LINE", fields)
+        keypoints = (self.lines[lines[0]][0], self.lines[lines[-1]][-1])
+        return self._add_entity("LINE", None, keypoints)
+
+    def _command_al(self, *fields) -> int:
+        return self._add_entity("AREA", None, tuple(self._numbers_or_selected("LINE", fields)))
+
+    def _command_n(self, node="", x="", y="", z="", *fields) -> int:
+        coordinates = tuple(self._number(value) or 0.0 for value in (x, y, z))
+        return self._add_entity("NODE", self._number(node), coordinates)
+
+    def _select(self, entity: str, type_="", item="", comp="", vmin="", vmax="", vinc="", *fields) -> None:
+        type_ = (type_ or "S").upper()
+        selected, existing = self._selected[entity], set(self._entities[entity])
+        if type_ == "ALL":
+            selected.update(existing)
+        elif type_ == "NONE":
+            selected.clear()
+        elif type_ == "INVE":
+            selected.symmetric_difference_update(existing)
+        else:
+            if item.upper() not in ("", entity):
+                raise NotImplementedError(f"FakeMapdl only selects by number (not by {item})")
+            vmin = int(self._number(vmin))
+            vmax = vmin if vmax == "" else int(self._number(vmax))
+            vinc = 1 if vinc == "" else int(self._number(vinc))
+            values = existing.intersection(range(vmin, vmax + 1, vinc))
+            if type_ == "S":
+                selected.clear()
+                selected.update(values)
+            elif type_ == "R":
+                selected.intersection_update(values)
+            elif type_ == "A":
+                selected.update(values)
+            elif type_ == "U":
+                selected.difference_update(values)
+        self._sorted_selection.pop(entity, None)
+
+    def _command_ksel(self, *fields) -> None:
+        self._select("KP", *fields)
+
+    def _command_lsel(self, *fields) -> None:
+        self._select("LINE", *fields)
+
+    def _command_asel(self, *fields) -> None:
+        self._select("AREA", *fields)
+
+    def _command_nsel(self, *fields) -> None:
+        self._select("NODE", *fields)
+
+    def _command_esel(self, *fields) -> None:
+        self._select("ELEM", *fields)
+
+    def _command_lesize(self, nl1, size="", angsiz="", ndiv="", *fields) -> None:
+        for line in self._numbers_or_selected("LINE", [nl1]):
+            if ndiv != "":
+                self.line_divisions[line] = int(self._number(ndiv))
+
+    def _command_amesh(self, na1="", *fields) -> None:
+        for area in self._numbers_or_selected("AREA", [na1]):
+            area_nodes = []
+            for line in self.areas[area]:
+                ndiv = self.line_divisions.get(line, 1)
+                for i in range(ndiv):
+                    area_nodes.append(self._add_entity("NODE", None, tuple(self._line_point(line, i / ndiv))))
+            self._add_entity("ELEM", None, tuple(area_nodes))
+
+    def _command_et(self, itype="", ename="", *fields) -> int:
+        number = self._number(itype) or max(self.element_types, default=0) + 1
+        self.element_types[int(number)] = ename
+        return int(number)
+
+    def _command_r(self, nset, *values) -> None:
+        self.real_constants[int(self._number(nset))] = values
+
+    def _command_mp(self, lab, mat, c0="", *fields) -> None:
+        self.materials.setdefault(int(self._number(mat)), {})[lab.upper()] = self._number(c0)
+
+    def _command_mptemp(self, sloc="", *temperatures) -> None:
+        if sloc == "":  # MPTEMP without arguments erases the table
+            self._mp_temperatures = []
+            return
+        start = int(self._number(sloc)) - 1
+        temperatures = [self._field(temperature) for temperature in temperatures if temperature != ""]
+        self._mp_temperatures[start:start + len(temperatures)] = temperatures
+
+    def _command_mpdata(self, lab, mat, sloc="", *values) -> None:
+        key = (int(self._number(mat)), lab.upper())
+        material = self.materials.setdefault(key[0], {})
+        start = int(self._number(sloc)) - 1 if sloc != "" else 0
+        previous = material.get(key[1], []) if start else []
+        data = (previous if isinstance(previous, list) else [previous])[:start]
+        data += [self._number(value) for value in values if value != ""]
+        material[key[1]] = data[0] if len(data) == 1 else data
+        self.material_temperatures[key] = self._mp_temperatures[:len(data)]
+
+    def _command_tb(self, lab, mat, *fields) -> None:
+        self._table = (int(self._number(mat)), lab.upper())
+        self.tables[self._table] = []
+        self.table_temperatures[self._table] = []
+
+    def _command_tbtemp(self, temp="", *fields) -> None:
+        self.table_temperatures[self._table].append(self._number(temp))
+
+    def _command_tbpt(self, oper="", x="", y="", *fields) -> None:
+        self.tables[self._table].append((self._number(x), self._number(y)))
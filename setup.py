@@ -11,6 +11,7 @@ setup(
     description='Provides classes to simplify the work with ANSYS using the python module ansys-mapdl-core.',
     long_description='Provides classes to simplify the work with ANSYS using the python module ansys-mapdl-core.',
     install_requires=[
+        'numpy',
     ],
     python_requires='>=3.9',
     classifiers=[
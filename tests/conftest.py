@@ -5,6 +5,8 @@ import pytest
 # import pyansys
 from ansys.mapdl.core import launch_mapdl
 
+from pyansystools.testing import FakeMapdl
+
 
 @pytest.fixture(scope='session')
 def ansys(tmp_path_factory):
@@ -19,4 +21,9 @@ def ansys(tmp_path_factory):
 @pytest.fixture(scope='class')
 def mapdl(ansys):
     yield ansys
-    ansys.clear()
\ No newline at end of file
+    ansys.clear()
+
+
+@pytest.fixture(scope='function')
+def fake_mapdl():
+    return FakeMapdl()
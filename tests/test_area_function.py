@@ -0,0 +1,83 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import gc
+import math
+import weakref
+
+import numpy as np
+import pytest
+
+from pyansystools.area_function import AreaFunction
+
+coefficients = (24.5, 1200, 50, -10, 3, 0.5)
+
+
+def area_function_reference(i):
+    """Scalar implementation as used by Tip before."""
+    def use_area_function(i):
+        ac = coefficients
+        return ((ac[0] * i ** 2 + ac[1] * i + ac[2] * i ** 0.5 + ac[3] * i ** 0.25
+                 + ac[4] * i ** 0.125 + ac[5] * i ** 0.0625) / math.pi) ** 0.5
+
+    if i >= 31:
+        return use_area_function(i)
+    m = use_area_function(31) / (31 ** 0.5)
+    return m * i ** 0.5
+
+
+class TestAreaFunction:
+    def test_scalar(self):
+        area_function = AreaFunction(coefficients)
+        for depth in [0, 1, 30.9, 31, 100, 1000]:
+            assert area_function(depth) == pytest.approx(area_function_reference(depth))
+        assert isinstance(area_function(5), float)
+
+    def test_array(self):
+        area_function = AreaFunction(coefficients)
+        depths = np.linspace(0, 1000, 101)
+        expected = [area_function_reference(depth) for depth in depths]
+        assert np.allclose(area_function(depths), expected)
+
+    def test_blending_constant(self):
+        area_function = AreaFunction(coefficients)
+        assert area_function.m * 31 ** 0.5 == pytest.approx(area_function(31))
+
+    def test_negative_depth(self):
+        with pytest.raises(AssertionError):
+            AreaFunction(coefficients)(-1)
+
+    def test_cached(self):
+        assert AreaFunction.from_coefficients(coefficients) is AreaFunction.from_coefficients(list(coefficients))
+
+    def test_profile(self):
+        area_function = AreaFunction.from_coefficients(coefficients)
+        profile = area_function.profile(4, 1000)
+        assert np.allclose(profile[:, 1], [1000, 562.5, 250, 62.5])
+        assert np.allclose(profile[:, 0], area_function(profile[:, 1]))
+        assert area_function.profile(4, 1000) is profile
+        assert not profile.flags.writeable
+
+    def test_adaptive_profile(self):
+        area_function = AreaFunction.from_coefficients(coefficients)
+        profile = area_function.adaptive_profile(1000, 0.05)
+        assert profile[0, 1] == 1000 and 31 in profile[:, 1]
+        # each point of the curve is within tolerance of the polyline through the profile
+        depths = np.linspace(0, 1000, 20001)
+        curve = np.column_stack((area_function(depths), depths))
+        points = np.vstack((profile, [0, 0]))  # apex is not part of the profile
+        start, direction = points[:-1], np.diff(points, axis=0)
+        t = np.einsum("ijk,jk->ij", curve[:, None] - start, direction) / np.einsum("jk,jk->j", direction, direction)
+        nearest = start + np.clip(t, 0, 1)[..., None] * direction
+        distance = np.linalg.norm(curve[:, None] - nearest, axis=2).min(axis=1)
+        assert distance.max() <= 0.05
+        assert area_function.adaptive_profile(1000, 0.05) is profile
+
+    def test_profile_cache_releases_instance(self):
+        area_function = AreaFunction(coefficients)
+        area_function.profile(4, 1000)
+        area_function.adaptive_profile(1000, 1)
+        reference = weakref.ref(area_function)
+        del area_function
+        gc.collect()
+        assert reference() is None
@@ -0,0 +1,63 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import asyncio
+
+import pytest
+
+from pyansystools.async_inline import AsyncInline
+from pyansystools.testing import FakeMapdl
+
+
+def _fake_mapdl_with_points(n_points: int, latency: float = 0.0) -> FakeMapdl:
+    """FakeMapdl with keypoints and nodes 1 ... n_points at (i, i, i)."""
+    fake_mapdl = FakeMapdl()
+    for i in range(1, n_points + 1):
+        fake_mapdl.k(i, i, i, i)
+        fake_mapdl.n(i, i, i, i)
+    fake_mapdl.n_round_trips = 0
+    fake_mapdl.latency = latency
+    return fake_mapdl
+
+
+def test_query():
+    async def main():
+        async with AsyncInline(_fake_mapdl_with_points(3)) as async_inline:
+            return await async_inline.kx(3)
+
+    with pytest.deprecated_call():
+        assert asyncio.run(main()) == 3
+
+
+def test_map():
+    async def main():
+        async with AsyncInline(_fake_mapdl_with_points(3)) as async_inline:
+            return await async_inline.map("kxyz", [1, 2, 3])
+
+    with pytest.deprecated_call():
+        result = asyncio.run(main())
+    assert [point.get_list() for point in result] == [[1, 1, 1], [2, 2, 2], [3, 3, 3]]
+
+
+def test_pool():
+    pool = [_fake_mapdl_with_points(12, latency=0.01) for _ in range(3)]
+
+    async def main():
+        async with AsyncInline(pool) as async_inline:
+            return await async_inline.map("nx", range(1, 13))
+
+    with pytest.deprecated_call():
+        assert asyncio.run(main()) == list(range(1, 13))
+    assert sum(mapdl.n_round_trips for mapdl in pool) == 12
+    assert all(mapdl.n_round_trips > 0 for mapdl in pool)  # queries are distributed over all instances
+    # but only one query per instance at a time
+    assert all(mapdl.max_concurrent_round_trips == 1 for mapdl in pool)
+
+
+def test_excluded_methods(fake_mapdl):
+    async_inline = AsyncInline(fake_mapdl)
+    with pytest.raises(AttributeError):
+        async_inline.batch()
+    with pytest.raises(AttributeError):
+        async_inline.iter_selected_nodes()
+    async_inline.close()
@@ -0,0 +1,102 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import numpy as np
+import pytest
+
+from pyansystools.command_block import CommandBlock, CommandRecorder, ResultReference, resolve_references
+
+
+class TestCommandBlock:
+    def test_add_result(self):
+        block = CommandBlock()
+        assert block.add_result("kx(1)") == "__block__(1)"
+        assert block.add_result("ky(1)") == "__block__(2)"
+        assert block.n_results == 2
+
+    def test_reserve_results(self):
+        block = CommandBlock()
+        block.add_result("kx(1)")
+        assert block.reserve_results(3) == 2
+        assert block.n_results == 4
+
+    def test_get_input_string(self):
+        block = CommandBlock()
+        block.add("/PREP7")
+        block.add_result("kx(1)")
+        assert block.get_input_string().splitlines() == ["*DEL,__block__,,NOPR",
+                                                         "*DIM,__block__,ARRAY,1",
+                                                         "/PREP7",
+                                                         "__block__(1)=kx(1)"]
+
+    def test_get_input_string_without_results(self):
+        block = CommandBlock()
+        block.add("/PREP7")
+        assert block.get_input_string() == "/PREP7"
+
+    def test_submit(self, fake_mapdl):
+        fake_mapdl.k(1, 1, 0)
+        fake_mapdl.k(2, 2, 0)
+        fake_mapdl.n_round_trips = 0
+        block = CommandBlock()
+        block.add_result("kx(1)")
+        block.add_result("kx(2)")
+        result = block.submit(fake_mapdl)
+        assert fake_mapdl.n_round_trips == 2  # one submission + one transfer of the results
+        assert result.shape == (2,)
+        assert list(result) == [1, 2]
+
+    def test_submit_without_results(self, fake_mapdl):
+        block = CommandBlock()
+        block.add("/PREP7")
+        assert len(block.submit(fake_mapdl)) == 0
+        assert fake_mapdl.n_round_trips == 1
+        assert fake_mapdl.command_counts == {"/PREP7": 1}
+
+    def test_columns(self, fake_mapdl):
+        block = CommandBlock(columns=2)
+        block.reserve_results(3)
+        assert block.reference("i", 2) == "__block__(i,2)"
+        assert "*DIM,__block__,ARRAY,3,2" in block.get_input_string()
+        assert block.submit(fake_mapdl).shape == (3, 2)
+
+
+class TestCommandRecorder:
+    def test_record(self):
+        recorder = CommandRecorder()
+        recorder.prep7()
+        recorder.lsel("A", "LINE", "", 3)
+        recorder.lesize(2, "", "", 4, None)
+        assert recorder.block.commands == ["/PREP7", "LSEL,A,LINE,,3", "LESIZE,2,,,4"]
+
+    def test_record_keyword_arguments(self):
+        recorder = CommandRecorder()
+        recorder.lsel("S", "LINE", vmin=3)
+        recorder.lesize(2, ndiv=4)
+        assert recorder.block.commands == ["LSEL,S,LINE,,3", "LESIZE,2,,,4"]
+        with pytest.raises(TypeError):
+            recorder.lsel("S", "LINE", not_a_field=3)
+
+    def test_creating_commands(self):
+        recorder = CommandRecorder()
+        keypoint_1 = recorder.k("", 0, 0.5)
+        keypoint_2 = recorder.k("", 1, 0)
+        line = recorder.l(keypoint_1, keypoint_2)
+        assert isinstance(line, ResultReference)
+        assert line.index == 3
+        assert recorder.block.commands == ["K,,0,0.5", "__block__(1)=_RETURN",
+                                           "K,,1,0", "__block__(2)=_RETURN",
+                                           "L,__block__(1),__block__(2)", "__block__(3)=_RETURN"]
+
+    def test_queries_not_available(self):
+        recorder = CommandRecorder()
+        with pytest.raises(AttributeError):
+            recorder.get("KP", 1, "LOC", "X")
+
+    def test_resolve_references(self):
+        recorder = CommandRecorder()
+        keypoints = [recorder.k("", 0, 0), recorder.k("", 1, 0)]
+        line = recorder.l(*keypoints)
+        results = np.array([5.0, 6.0, 2.0])
+        assert resolve_references([keypoints, (line, "A")], results) == [[5, 6], (2, "A")]
+        assert resolve_references(None, results) is None
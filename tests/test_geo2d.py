@@ -4,8 +4,13 @@ Created on Tue Sep 10 15:03:12 2019
 
 @author: Nathanael Jöhrmann
 """
+import copy
+import math
+
+import numpy as np
 import pytest
 import pyansystools.geo2d as geo2d
+from pyansystools.command_block import CommandRecorder
 
 
 flag_create_plots = True
@@ -19,6 +24,10 @@ roi_width = 2
 roi_height = 1
 
 
+def _counts(fake_mapdl) -> dict:
+    return {"KP": len(fake_mapdl.keypoints), "LINE": len(fake_mapdl.lines), "AREA": len(fake_mapdl.areas)}
+
+
 @pytest.fixture(scope='class')
 def do_plot(ansys):
     yield
@@ -82,6 +91,68 @@ class TestPoint:
         my_list = point.get_list()
         assert my_list == [1, 2, 3]
 
+    def test_slots(self):
+        with pytest.raises(AttributeError):
+            geo2d.Point2D(1, 2).w = 3
+
+    def test_copy(self):
+        point = geo2d.Point2D(1, 2)
+        point_copy = copy.deepcopy(point)
+        point_copy.shift_by(geo2d.Point2D(1, 1))
+        assert type(point_copy) is geo2d.Point2D
+        assert point == geo2d.Point2D(1, 2)
+        assert point.copy() == point
+
+    def test_frozen(self):
+        point = geo2d.Point2D(1, 2).frozen()
+        assert point == geo2d.Point2D(1, 2)
+        assert hash(point) == hash(geo2d.FrozenPoint2D(1, 2))
+        assert len({point, geo2d.FrozenPoint2D(1, 2), geo2d.FrozenPoint2D(2, 1)}) == 2
+        with pytest.raises(AttributeError):
+            point.x = 3
+        with pytest.raises(AttributeError):
+            point.rotate_radians(1)
+
+    def test_unhashable(self):
+        with pytest.raises(TypeError):
+            hash(geo2d.Point(1, 2, 3))
+
+
+class TestPointArray:
+    def test_list_like(self):
+        points = geo2d.PointArray([(0, 0), geo2d.Point2D(1, 2)])
+        points.append((3, 4))
+        assert len(points) == 3
+        assert points[1] == geo2d.Point2D(1, 2)
+        assert points[-1] == geo2d.Point2D(3, 4)
+        assert [point.get_list() for point in points] == [[0, 0], [1, 2], [3, 4]]
+        points.clear()
+        assert len(points) == 0
+
+    def test_as_array(self):
+        points = geo2d.PointArray([(0, 1), (2, 3)])
+        assert points.as_array().shape == (2, 2)
+        assert points.x.tolist() == [0, 2]
+        assert points.y.tolist() == [1, 3]
+
+    def test_copy(self):
+        points = geo2d.PointArray([(0, 1)])
+        points_copy = points.copy()
+        points_copy.shift((1, 1))
+        assert points[0] == geo2d.Point2D(0, 1)
+
+    def test_rotate(self):
+        points = geo2d.PointArray([(1, 2), (-3, 0.5)])
+        points.rotate(0.3)
+        for point, expected in zip(points, [geo2d.Point2D(1, 2), geo2d.Point2D(-3, 0.5)]):
+            expected.rotate_radians(0.3)
+            assert math.isclose(point.x, expected.x) and math.isclose(point.y, expected.y)
+
+    def test_transform(self):
+        points = geo2d.PointArray([(1, 0)])
+        points.transform(math.pi / 2, geo2d.Point2D(1, 1))
+        assert np.allclose(points.as_array(), [[1, 2]])
+
 
 class TestGeometry2D:
     def test_abstract_class(self, mapdl):
@@ -96,7 +167,142 @@ class TestGeometry2D:
         assert True
 
 
+class TestCompiled:
+    def test_rectangle(self, fake_mapdl):
+        rectangle = geo2d.Rectangle(fake_mapdl, 2, 1)
+        rectangle.create_compiled()
+        assert fake_mapdl.n_round_trips == 2  # one submission + one transfer of the results
+        assert rectangle.keypoints == [1, 2, 3, 4]
+        assert rectangle.lines == [1, 2, 3, 4]
+        assert rectangle.areas == [1]
+        assert (rectangle.line_left, rectangle.line_bottom) == (1, 4)
+
+    def test_film_with_roi(self, fake_mapdl):
+        film = geo2d.FilmWithROI(fake_mapdl, film_width, film_height, roi_width)
+        film.create_compiled()
+        assert fake_mapdl.n_round_trips == 2  # one submission + one transfer of the results
+        assert film.lines == [1, 2, 3, 4, 5, 6, 1, 7]
+        assert (film.film_area, film.roi_area) == (1, 2)
+        assert film.roi_line_right == film.film_line_roi_vertical == 1
+
+    def test_rectangle_ansys(self, mapdl):
+        rectangle = geo2d.Rectangle(mapdl, 2, 1)
+        rectangle.create_compiled()
+        assert mapdl.get_value("LINE", 0, "COUNT") == 4
+        assert rectangle.areas == [1]
+
+
+class TestPointHash:
+    def test_find(self):
+        point_hash = geo2d._PointHash(tol=0.1)
+        point_hash.add(1.0, 2.0, "a")
+        point_hash.add(1.05, 2.0, "b")
+        assert point_hash.find(0.95, 2.09) == "a"
+        assert point_hash.find(1.14, 2.0) == "b"
+        assert point_hash.find(1.0, 2.2) is None
+        assert point_hash.find(-1.0, 2.0, default=0) == 0
+        assert len(point_hash) == 2
+
+    def test_cell_border(self):
+        point_hash = geo2d._PointHash()
+        point_hash.add(0.0, 0.0, 1)
+        assert point_hash.find(-1e-7, 1e-7) == 1
+
+    @pytest.mark.parametrize("tol", [0, -1e-6])
+    def test_invalid_tol(self, tol):
+        with pytest.raises(ValueError):
+            geo2d._PointHash(tol)
+        with pytest.raises(ValueError):
+            geo2d.KeypointRegistry(tol)
+
+
+class TestKeypointRegistry:
+    def test_grid(self, fake_mapdl):
+        registry = geo2d.KeypointRegistry()
+        with geo2d.GeometryBatch(fake_mapdl) as batch:
+            cells = [batch.add(geo2d.Rectangle(fake_mapdl, 1, 1, destination=geo2d.Point2D(i, j)), registry)
+                     for i in range(3) for j in range(3)]
+        assert _counts(fake_mapdl) == {"KP": 16, "LINE": 24, "AREA": 9}
+        assert (registry.n_keypoints, registry.n_lines) == (16, 24)
+        assert cells[0].line_top == cells[1].line_bottom  # shared line
+        assert cells[0].line_right == cells[3].line_left
+
+    def test_register(self, fake_mapdl):
+        registry = geo2d.KeypointRegistry()
+        subs = geo2d.Rectangle(fake_mapdl, 2, 1)
+        subs.create_compiled()
+        registry.register(subs)
+        with geo2d.GeometryBatch(fake_mapdl) as batch:
+            film = batch.add(geo2d.Rectangle(fake_mapdl, 2, 1, destination=geo2d.Point2D(0, 1)), registry)
+        assert _counts(fake_mapdl) == {"KP": 6, "LINE": 7, "AREA": 2}
+        assert film.keypoints == [2, 5, 6, 3]
+        assert registry.find_line(3, 2) == subs.line_top == film.line_bottom == 2
+
+    def test_without_registry(self, fake_mapdl):  # merging with a geometry shares keypoints only
+        with geo2d.GeometryBatch(fake_mapdl) as batch:
+            subs = batch.add(geo2d.Rectangle(fake_mapdl, 2, 1))
+            batch.add(geo2d.Rectangle(fake_mapdl, 2, 1, destination=geo2d.Point2D(0, 1)), subs)
+        assert _counts(fake_mapdl) == {"KP": 6, "LINE": 8, "AREA": 2}
+
+
+class TestGeometryBatch:
+    def test_create(self, fake_mapdl):
+        with geo2d.GeometryBatch(fake_mapdl) as batch:
+            isogon = batch.add(geo2d.Isogon(fake_mapdl, 10, 6))
+            rectangles = [batch.add(geo2d.Rectangle(fake_mapdl, 1, 1, destination=point)) for point in isogon.points]
+        assert fake_mapdl.n_round_trips == 2  # one submission + one transfer of the results
+        assert len(batch) == 7
+        assert isogon.lines == [1, 2, 3, 4, 5, 6]
+        assert rectangles[0].keypoints == [7, 8, 9, 10]
+        assert rectangles[-1].lines == [27, 28, 29, 30]
+        assert [rectangle.areas[0] for rectangle in rectangles] == [2, 3, 4, 5, 6, 7]
+
+    def test_merged(self, fake_mapdl):
+        with geo2d.GeometryBatch(fake_mapdl) as batch:
+            subs = batch.add(geo2d.Rectangle(fake_mapdl, subs_width, subs_height, rotation_angle))
+            point = geo2d.Point2D(subs.points[1].x, subs.points[1].y)
+            film = batch.add(geo2d.Rectangle(fake_mapdl, subs_width, subs_height, rotation_angle, point), subs)
+        assert _counts(fake_mapdl)["KP"] == 6
+        assert film.keypoints == [2, 5, 6, 3]
+
+    def test_no_submission_on_exception(self, fake_mapdl):
+        with pytest.raises(ValueError):
+            with geo2d.GeometryBatch(fake_mapdl) as batch:
+                batch.add(geo2d.Rectangle(fake_mapdl, 1, 1))
+                raise ValueError
+        assert fake_mapdl.n_round_trips == 0
+
+    def test_create_ansys(self, mapdl):
+        batch = geo2d.GeometryBatch(mapdl)
+        for i in range(3):
+            batch.add(geo2d.Rectangle(mapdl, 1, 1, destination=geo2d.Point2D(2 * i, 0)))
+        batch.create()
+        assert mapdl.get_value("AREA", 0, "COUNT") == 3
+        assert [rectangle.areas for rectangle in batch] == [[1], [2], [3]]
+
+
+class TestSelection:
+    def test_select_lines(self):
+        recorder = CommandRecorder()
+        isogon = geo2d.Isogon(recorder, 1, 100)
+        isogon.lines = list(range(1, 101))
+        isogon.select_lines()
+        assert recorder.block.commands == ["LSEL,S,LINE,,1,100,1"]
+
+    def test_set_material_number(self):
+        recorder = CommandRecorder()
+        rectangle = geo2d.Rectangle(recorder, 1, 1)
+        rectangle.areas = [2]
+        rectangle.set_material_number(3)
+        assert recorder.block.commands == ["/PREP7", "ASEL,S,AREA,,2,2,1", "AATT,3"]
+
+
 class TestRectangle:
+    def test_points(self):
+        rectangle = geo2d.Rectangle(None, 2, 1, math.pi / 2, geo2d.Point2D(1, 1))
+        assert np.allclose(rectangle.points.as_array(), [[1, 1], [0, 1], [0, 3], [1, 3]])
+        assert np.allclose(rectangle._raw_points.as_array(), [[0, 0], [0, 1], [2, 1], [2, 0]])
+
     def test_mesh_custom(self, mapdl):
         rectangle = geo2d.Rectangle(mapdl, 2, 2)
         rectangle.create()
@@ -105,6 +311,12 @@ class TestRectangle:
         assert True
 
 
+class TestIsogon:
+    def test_points(self):
+        isogon = geo2d.Isogon(None, 2, 4)
+        assert np.allclose(isogon.points.as_array(), [[-2, 0], [0, 2], [2, 0], [0, -2]])
+
+
 class TestCircle:
     def test_lines(self, mapdl, circle):
         assert len(circle.lines) == 80
@@ -145,6 +357,55 @@ class TestFilmWithRoi:
         assert True
 
 
+class TestTipPoints:
+    def test_points(self):
+        tip = geo2d.Tip(None, [24.5, 0, 0, 0, 0, 0])
+        depths = [1000 * (i / 21) ** 2 for i in range(21, 0, -1)]
+        m = (24.5 * 31 ** 2 / math.pi) ** 0.5 / 31 ** 0.5
+        radii = [(24.5 * y ** 2 / math.pi) ** 0.5 if y >= 31 else m * y ** 0.5 for y in depths]
+        assert np.allclose(tip.points.as_array()[3:], np.column_stack((radii, depths)))
+
+    def test_adaptive(self):
+        coefficients = [24.5, 1200, 50, -10, 3, 0.5]
+        coarse = geo2d.Tip(None, coefficients, tolerance=1)
+        fine = geo2d.Tip(None, coefficients, tolerance=0.01)
+        assert 3 < len(coarse.points) < len(fine.points)
+        assert len(fine.points) < 3 + 100
+        apex = fine.points.as_array()[-5:]  # densest near the apex
+        assert np.all(np.diff(apex[:, 1]) < 0) and apex[-1, 1] < 0.1
+
+    def test_splines_batched(self, fake_mapdl):
+        tip = geo2d.Tip(fake_mapdl, [24.5, 1200, 50, -10, 3, 0.5], tolerance=0.1)
+        tip.create()
+        n_points = len(tip.points) - 3
+        n_splines = len(range(3, len(tip.keypoints) - 1, 5)) + 1
+        assert fake_mapdl.command_counts["*DIM"] == 1  # all splines in one block
+        assert tip.lines_contact == list(range(4, 4 + n_splines))
+        assert n_splines == math.ceil((n_points - 1) / 5) + 1
+
+    def test_n_splines(self):
+        tip = geo2d.Tip(None, [24.5, 0, 0, 0, 0, 0], n_splines=200)
+        assert len(tip.points) == 3 + 201
+
+    def test_circle_tip_below_top(self):
+        tip = geo2d._Tip(None, [24.5, 0, 0, 0, 0, 0], radius=30)
+        points = tip.points.as_array()
+        assert not np.isnan(points).any()
+        assert np.all(points[3:, 1] < 30)
+
+    @pytest.mark.parametrize("n_splines, radius", [(40, 30), (70, 30), (30, 30)])
+    def test_circle_tip_n_splines_too_large(self, n_splines, radius):
+        with pytest.raises(ValueError):
+            geo2d._Tip(None, [24.5, 0, 0, 0, 0, 0], radius=radius, n_splines=n_splines)
+
+    @pytest.mark.parametrize("n_splines", [-1, 0, 4])
+    def test_n_splines_too_small(self, n_splines):
+        with pytest.raises(ValueError):
+            geo2d.Tip(None, [24.5, 0, 0, 0, 0, 0], n_splines=n_splines)
+        with pytest.raises(ValueError):
+            geo2d._Tip(None, [24.5, 0, 0, 0, 0, 0], n_splines=n_splines)
+
+
 class TestTip:
     def test_lines(self, mapdl, tip):
         assert len(tip.lines) == 8
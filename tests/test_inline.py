@@ -3,6 +3,9 @@
 """
 import pytest
 import math
+import warnings
+
+import numpy as np
 
 from pyansystools.inline import Inline
 from pyansystools.inline import Status
@@ -32,8 +35,9 @@ next_ids = ['ZERO',
             'TOOLARGE']
 
 
-@pytest.fixture(scope='session')
+@pytest.fixture(scope='function')
 def inline(ansys):
+    # new instance for each test, because DeprecationWarning is only emitted once per instance
     yield Inline(ansys)
 
 
@@ -310,3 +314,166 @@ class TestInline:
     def test_uxyz(self, inline, setup_data):
         with pytest.deprecated_call():
             assert inline.uxyz(1) == Point(0, 0, 0)
+
+    def test_evaluate_many(self, inline, setup_data):
+        with pytest.deprecated_call():
+            result = inline.evaluate_many(["3", "kx(5)", "ny(4)"])
+        assert list(result) == [3, -1, 1]
+
+    def test_batch(self, inline, setup_data):
+        with pytest.deprecated_call():
+            with inline.batch() as batch:
+                kx = batch.kx(5)
+                kxyz = batch.kxyz(5)
+                status = batch.ksel(0)
+                next_node = batch.ndnext(0)
+        assert kx.value == -1
+        assert kxyz.value == Point(-1, -1, -1)
+        assert status.value == Status.UNDEFINED
+        assert next_node.value == 1
+
+    @pytest.mark.parametrize("name", ["clear_cache", "evaluate_many", "batch", "displacement_field",
+                                      "iter_displacement_field", "selected_numbers", "nx_array"])
+    def test_batch_no_query(self, inline, name):
+        with inline.batch() as batch:
+            with pytest.raises(AttributeError):
+                getattr(batch, name)
+            assert len(batch) == 0
+
+    def test_nxyz_array(self, inline, setup_data):
+        with pytest.deprecated_call():
+            result = inline.nxyz_array([1, 5])
+        assert result.shape == (2, 3)
+        assert result.tolist() == [[0, 0, 0], [0, 1, -1]]
+
+    def test_kx_array(self, inline, setup_data):
+        with pytest.deprecated_call():
+            assert inline.kx_array([1, 2, 5]).tolist() == [0, 1, -1]
+
+    def test_distkp_array(self, inline, setup_data):
+        with pytest.deprecated_call():
+            assert inline.distkp_array(1, [1, 2]).tolist() == [0, 1]
+
+    def test_uxyz_array(self, inline, setup_data):
+        with pytest.deprecated_call():
+            assert inline.uxyz_array([1, 2]).tolist() == [[0, 0, 0], [0, 0, 0]]
+
+    def test_array_empty(self, inline):
+        with pytest.deprecated_call():
+            assert inline.nxyz_array([]).shape == (0, 3)
+
+    def test_displacement_field(self, inline, setup_data, select_all):
+        with pytest.deprecated_call():
+            nodes, displacements = inline.displacement_field()
+        assert nodes.tolist() == [1, 2, 3, 4, 5]
+        assert displacements.shape == (5, 3)
+        assert displacements.dtype == np.float64
+        assert displacements.flags['C_CONTIGUOUS']
+
+    def test_iter_displacement_field(self, inline, setup_data, select_all):
+        with pytest.deprecated_call():
+            chunks = list(inline.iter_displacement_field(chunk_size=2, nodes=[1, 2, 3]))
+        assert [chunk[0].tolist() for chunk in chunks] == [[1, 2], [3]]
+
+    def test_selected_numbers(self, inline, setup_data, select_all):
+        with pytest.deprecated_call():
+            assert inline.selected_numbers("NODE").tolist() == [1, 2, 3, 4, 5]
+
+    def test_iter_selected_keypoints(self, inline, setup_data, select_all):
+        with pytest.deprecated_call():
+            assert list(inline.iter_selected_keypoints(chunk_size=2)) == [1, 2, 3, 4, 5]
+
+    def test_iter_selected_lines(self, inline, setup_data, select_one):
+        with pytest.deprecated_call():
+            assert list(inline.iter_selected_lines()) == [setup_data['l'].selected]
+
+
+class TestInlineResponse:
+    def test_parse(self, fake_mapdl):
+        inline = Inline(fake_mapdl)
+        assert inline._parse_inline_response("PARAMETER __INLINE__ =     3.000000000") == 3
+
+    def test_parse_with_additional_output(self, fake_mapdl):
+        inline = Inline(fake_mapdl)
+        response = "PARAMETER __INLINE__ =    -1.500000000\n *** WARNING ***"
+        assert inline._parse_inline_response(response) == -1.5
+
+    def test_parse_parameter_api(self, fake_mapdl):
+        fake_mapdl.parameters["__INLINE__"] = 4.0
+        assert Inline(fake_mapdl)._parse_inline_response("") == 4
+
+    def test_warn_once(self, fake_mapdl):
+        fake_mapdl.k(1, 5, 0)
+        inline = Inline(fake_mapdl)
+        with pytest.deprecated_call():
+            inline.kx(1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            inline.kx(1)
+
+
+class TestInlineCache:
+    @pytest.fixture(scope='function')
+    def keypoints(self, fake_mapdl):
+        fake_mapdl.k(1, 0, 0)
+        fake_mapdl.k(2, 3, 4)
+        fake_mapdl.n_round_trips = 0
+
+    def test_cache(self, fake_mapdl, keypoints):
+        inline = Inline(fake_mapdl, cache_size=10)
+        with pytest.deprecated_call():
+            assert inline.kx(2) == 3
+        assert inline.kx(2) == 3
+        assert fake_mapdl.n_round_trips == 1
+
+    def test_cache_size(self, fake_mapdl, keypoints):
+        inline = Inline(fake_mapdl, cache_size=1)
+        with pytest.deprecated_call():
+            inline.kx(1)
+            inline.kx(2)
+            inline.kx(1)
+        assert fake_mapdl.n_round_trips == 3
+
+    def test_no_cache(self, fake_mapdl, keypoints):
+        inline = Inline(fake_mapdl)
+        with pytest.deprecated_call():
+            inline.kx(1)
+            inline.kx(1)
+        assert fake_mapdl.n_round_trips == 2
+
+    def test_invalidate_by_method(self, fake_mapdl, keypoints):
+        inline = Inline(fake_mapdl, cache_size=10)
+        with pytest.deprecated_call():
+            assert inline.kx(2) == 3
+            inline.mapdl.k(2, 6, 8)
+            assert inline.kx(2) == 6
+
+    def test_invalidate_by_run(self, fake_mapdl, keypoints):
+        inline = Inline(fake_mapdl, cache_size=10)
+        with pytest.deprecated_call():
+            assert inline.distkp(1, 2) == 5
+            inline.mapdl.run("/PREP7")
+            assert inline.distkp(1, 2) == 5
+            assert fake_mapdl.n_round_trips == 2  # /PREP7 doesn't change the model
+            inline.mapdl.run("/clear")
+            fake_mapdl.k(1, 0, 0)
+            fake_mapdl.k(2, 6, 8)
+            assert inline.distkp(1, 2) == 10
+
+    @pytest.mark.parametrize("command", ["LREVERSE,1", "LDRAG,1,,,,,,2", "AROTAT,1,,,,,,1,2,90", "LSBL,1,2"])
+    def test_invalidate_by_unknown_command(self, fake_mapdl, keypoints, command):
+        inline = Inline(fake_mapdl, cache_size=10)
+        with pytest.deprecated_call():
+            inline.kx(2)
+            inline.mapdl.run(command)
+            inline.kx(2)
+        assert fake_mapdl.n_round_trips == 3
+
+    @pytest.mark.parametrize("command", ["KSEL,S,KP,,1", "ALLSEL", "KLIST", "/PREP7", "*GET,X,KP,1,LOC,X", "X=3"])
+    def test_read_only_command(self, fake_mapdl, keypoints, command):
+        inline = Inline(fake_mapdl, cache_size=10)
+        with pytest.deprecated_call():
+            inline.kx(2)
+            inline.mapdl.run(command)
+            inline.kx(2)
+        assert fake_mapdl.n_round_trips == 2
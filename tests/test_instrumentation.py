@@ -0,0 +1,112 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import json
+import sys
+
+import numpy as np
+import pytest
+
+import pyansystools.geo2d as geo2d
+from pyansystools.instrumentation import InstrumentedMapdl, _qualname_from_locals
+
+
+@pytest.fixture(scope='function')
+def instrumented(fake_mapdl):
+    return InstrumentedMapdl(fake_mapdl)
+
+
+class TestInstrumentedMapdl:
+    def test_proxy(self, instrumented):
+        assert instrumented.k("", 1, 2) == 1
+        assert instrumented.mapdl.keypoints[1] == (1, 2, 0)
+        assert instrumented.n_round_trips == 1
+        record = instrumented.records[0]
+        assert (record.method, record.n_commands, record.bytes_sent) == ("k", 1, len("K,,1,2"))
+        assert record.origin.endswith("test_proxy")
+
+    def test_input_strings(self, instrumented):
+        instrumented.input_strings("a=1\nb=2\n\nc=3")
+        assert (instrumented.n_round_trips, instrumented.n_commands) == (1, 3)
+
+    def test_parameters(self, instrumented):
+        instrumented.parameters["x"] = np.zeros(10)
+        assert instrumented.parameters["x"].shape == (10,)
+        assert [record.method for record in instrumented.records] == ["parameters.__setitem__",
+                                                                      "parameters.__getitem__"]
+        assert instrumented.records[0].bytes_sent >= 80
+        assert instrumented.records[1].bytes_received == 80
+
+    def test_failed_calls(self, instrumented, fake_mapdl):
+        def solve():
+            raise RuntimeError("MAPDL timeout")
+
+        fake_mapdl.solve = solve
+        with pytest.raises(RuntimeError):
+            instrumented.solve()
+        with pytest.raises(KeyError):
+            instrumented.parameters["missing"]
+        assert [(record.method, record.error) for record in instrumented.records] == [
+            ("solve", True), ("parameters.__getitem__", True)]
+        assert instrumented.summary()[instrumented.records[0].origin]["errors"] == 2
+
+    def test_origin(self, instrumented):
+        geo2d.Rectangle(instrumented, 2, 1).create()
+        summary = instrumented.summary()
+        assert summary["geo2d.Geometry2d._create_keypoints"]["methods"] == {"k": 4}
+        assert summary["geo2d.Geometry2d._create_line"]["round_trips"] == 4
+        assert sum(entry["round_trips"] for entry in summary.values()) == instrumented.n_round_trips
+
+    def test_to_json(self, instrumented, tmp_path):
+        geo2d.Rectangle(instrumented, 2, 1).create_compiled()
+        path = tmp_path / "profile.json"
+        data = json.loads(instrumented.to_json(str(path)))
+        assert data["round_trips"] == 2
+        assert json.loads(path.read_text()) == data
+
+    def test_collapsed_stacks(self, instrumented, tmp_path):
+        geo2d.Rectangle(instrumented, 2, 1).create()
+        stacks = instrumented.collapsed_stacks("commands")
+        assert any(stack.endswith("geo2d.Geometry2d._create_keypoints;mapdl.k 4") for stack in stacks)
+        path = tmp_path / "profile.folded"
+        instrumented.write_collapsed_stacks(str(path), "round_trips")
+        assert len(path.read_text().splitlines()) == len(stacks)
+
+    def test_reset(self, instrumented):
+        instrumented.k("", 0, 0)
+        instrumented.reset()
+        assert instrumented.n_round_trips == 0
+
+
+class _Base:
+    def method(self):
+        return sys._getframe()
+
+    @classmethod
+    def class_method(cls):
+        return sys._getframe()
+
+    @property
+    def attribute(self):
+        return sys._getframe()
+
+
+class _Derived(_Base):
+    pass
+
+
+def _function():
+    return sys._getframe()
+
+
+class TestQualname:
+    """Fallback for python < 3.11 (code objects without co_qualname)."""
+
+    @pytest.mark.parametrize("get_frame", [lambda: _Derived().method(), lambda: _Derived.class_method(),
+                                           lambda: _Derived().attribute, _function],
+                             ids=["method", "classmethod", "property", "function"])
+    def test_qualname_from_locals(self, get_frame):
+        frame = get_frame()
+        expected = {"method": "_Base.method", "class_method": "_Base.class_method",
+                    "attribute": "_Base.attribute", "_function": "_function"}[frame.f_code.co_name]
+        assert _qualname_from_locals(frame.f_code, frame.f_locals) == expected
@@ -0,0 +1,41 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+from pyansystools.command_block import CommandRecorder
+from pyansystools.macros import Macros, compress_ranges, select_entities
+
+
+def test_compress_ranges():
+    assert compress_ranges([4, 3, 2, 1, 10, 12, 14]) == [(1, 4, 1), (10, 14, 2)]
+    assert compress_ranges([5, 5, 7]) == [(5, 7, 2)]
+    assert compress_ranges([1, 2, 3, 9]) == [(1, 3, 1), (9, 9, 1)]
+    assert compress_ranges([]) == []
+
+
+class TestSelectEntities:
+    def test_contiguous(self):
+        recorder = CommandRecorder()
+        select_entities(recorder, "LINE", range(1, 1001))
+        assert recorder.block.commands == ["LSEL,S,LINE,,1,1000,1"]
+
+    def test_ranges(self):
+        recorder = CommandRecorder()
+        select_entities(recorder, "AREA", [1, 2, 3, 7])
+        assert recorder.block.commands == ["ASEL,S,AREA,,1,3,1", "ASEL,A,AREA,,7,7,1"]
+
+    def test_empty(self):
+        recorder = CommandRecorder()
+        select_entities(recorder, "KP", [])
+        assert recorder.block.commands == ["KSEL,NONE"]
+
+    def test_references(self):
+        recorder = CommandRecorder()
+        line = recorder.l(1, 2)
+        select_entities(recorder, "LINE", [line])
+        assert recorder.block.commands[-2:] == ["LSEL,NONE", "LSEL,A,LINE,,__block__(1)"]
+
+
+def test_macros_select_lines():
+    recorder = CommandRecorder()
+    Macros(recorder).select_lines(3)
+    assert recorder.block.commands == ["LSEL,S,LINE,,3,3,1"]
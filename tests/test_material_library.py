@@ -0,0 +1,132 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import numpy as np
+import pytest
+
+from pyansystools.material import Material, MaterialCache, MaterialLibrary
+from pyansystools.material_db import _Al, Si
+from pyansystools.testing import FakeMapdl
+
+
+class TestMaterialLibrary:
+    def test_one_submission(self, fake_mapdl):
+        materials = {i: Si() if i % 2 else _Al() for i in range(1, 31)}
+        MaterialLibrary.apply(fake_mapdl, materials, strain_max=0.05)
+        assert fake_mapdl.n_round_trips == 1
+        assert set(fake_mapdl.materials) == set(range(1, 31))
+        assert len(fake_mapdl.tables) == 15
+
+    def test_written_properties(self, fake_mapdl):
+        written = MaterialLibrary.apply(fake_mapdl, {1: Si(), 2: _Al()}, strain_max=0.05)
+        assert written == {1: ["EX", "EY", "EZ", "GXY", "GYZ", "GXZ", "PRXY", "PRYZ", "PRXZ", "DENS", "CTEX"],
+                           2: ["EX", "PRXY", "DENS", "CTEX", "KINH"]}
+
+    def test_values(self, fake_mapdl):
+        si = Si()
+        MaterialLibrary.apply(fake_mapdl, {3: si})
+        assert fake_mapdl.materials[3]["EZ"] == si.ez
+        assert fake_mapdl.materials[3]["GXZ"] == si.gzx
+        assert fake_mapdl.materials[3]["DENS"] == si.dens
+        assert fake_mapdl.materials[3]["CTEX"] == si.ctex
+
+    def test_without_strain_max(self, fake_mapdl):
+        written = MaterialLibrary.apply(fake_mapdl, {1: _Al()})
+        assert "KINH" not in written[1]
+        assert not fake_mapdl.tables
+
+    def test_same_table_as_set_ramberg_osgood(self, fake_mapdl):
+        MaterialLibrary.apply(fake_mapdl, {1: _Al()}, strain_max=0.05, temperatures=[20, 100])
+        expected = FakeMapdl()
+        _Al().set_ramberg_osgood_table(expected, 1, 0.05, [20, 100])
+        assert fake_mapdl.tables == expected.tables
+        assert fake_mapdl.table_temperatures == expected.table_temperatures
+
+    def test_unset_properties_skipped(self, fake_mapdl):
+        material = Material()
+        material.ex = 1000
+        assert MaterialLibrary.apply(fake_mapdl, {1: material}, strain_max=0.05) == {1: ["EX"]}
+
+    def test_temperature_dependent_property(self, fake_mapdl):
+        temperatures = np.linspace(20, 410, 8).tolist()
+        al = _Al()
+        al.ex = np.linspace(76220, 60000, 8)
+        MaterialLibrary.apply(fake_mapdl, {1: al, 2: Si()}, strain_max=0.05, temperatures=temperatures)
+        assert fake_mapdl.materials[1]["EX"] == pytest.approx(al.ex)
+        assert fake_mapdl.material_temperatures[(1, "EX")] == pytest.approx(temperatures)
+        # scalar properties are written without temperature table
+        assert fake_mapdl.materials[1]["PRXY"] == al.prxy
+        assert len(fake_mapdl.material_temperatures[(1, "PRXY")]) == 1
+        assert fake_mapdl.materials[2]["EX"] == Si().ex
+        assert fake_mapdl.n_round_trips == 1
+
+    @pytest.mark.parametrize("ex", [[76220, 60000, 50000], [[76220, 60000]]], ids=["length", "shape"])
+    def test_temperature_dependent_property_mismatch(self, fake_mapdl, ex):
+        al = _Al()
+        al.ex = ex
+        with pytest.raises(ValueError):
+            MaterialLibrary.apply(fake_mapdl, {1: al}, temperatures=[20, 200])
+        assert fake_mapdl.n_round_trips == 0
+
+
+class TestMaterialCache:
+    def test_unchanged_materials_skipped(self, fake_mapdl):
+        materials = {1: Si(), 2: _Al()}
+        MaterialLibrary.apply(fake_mapdl, materials, strain_max=0.05, cache=True)
+        fake_mapdl.n_round_trips = 0
+        fake_mapdl.command_counts.clear()
+        assert MaterialLibrary.apply(fake_mapdl, materials, strain_max=0.05, cache=True) == {1: [], 2: []}
+        assert fake_mapdl.n_round_trips == 1  # only verify()
+        assert not fake_mapdl.command_counts
+
+    def test_only_changed_properties_send(self, fake_mapdl):
+        al = _Al()
+        MaterialLibrary.apply(fake_mapdl, {1: Si(), 2: al}, strain_max=0.05, cache=True)
+        al.dens = 2.8e-9
+        assert MaterialLibrary.apply(fake_mapdl, {1: Si(), 2: al}, strain_max=0.05, cache=True) == {1: [],
+                                                                                                 2: ["DENS"]}
+        assert fake_mapdl.materials[2]["DENS"] == 2.8e-9
+        assert MaterialLibrary.apply(fake_mapdl, {2: al}, strain_max=0.06, cache=True) == {2: ["KINH"]}
+
+    def test_same_value_of_other_material(self, fake_mapdl):
+        MaterialLibrary.apply(fake_mapdl, {1: Si()}, cache=True)
+        assert MaterialLibrary.apply(fake_mapdl, {2: Si()}, cache=True)[2] == MaterialLibrary.apply(FakeMapdl(),
+                                                                                                    {2: Si()})[2]
+
+    @pytest.mark.parametrize("clear", [lambda mapdl: mapdl.clear(),
+                                       lambda mapdl: mapdl.run("/CLEAR"),
+                                       lambda mapdl: mapdl.input_strings("/CLEAR,NOSTART")],
+                             ids=["clear", "run", "input_strings"])
+    def test_invalidate_on_clear(self, fake_mapdl, clear):
+        MaterialLibrary.apply(fake_mapdl, {1: Si()}, cache=True)
+        clear(fake_mapdl)
+        written = MaterialLibrary.apply(fake_mapdl, {1: Si()}, cache=True)
+        assert "EX" in written[1]
+        assert fake_mapdl.materials[1]["EX"] == Si().ex
+
+    def test_sessions(self, fake_mapdl):
+        MaterialLibrary.apply(fake_mapdl, {1: Si()}, cache=True)
+        assert MaterialCache.of(fake_mapdl) is MaterialCache.of(fake_mapdl)
+        assert len(MaterialCache.of(fake_mapdl)) == 11
+        assert len(MaterialCache.of(FakeMapdl())) == 0
+
+    def test_invalidate(self, fake_mapdl):
+        MaterialLibrary.apply(fake_mapdl, {1: Si()}, cache=True)
+        MaterialCache.of(fake_mapdl).invalidate()
+        assert "EX" in MaterialLibrary.apply(fake_mapdl, {1: Si()}, cache=True)[1]
+
+    def test_temperature_dependent_fingerprint(self, fake_mapdl):
+        al = _Al()
+        al.ro_n = np.array([11.714, 10])
+        MaterialLibrary.apply(fake_mapdl, {1: al}, strain_max=0.05, temperatures=[20, 200], cache=True)
+        al.ro_n = np.array([11.714, 10.5])
+        assert "KINH" in MaterialLibrary.apply(fake_mapdl, {1: al}, strain_max=0.05, temperatures=[20, 200],
+                                               cache=True)[1]
+
+    def test_temperature_dependent_property_new_temperatures(self, fake_mapdl):
+        al = _Al()
+        al.ex = [76220, 60000]
+        MaterialLibrary.apply(fake_mapdl, {1: al}, temperatures=[20, 200], cache=True)
+        assert MaterialLibrary.apply(fake_mapdl, {1: al}, temperatures=[20, 200], cache=True) == {1: []}
+        assert MaterialLibrary.apply(fake_mapdl, {1: al}, temperatures=[20, 300], cache=True) == {1: ["EX"]}
+        assert fake_mapdl.material_temperatures[(1, "EX")] == [20, 300]
@@ -0,0 +1,112 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import sqlite3
+
+import numpy as np
+import pytest
+
+from pyansystools.material import Material, MaterialLibrary
+from pyansystools.material_db import _Al, Si, default_store
+from pyansystools.material_store import PROPERTIES, MaterialStore
+
+
+@pytest.fixture(scope='function')
+def store():
+    with default_store() as result:
+        yield result
+
+
+def _material(ex, dens=None):
+    material = Material()
+    material.ex = ex
+    material.dens = dens
+    return material
+
+
+class TestMaterialStore:
+    @pytest.mark.parametrize("name, cls", [("_Al", _Al), ("Si", Si)])
+    def test_materialize(self, store, name, cls):
+        material = store[name]
+        assert type(material) is Material
+        for attribute in PROPERTIES:
+            assert getattr(material, attribute) == getattr(cls(), attribute)
+
+    def test_lookup(self, store):
+        assert store.get(2).ex == store["Si"].ex
+        assert store.name(1) == "_Al"
+        assert "Si" in store and 2 in store and "Cu" not in store
+        with pytest.raises(KeyError):
+            store["Cu"]
+        with pytest.raises(KeyError):
+            store.get(3)
+
+    def test_new_object_on_each_lookup(self, store):
+        assert store["Si"] is not store["Si"]
+
+    def test_tags(self, store):
+        assert store.tags("_Al") == ["film", "metal", "ramberg-osgood"]
+        assert store.find(tag="substrate") == [2]
+        assert store.find(tag="unknown") == []
+
+    def test_find_ranges(self, store):
+        assert store.find(ex=(100000, None)) == [2]
+        assert store.find(ex=(None, 76220)) == [1]
+        assert store.find(tag="metal", dens=(2.5e-9, 3e-9)) == [1]
+        assert store.find() == [1, 2]
+
+    def test_find_unknown_property(self, store):
+        with pytest.raises(ValueError):
+            store.find(name=(1, 2))
+        with pytest.raises(ValueError):
+            store.columns("ex", "id FROM materials; --")
+
+    def test_columns(self, store):
+        data = store.columns("ex", "ez")
+        assert data["id"].tolist() == [1, 2]
+        assert np.isnan(data["ez"][0])
+        assert data["id"][data["ex"] > 100000].tolist() == [2]
+        assert set(store.columns()) == {"id", *PROPERTIES}
+
+    def test_add_many(self):
+        with MaterialStore() as store:
+            ids = store.add_many((_material(1000 + i, 1e-9 * i), f"m{i}", ["even" if i % 2 else "odd"])
+                                 for i in range(500))
+            assert len(store) == 500
+            assert ids == list(range(1, 501))
+            assert len(store.find(tag="even", ex=(1400, None))) == 50
+            assert store.columns("dens")["dens"] == pytest.approx(np.arange(500) * 1e-9)
+
+    def test_material_id(self):
+        with MaterialStore() as store:
+            assert store.add(_material(1000), "a", material_id=10) == 10
+            assert store.add(_material(2000), "b") == 11
+
+    def test_unique_name(self, store):
+        with pytest.raises(sqlite3.IntegrityError):
+            store.add(Si(), "Si")
+        assert len(store) == 2
+
+    def test_temperature_dependent_property(self, store):
+        with pytest.raises(ValueError):
+            store.add_many([(_material(1000), "a"), (_material([200e3, 190e3]), "b")])
+        assert store.names() == ["_Al", "Si"]  # whole transaction rolled back
+
+    def test_remove(self, store):
+        store.remove("_Al")
+        assert store.names() == ["Si"]
+        assert store.find(tag="metal") == []
+
+    def test_file(self, tmp_path):
+        path = str(tmp_path / "materials.sqlite")
+        with default_store(path) as store:
+            store.add(_material(1000), "soft", ["polymer"], "test material")
+        with default_store(path) as store:  # existing records are kept (not added twice)
+            assert store.names() == ["_Al", "Si", "soft"]
+            assert store.description("soft") == "test material"
+            assert store["soft"].ex == 1000
+
+    def test_material_library(self, store, fake_mapdl):
+        written = MaterialLibrary.apply(fake_mapdl, store.materials(store.find(tag="film")), strain_max=0.05)
+        assert written == {1: ["EX", "PRXY", "DENS", "CTEX", "KINH"]}
+        assert fake_mapdl.n_round_trips == 1
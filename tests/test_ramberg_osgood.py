@@ -0,0 +1,94 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import numpy as np
+import pytest
+
+from pyansystools.material_db import _Al
+from pyansystools.ramberg_osgood import kinh_table, ramberg_osgood_strain, ramberg_osgood_stress
+
+# (E, K, n)
+parameters = [(76220, _Al().ro_K, _Al().ro_n),  # stiff exponent of _Al film
+              (76220, 1.79e25, 11.0),
+              (200000, 0.002 / (300 / 200000) ** 5, 5),
+              (1000, 0.5, 0.5),
+              (169000, 0, 1)]  # linear elastic
+
+
+class TestRambergOsgoodStress:
+    @pytest.mark.parametrize("E, K, n", parameters)
+    @pytest.mark.parametrize("strain", [1e-6, 1e-3, 0.05, 0.1, 10])
+    def test_exact_strain(self, strain, E, K, n):
+        stress = ramberg_osgood_stress(strain, E, K, n)
+        assert isinstance(stress, float)
+        assert ramberg_osgood_strain(stress, E, K, n) == pytest.approx(strain, rel=1e-11)
+
+    def test_linear_elastic(self):
+        assert ramberg_osgood_stress(0.01, 169000, 0, 11.7) == pytest.approx(1690, rel=1e-12)
+
+    def test_vectorized(self):
+        strains = np.array([[0.001], [0.01], [0.1]])
+        ns = np.array([3, 7, 11.714])
+        stress = ramberg_osgood_stress(strains, 76220, 1e3, ns)
+        assert stress.shape == (3, 3)
+        assert ramberg_osgood_strain(stress, 76220, 1e3, ns) == pytest.approx(np.broadcast_to(strains, (3, 3)),
+                                                                              rel=1e-11)
+
+    @pytest.mark.parametrize("E, K, n", parameters)
+    def test_scalar_equals_vectorized(self, E, K, n):
+        strains = np.array([1e-4, 0.01, 0.3])
+        expected = [ramberg_osgood_stress(strain, E, K, n) for strain in strains.tolist()]
+        assert ramberg_osgood_stress(strains, E, K, n) == pytest.approx(expected, rel=1e-11)
+
+    def test_max_iter(self):
+        with pytest.raises(RuntimeError):
+            ramberg_osgood_stress(0.05, 76220, _Al().ro_K, _Al().ro_n, max_iter=1)
+
+    def test_invalid_strain(self):
+        with pytest.raises(AssertionError):
+            ramberg_osgood_stress(0, 76220, 1, 5)
+
+
+class TestKinhTable:
+    def test_single_temperature(self):
+        al = _Al()
+        stresses, strains = kinh_table(0.05, al.ex, al.ro_K, al.ro_n)
+        assert stresses.shape == strains.shape == (1, 20)
+        assert strains[0, -1] == pytest.approx(0.05, rel=1e-11)
+        assert np.diff(stresses[0]) == pytest.approx(np.full(19, stresses[0, 0]))
+
+    def test_temperature_dependent(self):
+        ex = np.linspace(76220, 60000, 40)
+        n = np.linspace(11.714, 5, 40)
+        stresses, strains = kinh_table(0.05, ex, 1e3, n, n_temperatures=40)
+        assert stresses.shape == (40, 20)
+        for i in [0, 17, 39]:
+            assert stresses[i, -1] == pytest.approx(ramberg_osgood_stress(0.05, ex[i], 1e3, n[i]))
+            assert strains[i] == pytest.approx(ramberg_osgood_strain(stresses[i], ex[i], 1e3, n[i]))
+
+    def test_limits(self):
+        with pytest.raises(AssertionError):
+            kinh_table(0.05, 76220, 1e3, 5, n_temperatures=41)
+        with pytest.raises(AssertionError):
+            kinh_table(0.05, 76220, 1e3, 5, steps=21)
+
+
+class TestSetRambergOsgood:
+    def test_material(self, fake_mapdl):
+        stresses, strains = _Al().set_ramberg_osgood(fake_mapdl, 1, 0.05, eps_tol=1e-9)
+        assert strains[-1] == pytest.approx(0.05, rel=1e-11)
+        assert len(fake_mapdl.tables[(1, "KINH")]) == 20
+        assert fake_mapdl.tables[(1, "KINH")][-1] == pytest.approx((strains[-1], stresses[-1]))
+        assert fake_mapdl.n_round_trips == 1
+
+    def test_table(self, fake_mapdl):
+        material = _Al()
+        material.ex = np.linspace(76220, 60000, 40)
+        temperatures = np.linspace(20, 410, 40).tolist()
+        stresses, strains = material.set_ramberg_osgood_table(fake_mapdl, 2, 0.05, temperatures)
+        assert fake_mapdl.n_round_trips == 1
+        assert fake_mapdl.command_counts["TBPT"] == 800
+        assert fake_mapdl.table_temperatures[(2, "KINH")] == pytest.approx(temperatures)
+        points = np.array(fake_mapdl.tables[(2, "KINH")]).reshape(40, 20, 2)
+        assert points[..., 0] == pytest.approx(strains)
+        assert points[..., 1] == pytest.approx(stresses)
@@ -0,0 +1,61 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import warnings
+
+import numpy as np
+import pytest
+
+import pyansystools.spatial_index as spatial_index
+from pyansystools.inline import Inline
+from pyansystools.spatial_index import SpatialIndex
+
+numbers = [7, 3, 5, 9, 4]
+coordinates = [[0, 0, 0],
+               [1, 0, 0],
+               [1, 0, 0],  # coincident with 3
+               [0, 1, 1],
+               [2, 2, 2]]
+
+
+@pytest.fixture(scope='function', params=["kd-tree", "brute force"])
+def index(request, monkeypatch, fake_mapdl):
+    if request.param == "brute force":
+        monkeypatch.setattr(spatial_index, "cKDTree", None)
+    for node in (1, 2):  # unknown to the index
+        fake_mapdl.n(node, 0.9, 0.1, 0.0)
+    fake_mapdl.n_round_trips = 0
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        yield SpatialIndex(numbers, coordinates, Inline(fake_mapdl))
+
+
+class TestSpatialIndex:
+    def test_nearest(self, index):
+        assert index.nearest([[0.1, 0, 0], [0, 0.9, 0.8]]).tolist() == [7, 9]
+
+    def test_nearest_single_point(self, index):
+        assert index.nearest((1.9, 2, 2)).tolist() == [4]
+
+    def test_nearest_coincident(self, index):
+        assert index.nearest([[1.2, 0, 0]]).tolist() == [3]  # lowest number for coincident entities
+
+    def test_nearest_to(self, index):
+        assert index.nearest_to([7, 3, 5]).tolist() == [3, 5, 3]
+
+    def test_nearest_to_unknown(self, index, fake_mapdl):
+        assert index.nearest_to([1, 2]).tolist() == [3, 3]
+        assert fake_mapdl.n_round_trips == 3  # one transfer (nxyz_array) for all unknown entities
+
+    def test_empty(self, index):
+        empty = SpatialIndex([], np.empty((0, 3)))
+        assert empty.nearest([[0, 0, 0]]).tolist() == [0]
+
+    def test_single_entity(self, index):
+        single = SpatialIndex([1], [[0, 0, 0]])
+        assert single.nearest_to([1]).tolist() == [0]
+
+    def test_many_coincident(self, index):
+        many = SpatialIndex(range(20, 0, -1), np.zeros((20, 3)))
+        assert many.nearest([[1, 1, 1]]).tolist() == [1]
+        assert many.nearest_to([1]).tolist() == [2]
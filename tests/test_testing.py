@@ -0,0 +1,140 @@
+"""
+@author: Nathanael Jöhrmann
+"""
+import threading
+import time
+import warnings
+
+import numpy as np
+import pytest
+
+import pyansystools.geo2d as geo2d
+from pyansystools.inline import Inline
+from pyansystools.macros import Macros
+from pyansystools.material import Material
+from pyansystools.testing import FakeMapdl
+
+
+@pytest.fixture(scope='function')
+def inline(fake_mapdl):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        yield Inline(fake_mapdl)
+
+
+class TestFakeMapdl:
+    def test_entities(self, fake_mapdl):
+        k1 = fake_mapdl.k("", 0, 0)
+        k2 = fake_mapdl.k("", 1, 2)
+        line = fake_mapdl.l(k1, k2)
+        assert (k1, k2, line) == (1, 2, 1)
+        assert fake_mapdl.keypoints[2] == (1, 2, 0)
+        assert fake_mapdl.n_round_trips == 3
+        assert fake_mapdl.command_counts["K"] == 2
+
+    def test_select(self, fake_mapdl):
+        for i in range(10):
+            fake_mapdl.k("", i, 0)
+        fake_mapdl.ksel("S", "KP", "", 2, 8, 2)
+        fake_mapdl.ksel("A", "KP", "", 9)
+        assert fake_mapdl.get_value("KP", 0, "COUNT") == 5
+        assert fake_mapdl.get_value("KP", 0, "NUM", "MAX") == 9
+        fake_mapdl.ksel("NONE")
+        assert fake_mapdl.get_value("KP", 0, "COUNT") == 0
+
+    def test_parameters(self, fake_mapdl):
+        fake_mapdl.run("a=2*3")
+        assert fake_mapdl.parameters["A"] == 6
+        fake_mapdl.parameters["b"] = np.array([[1, 2], [3, 4]])
+        assert fake_mapdl.run("c=b(2,1)+a") == "PARAMETER C = 9.0"
+
+    def test_do_loop(self, fake_mapdl):
+        fake_mapdl.input_strings("\n".join(["*DIM,x,ARRAY,5",
+                                            "*DO,i,1,5",
+                                            "*IF,i,GT,3,EXIT",
+                                            "x(i)=i*i",
+                                            "*ENDDO"]))
+        assert fake_mapdl.parameters["x"].tolist() == [1, 4, 9, 0, 0]
+        assert fake_mapdl.n_round_trips == 2
+
+    def test_latency(self):
+        fake_mapdl = FakeMapdl(latency=0.01)
+        start = time.perf_counter()
+        for _ in range(5):
+            fake_mapdl.k("", 0, 0)
+        assert time.perf_counter() - start >= 0.05
+
+    def test_concurrent_round_trips(self):
+        fake_mapdl = FakeMapdl(latency=0.05)
+        threads = [threading.Thread(target=fake_mapdl.k, args=("", i, 0)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert fake_mapdl.n_round_trips == 3
+        assert fake_mapdl.max_concurrent_round_trips > 1
+
+    def test_clear(self, fake_mapdl):
+        fake_mapdl.k("", 0, 0)
+        fake_mapdl.clear()
+        assert fake_mapdl.keypoints == {}
+
+    def test_mptemp_table(self, fake_mapdl):
+        fake_mapdl.mptemp("", "", "", "", "", "", "")
+        fake_mapdl.mptemp(1, 20, 100, 200, 300, 400, 500)
+        fake_mapdl.mptemp(7, 600)
+        fake_mapdl.mpdata("EX", 1, 1, 7, 6, 5, 4, 3, 2)
+        fake_mapdl.mpdata("EX", 1, 7, 1)
+        fake_mapdl.mpdata("DENS", 1, "", 2e-9)
+        assert fake_mapdl.materials[1] == {"EX": [7, 6, 5, 4, 3, 2, 1], "DENS": 2e-9}
+        assert fake_mapdl.material_temperatures[(1, "EX")] == [20, 100, 200, 300, 400, 500, 600]
+        assert fake_mapdl.material_temperatures[(1, "DENS")] == [20]
+
+    def test_unknown_method(self, fake_mapdl):
+        with pytest.raises(AttributeError):
+            fake_mapdl.solve_everything()
+
+
+class TestWithPyansystools:
+    def test_geometry(self, fake_mapdl):
+        rectangle = geo2d.Rectangle(fake_mapdl, 2, 1)
+        rectangle.create()
+        fake_mapdl.et("", "PLANE183")
+        rectangle.mesh_custom(3, 4)
+        assert rectangle.areas == [1]
+        assert fake_mapdl.areas[1] == (1, 2, 3, 4)
+        assert len(fake_mapdl.nodes) == 14
+
+    def test_compiled_geometry(self, fake_mapdl):
+        rectangle = geo2d.Rectangle(fake_mapdl, 2, 1)
+        rectangle.create_compiled()
+        assert rectangle.lines == [1, 2, 3, 4]
+        assert fake_mapdl.n_round_trips == 2  # one submission + one transfer of the results
+
+    def test_inline(self, fake_mapdl, inline):
+        for i in range(1, 11):
+            fake_mapdl.n(i, i, 2 * i)
+        fake_mapdl.nsel("S", "NODE", "", 3, 7)
+        assert inline.nx(4) == 4
+        assert list(inline.iter_selected_nodes(chunk_size=2)) == [3, 4, 5, 6, 7]
+        assert inline.ny_array([1, 5]).tolist() == [2, 10]
+
+    def test_material(self, fake_mapdl):
+        material = Material()
+        material.ex, material.prxy = 200000, 0.3
+        material.set_elastic(fake_mapdl, 1)
+        assert fake_mapdl.materials[1] == {"EX": 200000, "PRXY": 0.3}
+
+    def test_temperature_dependent_material(self, fake_mapdl):
+        material = Material()
+        material.ex, material.prxy = [70000, 65000, 60000], 0.3
+        material.set_elastic(fake_mapdl, 1, temperatures=[20, 100, 200])
+        assert fake_mapdl.materials[1] == {"EX": [70000, 65000, 60000], "PRXY": 0.3}
+        assert fake_mapdl.material_temperatures[(1, "EX")] == [20, 100, 200]
+        with pytest.raises(ValueError):
+            material.set_elastic(fake_mapdl, 2)  # one temperature, but three values
+
+    def test_contact_pair(self, fake_mapdl):
+        target, contact = Macros(fake_mapdl).create_contact_pair_for_lines_asymmetric(1, 2)
+        assert (target, contact) == (1, 2)
+        assert fake_mapdl.real_constants.keys() == {1}